@@ -0,0 +1,127 @@
+"""
+Cache em memória com expiração (TTL), seguro para uso entre threads.
+
+Cada processo do servidor mantém o seu próprio cache; as rotas de escrita
+invalidam as entradas afetadas e o TTL limita por quanto tempo um valor
+pode ficar desatualizado em outro processo.
+
+get_or_compute também coalesce requisições concorrentes (single-flight):
+enquanto uma thread calcula o valor de uma chave, as demais que pedem a
+mesma chave aguardam e recebem o mesmo resultado, sem recalcular.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_AUSENTE = object()
+
+class _Voo:
+    """Cálculo em andamento de uma chave, compartilhado pelas threads que a pedem"""
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado = None
+        self.erro = None
+
+class TTLCache:
+    """Cache LRU limitado a maxsize entradas, cada uma válida por ttl segundos"""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.computacoes = 0  # cálculos executados por get_or_compute
+        self.coalescidas = 0  # requisições que aguardaram um cálculo em andamento
+        self._em_voo = {}
+        self._geracao = 0  # incrementada a cada invalidação
+
+    def get(self, key, default=None):
+        with self._lock:
+            entrada = self._dados.get(key, _AUSENTE)
+            if entrada is _AUSENTE or entrada[0] < time.monotonic():
+                if entrada is not _AUSENTE:
+                    del self._dados[key]
+                self.misses += 1
+                return default
+            self._dados.move_to_end(key)
+            self.hits += 1
+            return entrada[1]
+
+    def set(self, key, value):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._dados[key] = (time.monotonic() + self.ttl, value)
+            self._dados.move_to_end(key)
+            while len(self._dados) > self.maxsize:
+                self._dados.popitem(last=False)
+
+    def get_or_compute(self, key, calcular):
+        """
+        Retorna o valor em cache ou o calcula com calcular(), uma única vez por
+        chave mesmo com requisições concorrentes. Se a chave for invalidada
+        durante o cálculo, o resultado é devolvido mas não entra no cache.
+        """
+        valor = self.get(key, _AUSENTE)
+        if valor is not _AUSENTE:
+            return valor
+
+        with self._lock:
+            # Quem chega após uma invalidação não aproveita um cálculo anterior a ela
+            geracao = self._geracao
+            voo = self._em_voo.get((key, geracao))
+            lider = voo is None
+            if lider:
+                voo = self._em_voo[(key, geracao)] = _Voo()
+            else:
+                self.coalescidas += 1
+
+        if not lider:
+            voo.evento.wait()
+            if voo.erro is not None:
+                raise voo.erro
+            return voo.resultado
+
+        try:
+            voo.resultado = calcular()
+            with self._lock:
+                self.computacoes += 1
+            if geracao == self._geracao:
+                self.set(key, voo.resultado)
+            return voo.resultado
+        except BaseException as e:
+            voo.erro = e
+            raise
+        finally:
+            with self._lock:
+                self._em_voo.pop((key, geracao), None)
+            voo.evento.set()
+
+    def metricas(self) -> dict:
+        """Contadores do cache; economizadas = cálculos evitados (hits + coalescidas)"""
+        with self._lock:
+            return {
+                "entradas": len(self._dados),
+                "hits": self.hits,
+                "misses": self.misses,
+                "computacoes": self.computacoes,
+                "coalescidas": self.coalescidas,
+                "economizadas": self.hits + self.coalescidas,
+            }
+
+    def delete(self, key):
+        with self._lock:
+            self._geracao += 1
+            self._dados.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._geracao += 1
+            self._dados.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._dados)
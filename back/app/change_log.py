@@ -0,0 +1,65 @@
+"""
+Log de alterações (tabela Registro_Alteracoes) para a sincronização incremental.
+
+As rotas de escrita de chamados, itens e caixa chamam registrar_alteracao na
+mesma transação da alteração, de modo que o log nunca diverge dos dados.
+O id_registro, crescente, serve de cursor: um cliente que já tem os dados até
+o cursor N precisa apenas das linhas com id_registro > N.
+
+Configuração (variáveis de ambiente):
+- SYNC_BATCH_LIMIT: registros do log lidos por chamada de sincronização (padrão 500)
+"""
+import os
+from typing import Optional
+
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from .models import RegistroAlteracao
+
+SYNC_BATCH_LIMIT = int(os.getenv("SYNC_BATCH_LIMIT", "500"))
+
+ENTIDADES_TECNICO = ("chamado", "item_chamado")
+
+def registrar_alteracao(
+    db: Session,
+    entidade: str,
+    id_entidade: int,
+    acao: str = "alterado",
+    id_usuario: Optional[int] = None,
+    id_usuario_anterior: Optional[int] = None
+):
+    """
+    Acrescenta uma linha ao log. Deve ser chamada antes do commit da alteração.
+    `id_usuario` é o técnico do chamado (também para itens); `id_usuario_anterior`
+    só é preenchido quando o chamado muda de técnico, para que o anterior o remova.
+    """
+    db.add(RegistroAlteracao(
+        entidade=entidade,
+        id_entidade=id_entidade,
+        acao=acao,
+        id_usuario=id_usuario,
+        id_usuario_anterior=id_usuario_anterior if id_usuario_anterior != id_usuario else None
+    ))
+
+def cursor_atual(db: Session) -> int:
+    """Maior id_registro do log (0 se vazio)"""
+    return db.query(func.coalesce(func.max(RegistroAlteracao.id_registro), 0)).scalar()
+
+def alteracoes_desde(db: Session, since: int, limite: int, id_usuario: Optional[int] = None):
+    """
+    Registros do log posteriores ao cursor, em ordem, no máximo `limite`.
+    Com id_usuario, apenas chamados e itens desse técnico (atual ou anterior).
+    Retorna (registros, has_more).
+    """
+    query = db.query(RegistroAlteracao).filter(RegistroAlteracao.id_registro > since)
+    if id_usuario is not None:
+        query = query.filter(
+            RegistroAlteracao.entidade.in_(ENTIDADES_TECNICO),
+            or_(
+                RegistroAlteracao.id_usuario == id_usuario,
+                RegistroAlteracao.id_usuario_anterior == id_usuario
+            )
+        )
+    registros = query.order_by(RegistroAlteracao.id_registro).limit(limite + 1).all()
+    return registros[:limite], len(registros) > limite
@@ -0,0 +1,82 @@
+"""
+Manutenção da tabela Resumo_Cliente.
+
+Cada cliente tem uma linha com os agregados de todo o seu histórico (total de
+chamados, abertos, concluídos, valor gasto, última visita e aparelhos mais
+atendidos). As rotas de escrita de chamados e itens chamam
+atualizar_resumo_cliente na mesma transação. obter_resumo_cliente não grava
+nada: para os clientes que ainda não têm a linha (sem escritas desde a
+criação da tabela), calcula o resumo a cada leitura, sem persistir, pois a
+sessão pode ser a de um lote só de leituras (routers/batch_routes.py).
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from .models import Chamado, ResumoCliente, StatusChamadoEnum, filtro_status_ativos
+
+# Campos do chamado que alteram o resumo do cliente
+CAMPOS_RESUMO = {"status", "aparelho", "valor", "data_conclusao"}
+
+# Quantidade de aparelhos guardados no resumo, do mais atendido ao menos
+APARELHOS_FREQUENTES = 5
+
+def calcular_resumo_cliente(db: Session, id_cliente: int, resumo: ResumoCliente) -> ResumoCliente:
+    """
+    Preenche o resumo com os agregados dos chamados do cliente, sem gravar.
+    Usa o índice (id_cliente, data_abertura), então o custo depende apenas do
+    histórico do próprio cliente.
+    """
+    concluido = Chamado.status == StatusChamadoEnum.CONCLUIDO.value
+    total, abertos, concluidos, valor_total, ultima_visita = db.query(
+        func.count(case((Chamado.status != StatusChamadoEnum.CANCELADO.value, 1))),
+        func.count(case((filtro_status_ativos(Chamado.status), 1))),
+        func.count(case((concluido, 1))),
+        func.sum(case((concluido, Chamado.valor), else_=0)),
+        func.max(case((concluido, func.coalesce(Chamado.data_conclusao, Chamado.data_abertura))))
+    ).filter(Chamado.id_cliente == id_cliente).one()
+
+    aparelhos = db.query(
+        Chamado.aparelho, func.count(Chamado.id_chamado).label("quantidade")
+    ).filter(
+        Chamado.id_cliente == id_cliente,
+        Chamado.status != StatusChamadoEnum.CANCELADO.value
+    ).group_by(Chamado.aparelho).order_by(
+        func.count(Chamado.id_chamado).desc(), Chamado.aparelho
+    ).limit(APARELHOS_FREQUENTES).all()
+
+    resumo.total_chamados = total
+    resumo.chamados_abertos = abertos
+    resumo.chamados_concluidos = concluidos
+    resumo.valor_total = valor_total or 0
+    # max() sobre uma expressão devolve texto no SQLite
+    resumo.ultima_visita = (
+        datetime.fromisoformat(ultima_visita) if isinstance(ultima_visita, str) else ultima_visita
+    )
+    resumo.aparelhos_frequentes = json.dumps(
+        [{"aparelho": aparelho, "quantidade": quantidade} for aparelho, quantidade in aparelhos],
+        ensure_ascii=False
+    )
+    resumo.atualizado_em = datetime.now()
+    return resumo
+
+def atualizar_resumo_cliente(db: Session, id_cliente: int) -> ResumoCliente:
+    """
+    Recalcula e grava o resumo de um cliente a partir dos seus chamados.
+    Deve ser chamada antes do commit da escrita.
+    """
+    db.flush()
+    resumo = db.get(ResumoCliente, id_cliente)
+    if resumo is None:
+        resumo = ResumoCliente(id_cliente=id_cliente)
+        db.add(resumo)
+    return calcular_resumo_cliente(db, id_cliente, resumo)
+
+def obter_resumo_cliente(db: Session, id_cliente: int) -> ResumoCliente:
+    """Lê o resumo do cliente; sem a linha, calcula um resumo fora da sessão (nada é gravado)"""
+    resumo = db.get(ResumoCliente, id_cliente)
+    if resumo is None:
+        resumo = calcular_resumo_cliente(db, id_cliente, ResumoCliente(id_cliente=id_cliente))
+    return resumo
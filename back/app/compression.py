@@ -0,0 +1,157 @@
+"""
+Middleware de compressão das respostas (gzip e, se instalado, brotli).
+
+Só comprime respostas cujo content-type está na lista permitida e cujo corpo
+atinge o tamanho mínimo. Respostas em streaming são comprimidas em blocos,
+sem acumular o corpo inteiro em memória. Os níveis padrão privilegiam pouco
+uso de CPU, adequado ao servidor pequeno de produção.
+
+Configuração (variáveis de ambiente):
+- COMPRESSION_ENABLED: "0" desativa a compressão (padrão "1")
+- COMPRESSION_MIN_SIZE: tamanho mínimo do corpo em bytes (padrão 1024)
+- COMPRESSION_TYPES: content-types permitidos, separados por vírgula
+- COMPRESSION_GZIP_LEVEL: nível do gzip, 1 a 9 (padrão 5)
+- COMPRESSION_BROTLI_QUALITY: qualidade do brotli, 0 a 11 (padrão 4)
+"""
+import os
+import zlib
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele, apenas gzip
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "1") != "0"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_TYPES = [
+    t.strip() for t in os.getenv(
+        "COMPRESSION_TYPES",
+        "application/json,text/html,text/plain,text/css,application/javascript"
+    ).split(",") if t.strip()
+]
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "5"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+def escolher_codificacao(accept_encoding: str):
+    """Escolhe 'br' ou 'gzip' conforme o Accept-Encoding do cliente (None se nenhum)"""
+    aceitas = set()
+    for parte in accept_encoding.lower().split(","):
+        nome, _, params = parte.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        aceitas.add(nome.strip())
+    if brotli is not None and "br" in aceitas:
+        return "br"
+    if "gzip" in aceitas:
+        return "gzip"
+    return None
+
+class _Compressor:
+    """Interface única para compressão incremental em gzip ou brotli"""
+
+    def __init__(self, codificacao: str, gzip_level: int, brotli_quality: int):
+        self.codificacao = codificacao
+        if codificacao == "br":
+            self._br = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 gera o cabeçalho e o rodapé do formato gzip
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def bloco(self, dados: bytes) -> bytes:
+        """Comprime um bloco e descarrega a saída, para o cliente receber aos poucos"""
+        if self.codificacao == "br":
+            return self._br.process(dados) + self._br.flush()
+        return self._gz.compress(dados) + self._gz.flush(zlib.Z_SYNC_FLUSH)
+
+    def finalizar(self, dados: bytes = b"") -> bytes:
+        if self.codificacao == "br":
+            return self._br.process(dados) + self._br.finish()
+        return self._gz.compress(dados) + self._gz.flush(zlib.Z_FINISH)
+
+class CompressionMiddleware:
+    """Middleware ASGI de compressão com limite de tamanho e lista de content-types"""
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        content_types=None,
+        gzip_level: int = COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = COMPRESSION_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = tuple(content_types if content_types is not None else COMPRESSION_TYPES)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for nome, valor in scope["headers"]:
+            if nome == b"accept-encoding":
+                accept_encoding = valor.decode("latin-1")
+                break
+        codificacao = escolher_codificacao(accept_encoding)
+        if codificacao is None:
+            await self.app(scope, receive, send)
+            return
+
+        inicio = None
+        compressor = None
+        repassar = False
+
+        async def send_wrapper(message):
+            nonlocal inicio, compressor, repassar
+            if message["type"] == "http.response.start":
+                # Adia o início até conhecer o primeiro bloco do corpo
+                inicio = message
+                return
+            if message["type"] != "http.response.body" or repassar:
+                await send(message)
+                return
+
+            corpo = message.get("body", b"")
+            mais = message.get("more_body", False)
+
+            if compressor is None:
+                headers = {k.lower(): v for k, v in inicio.get("headers", [])}
+                content_type = headers.get(b"content-type", b"").decode("latin-1").split(";")[0].strip()
+                if (
+                    b"content-encoding" in headers
+                    or content_type not in self.content_types
+                    or (not mais and len(corpo) < self.minimum_size)
+                ):
+                    repassar = True
+                    await send(inicio)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(codificacao, self.gzip_level, self.brotli_quality)
+                novos_headers = [
+                    (k, v) for k, v in inicio.get("headers", [])
+                    if k.lower() not in (b"content-length", b"vary")
+                ]
+                vary = headers.get(b"vary")
+                novos_headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+                novos_headers.append((b"content-encoding", codificacao.encode()))
+
+                if not mais:
+                    comprimido = compressor.finalizar(corpo)
+                    novos_headers.append((b"content-length", str(len(comprimido)).encode()))
+                    await send({**inicio, "headers": novos_headers})
+                    await send({"type": "http.response.body", "body": comprimido})
+                    return
+
+                # Streaming: sem content-length, o corpo sai comprimido em blocos
+                await send({**inicio, "headers": novos_headers})
+
+            if mais:
+                await send({"type": "http.response.body", "body": compressor.bloco(corpo), "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finalizar(corpo)})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from contextvars import ContextVar
 import os
 from dotenv import load_dotenv
 
@@ -21,8 +22,16 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Classe Base para os modelos
 Base = declarative_base()
 
+# Sessão compartilhada pelas sub-requisições de um lote (ver routers/batch_routes.py)
+batch_session = ContextVar("batch_session", default=None)
+
 # Função para obter uma sessão do banco de dados
 def get_db():
+    shared = batch_session.get()
+    if shared is not None:
+        # Dentro de um lote a sessão pertence ao lote, que é quem a fecha
+        yield shared
+        return
     db = SessionLocal()
     try:
         yield db
@@ -0,0 +1,276 @@
+"""
+Feed de alterações em tempo real, entregue por Server-Sent Events (SSE).
+
+As rotas de escrita chamam publicar_evento logo após o commit. Cada conexão
+SSE assina o canal e recebe eventos compactos (entidade, id, ação, campos
+alterados e versão), para que o cliente busque de novo apenas o que mudou.
+
+O canal é do processo: cada worker numera os seus eventos e guarda os mais
+recentes para reconexões com Last-Event-ID. Se o cliente reconectar em outro
+processo, ou após perder eventos, recebe um evento "reset" e deve recarregar
+tudo o que exibe.
+
+Com vários workers (run.py define EVENTS_POLL_INTERVAL), uma escrita feita em
+um processo não chegaria às conexões abertas nos outros. Nesse modo o
+RelayAlteracoes de cada worker lê o log de alterações (Registro_Alteracoes,
+gravado na mesma transação das escritas) e publica no canal o que qualquer
+processo gravou, com a versão igual ao id_registro: os ids dos eventos valem
+em todos os workers. publicar_evento apenas antecipa a próxima leitura. Os
+eventos do log não trazem os campos alterados, exceto "itens" nas alterações
+de itens, e as mesmas leituras invalidam os caches dos outros processos
+(registrar_invalidacao).
+
+Configuração (variáveis de ambiente):
+- EVENTS_HEARTBEAT: segundos entre comentários de keep-alive (padrão 15)
+- EVENTS_BUFFER: eventos guardados para reconexão (padrão 1000)
+- EVENTS_QUEUE_SIZE: eventos pendentes por conexão antes do "reset" (padrão 256)
+- EVENTS_POLL_INTERVAL: segundos entre leituras do log de alterações; 0 desativa (padrão 0)
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Iterable, Optional
+
+from .change_log import SYNC_BATCH_LIMIT, alteracoes_desde, cursor_atual
+from .database import SessionLocal
+from .models import ItemChamado
+
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+EVENTS_BUFFER = int(os.getenv("EVENTS_BUFFER", "1000"))
+EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+EVENTS_POLL_INTERVAL = float(os.getenv("EVENTS_POLL_INTERVAL", "0"))
+
+# Identifica o processo nos ids dos eventos (Last-Event-ID de outro processo gera "reset");
+# com o log, as versões são os ids do log, comuns a todos os processos
+INSTANCIA = "log" if EVENTS_POLL_INTERVAL > 0 else uuid.uuid4().hex[:8]
+
+logger = logging.getLogger("refritec.eventos")
+
+class Assinatura:
+    """Fila de eventos de uma conexão SSE, alimentada a partir de qualquer thread"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, filtro):
+        self.loop = loop
+        self.filtro = filtro
+        self.fila = asyncio.Queue(maxsize=EVENTS_QUEUE_SIZE)
+        self.estourou = False  # eventos descartados: o cliente precisa de um "reset"
+
+    def entregar(self, evento: dict):
+        if not self.filtro(evento):
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._colocar, evento)
+        except RuntimeError:
+            # Loop já encerrado: a conexão está sendo fechada
+            pass
+
+    def _colocar(self, evento: dict):
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            self.estourou = True
+
+class CanalEventos:
+    """Distribui os eventos publicados para todas as assinaturas ativas"""
+
+    def __init__(self, tamanho_historico: int = EVENTS_BUFFER):
+        self._lock = threading.Lock()
+        self._versao = 0
+        self._descartada = 0  # versão mais recente que já saiu do histórico
+        self._historico = deque(maxlen=tamanho_historico)
+        self._assinaturas = set()
+        self.publicados = 0
+        self.versoes_do_log = False
+
+    def publicar(self, entidade: str, id_entidade: Optional[int], acao: str,
+                 campos: Iterable[str] = (), usuarios: Iterable[Optional[int]] = (),
+                 versao: Optional[int] = None) -> dict:
+        """
+        Registra e distribui um evento. `usuarios` são os técnicos donos do registro
+        (antes e depois da alteração), usados apenas para filtrar por papel.
+        `versao` vem do log de alterações (RelayAlteracoes); sem ela, a do processo.
+        """
+        with self._lock:
+            self._versao = self._versao + 1 if versao is None else versao
+            if len(self._historico) == self._historico.maxlen:
+                self._descartada = self._historico[0]["versao"] if self._historico else self._versao
+            evento = {
+                "versao": self._versao,
+                "entidade": entidade,
+                "id": id_entidade,
+                "acao": acao,
+                "campos": sorted(campos),
+                "usuarios": sorted({u for u in usuarios if u is not None}),
+            }
+            self._historico.append(evento)
+            self.publicados += 1
+            assinaturas = list(self._assinaturas)
+        for assinatura in assinaturas:
+            assinatura.entregar(evento)
+        return evento
+
+    def assinar(self, loop: asyncio.AbstractEventLoop, filtro) -> Assinatura:
+        assinatura = Assinatura(loop, filtro)
+        with self._lock:
+            self._assinaturas.add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura: Assinatura):
+        with self._lock:
+            self._assinaturas.discard(assinatura)
+
+    def usar_versoes_do_log(self, cursor: int):
+        """Passa a numerar pelo log: eventos anteriores ao cursor não estão no histórico"""
+        with self._lock:
+            self._versao = self._descartada = cursor
+            self._historico.clear()
+            self.versoes_do_log = True
+
+    def desde(self, versao: int):
+        """Eventos posteriores à versão, ou None se parte deles já saiu do histórico"""
+        with self._lock:
+            if versao > self._versao:
+                # Com o log, o cliente veio de um worker que leu o log antes deste
+                return [] if self.versoes_do_log else None
+            if versao < self._descartada:
+                return None
+            return [e for e in self._historico if e["versao"] > versao]
+
+    @property
+    def conexoes(self) -> int:
+        with self._lock:
+            return len(self._assinaturas)
+
+canal = CanalEventos()
+
+def eventos_do_log(db, registros) -> list:
+    """
+    Eventos do canal a partir de registros do log, um por registro alterado
+    (com a versão do último registro dele). Alterações de itens viram eventos
+    do chamado com campos ["itens"]; o chamado de um item já removido não é
+    conhecido, e o evento sai com id None.
+    """
+    ids_itens = {r.id_entidade for r in registros if r.entidade == "item_chamado"}
+    chamado_do_item = dict(
+        db.query(ItemChamado.id_item_chamado, ItemChamado.id_chamado)
+        .filter(ItemChamado.id_item_chamado.in_(ids_itens)).all()
+    ) if ids_itens else {}
+    eventos = {}
+    for registro in registros:
+        entidade, id_entidade, acao, campos = registro.entidade, registro.id_entidade, registro.acao, ()
+        if entidade == "item_chamado":
+            entidade, id_entidade, acao, campos = "chamado", chamado_do_item.get(id_entidade), "alterado", ("itens",)
+        evento = eventos.setdefault((entidade, id_entidade), {
+            "entidade": entidade, "id": id_entidade, "campos": set(), "usuarios": set()
+        })
+        evento["acao"] = acao
+        evento["versao"] = registro.id_registro
+        evento["campos"].update(campos)
+        evento["usuarios"].update((registro.id_usuario, registro.id_usuario_anterior))
+    return sorted(eventos.values(), key=lambda e: e["versao"])
+
+class RelayAlteracoes:
+    """Thread que publica no canal as alterações gravadas no log por qualquer processo"""
+
+    def __init__(self, destino: CanalEventos, intervalo: float = EVENTS_POLL_INTERVAL):
+        self.canal = destino
+        self.intervalo = intervalo
+        self.cursor = 0
+        self.ativo = False
+        self.invalidacoes = []
+        self._acordar = threading.Event()
+        self._parar = threading.Event()
+        self._thread = None
+
+    def iniciar(self):
+        db = SessionLocal()
+        try:
+            self.cursor = cursor_atual(db)
+        finally:
+            db.close()
+        self.canal.usar_versoes_do_log(self.cursor)
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="relay-alteracoes", daemon=True)
+        self._thread.start()
+        self.ativo = True
+
+    def parar(self):
+        if self._thread is not None:
+            self._parar.set()
+            self._acordar.set()
+            self._thread.join()
+            self._thread = None
+        self.ativo = False
+
+    def acordar(self):
+        self._acordar.set()
+
+    def _executar(self):
+        while not self._parar.is_set():
+            self._acordar.wait(self.intervalo)
+            self._acordar.clear()
+            try:
+                self.ler_log()
+            except Exception:
+                # Banco ocupado ou indisponível: tenta de novo na próxima leitura
+                logger.exception("Falha ao ler o log de alterações")
+
+    def ler_log(self):
+        """Publica os registros posteriores ao cursor, em lotes de SYNC_BATCH_LIMIT"""
+        db = SessionLocal()
+        try:
+            while True:
+                registros, has_more = alteracoes_desde(db, self.cursor, SYNC_BATCH_LIMIT)
+                if not registros:
+                    return
+                for evento in eventos_do_log(db, registros):
+                    for invalidar in self.invalidacoes:
+                        invalidar(evento)
+                    self.canal.publicar(
+                        evento["entidade"], evento["id"], evento["acao"],
+                        evento["campos"], evento["usuarios"], versao=evento["versao"]
+                    )
+                self.cursor = registros[-1].id_registro
+                if not has_more:
+                    return
+        finally:
+            db.close()
+
+relay = RelayAlteracoes(canal)
+
+def registrar_invalidacao(funcao):
+    """Registra uma função chamada com cada evento lido do log (invalida os caches deste processo)"""
+    relay.invalidacoes.append(funcao)
+    return funcao
+
+def publicar_evento(entidade: str, id_entidade: int, acao: str,
+                    campos: Iterable[str] = (), usuarios: Iterable[Optional[int]] = ()):
+    """Publica um evento no canal do processo; chamar somente após o commit"""
+    if relay.ativo:
+        # O evento chega pelo log, com a versão comum a todos os workers
+        relay.acordar()
+        return None
+    return canal.publicar(entidade, id_entidade, acao, campos, usuarios)
+
+def id_do_evento(evento: dict) -> str:
+    return f"{INSTANCIA}:{evento['versao']}"
+
+def formatar_sse(evento: dict) -> str:
+    """Mensagem SSE do evento, sem o campo interno de técnicos"""
+    dados = {k: v for k, v in evento.items() if k != "usuarios"}
+    return (
+        f"id: {id_do_evento(evento)}\n"
+        f"event: {evento['entidade']}\n"
+        f"data: {json.dumps(dados, ensure_ascii=False)}\n\n"
+    )
+
+def evento_reset() -> str:
+    """Avisa o cliente que eventos foram perdidos e que ele deve recarregar os dados"""
+    with canal._lock:
+        versao = canal._versao
+    dados = json.dumps({"versao": versao, "entidade": "reset"})
+    return f"id: {INSTANCIA}:{versao}\nevent: reset\ndata: {dados}\n\n"
@@ -0,0 +1,203 @@
+"""
+Caminho rápido de serialização para listas grandes de chamados.
+
+Em vez de carregar objetos ORM e validá-los com os esquemas Pydantic
+(`from_attributes`), seleciona apenas as colunas necessárias como tuplas
+e gera o JSON diretamente com TypeAdapters pré-compilados (pydantic-core).
+O JSON produzido tem o mesmo formato de `schemas.Chamado`.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from sqlalchemy import tuple_
+from typing_extensions import TypedDict
+
+from .models import Chamado, Cliente, Usuario
+
+class ClienteRow(TypedDict):
+    telefone: str
+    nome: str
+    endereco: Optional[str]
+    id_cliente: int
+
+class UsuarioRow(TypedDict):
+    nome: str
+    username: str
+    id_usuario: int
+
+class ChamadoRow(TypedDict):
+    id_cliente: int
+    id_usuario: Optional[int]
+    descricao: str
+    aparelho: str
+    status: str
+    observacao: Optional[str]
+    data_prevista: Optional[date]
+    data_conclusao: Optional[datetime]
+    id_chamado: int
+    valor: Optional[float]
+    data_abertura: datetime
+    cliente: Optional[ClienteRow]
+    tecnico: Optional[UsuarioRow]
+
+class ChamadoPaginatedRow(TypedDict):
+    total: Optional[int]
+    page: int
+    per_page: int
+    items: List[ChamadoRow]
+    has_more: bool
+    total_is_estimate: bool
+
+class ChamadoCursorPaginatedRow(ChamadoPaginatedRow):
+    next_cursor: Optional[str]
+
+class AgendaRow(TypedDict):
+    id_usuario: int
+    data: date
+    hoje: List[ChamadoRow]
+    proximos_dias: Dict[str, List[ChamadoRow]]
+    atrasados: List[ChamadoRow]
+
+# Adaptadores compilados uma única vez, na importação do módulo
+CHAMADO_ADAPTER = TypeAdapter(ChamadoRow)
+CHAMADO_LIST_ADAPTER = TypeAdapter(List[ChamadoRow])
+CHAMADO_PAGINATED_ADAPTER = TypeAdapter(ChamadoPaginatedRow)
+CHAMADO_CURSOR_PAGINATED_ADAPTER = TypeAdapter(ChamadoCursorPaginatedRow)
+CHAMADOS_POR_DIA_ADAPTER = TypeAdapter(Dict[str, List[ChamadoRow]])
+AGENDA_ADAPTER = TypeAdapter(AgendaRow)
+
+# Colunas selecionadas pelo caminho rápido (a ordem é usada em linha_para_chamado)
+COLUNAS_CHAMADO = (
+    Chamado.id_chamado,
+    Chamado.id_cliente,
+    Chamado.id_usuario,
+    Chamado.descricao,
+    Chamado.aparelho,
+    Chamado.status,
+    Chamado.valor,
+    Chamado.observacao,
+    Chamado.data_abertura,
+    Chamado.data_prevista,
+    Chamado.data_conclusao,
+    Cliente.telefone,
+    Cliente.nome,
+    Cliente.endereco,
+    Usuario.nome,
+    Usuario.username,
+)
+
+def selecionar_colunas_chamado(query):
+    """
+    Troca as entidades de uma query de Chamado (já filtrada e ordenada)
+    pelas colunas do caminho rápido, com cliente e técnico via LEFT JOIN.
+    """
+    return query.with_entities(*COLUNAS_CHAMADO).outerjoin(
+        Cliente, Cliente.id_cliente == Chamado.id_cliente
+    ).outerjoin(
+        Usuario, Usuario.id_usuario == Chamado.id_usuario
+    )
+
+def linha_para_chamado(row) -> dict:
+    """Converte uma tupla de COLUNAS_CHAMADO no dicionário serializado por ChamadoRow"""
+    (id_chamado, id_cliente, id_usuario, descricao, aparelho, status, valor,
+     observacao, data_abertura, data_prevista, data_conclusao,
+     cliente_telefone, cliente_nome, cliente_endereco,
+     tecnico_nome, tecnico_username) = row
+    return {
+        "id_cliente": id_cliente,
+        "id_usuario": id_usuario,
+        "descricao": descricao,
+        "aparelho": aparelho,
+        "status": status,
+        "observacao": observacao,
+        "data_prevista": data_prevista,
+        "data_conclusao": data_conclusao,
+        "id_chamado": id_chamado,
+        "valor": float(valor) if valor is not None else None,
+        "data_abertura": data_abertura,
+        "cliente": {
+            "telefone": cliente_telefone,
+            "nome": cliente_nome,
+            "endereco": cliente_endereco,
+            "id_cliente": id_cliente,
+        } if cliente_nome is not None else None,
+        "tecnico": {
+            "nome": tecnico_nome,
+            "username": tecnico_username,
+            "id_usuario": id_usuario,
+        } if tecnico_nome is not None else None,
+    }
+
+def json_response(adapter: TypeAdapter, payload) -> Response:
+    """Serializa o payload com o adaptador informado, sem passar pelo response_model"""
+    return Response(content=adapter.dump_json(payload), media_type="application/json")
+
+def chamado_json(row) -> bytes:
+    """JSON de um único chamado a partir de uma tupla de COLUNAS_CHAMADO (usado em streaming)"""
+    return CHAMADO_ADAPTER.dump_json(linha_para_chamado(row))
+
+def pagina_chamados_json(
+    query, total: Optional[int], page: int, per_page: int, total_is_estimate: bool = False
+) -> Response:
+    """Resposta JSON para uma página de chamados (mesmo formato de schemas.ChamadoPaginated)"""
+    # Uma linha a mais indica se existe próxima página
+    rows = selecionar_colunas_chamado(query).offset((page - 1) * per_page).limit(per_page + 1).all()
+    return json_response(CHAMADO_PAGINATED_ADAPTER, {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "items": [linha_para_chamado(row) for row in rows[:per_page]],
+        "has_more": len(rows) > per_page,
+        "total_is_estimate": total_is_estimate,
+    })
+
+def codificar_cursor(data_abertura: datetime, id_chamado: int) -> str:
+    """Cursor opaco com a posição (data_abertura, id_chamado) do último chamado da página"""
+    posicao = json.dumps([data_abertura.isoformat(), id_chamado])
+    return base64.urlsafe_b64encode(posicao.encode()).decode().rstrip("=")
+
+def decodificar_cursor(cursor: str):
+    """Inverso de codificar_cursor; lança ValueError se o cursor for inválido"""
+    try:
+        bruto = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data_abertura, id_chamado = json.loads(bruto)
+        return datetime.fromisoformat(data_abertura), int(id_chamado)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Cursor inválido") from e
+
+def pagina_chamados_cursor_json(query, total: int, page: int, per_page: int, cursor: Optional[str]) -> Response:
+    """
+    Página de chamados do mais recente ao mais antigo, paginada por chave
+    (data_abertura, id_chamado). Com cursor, a página começa logo após a posição
+    do cursor e dispensa o OFFSET; sem cursor, usa page (compatibilidade).
+    A query deve estar filtrada e sem ordenação.
+    """
+    if cursor:
+        query = query.filter(
+            tuple_(Chamado.data_abertura, Chamado.id_chamado) < tuple_(*decodificar_cursor(cursor))
+        )
+    query = selecionar_colunas_chamado(
+        query.order_by(Chamado.data_abertura.desc(), Chamado.id_chamado.desc())
+    )
+    if not cursor:
+        query = query.offset((page - 1) * per_page)
+    # Uma linha a mais indica se existe próxima página
+    rows = query.limit(per_page + 1).all()
+    items = [linha_para_chamado(row) for row in rows[:per_page]]
+    next_cursor = None
+    if len(rows) > per_page:
+        ultimo = items[-1]
+        next_cursor = codificar_cursor(ultimo["data_abertura"], ultimo["id_chamado"])
+    return json_response(CHAMADO_CURSOR_PAGINATED_ADAPTER, {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "items": items,
+        "has_more": next_cursor is not None,
+        "total_is_estimate": False,
+        "next_cursor": next_cursor,
+    })
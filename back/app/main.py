@@ -1,20 +1,50 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+import anyio
+from contextlib import asynccontextmanager
 
-from .routers import cliente_routes, chamado_routes, auth_routes, caixa_routes
+from .routers import cliente_routes, chamado_routes, auth_routes, caixa_routes, batch_routes, relatorio_routes, eventos_routes, sync_routes
 from .database import engine, Base
+from .compression import CompressionMiddleware, COMPRESSION_ENABLED
+from .metrics import MetricsMiddleware, METRICS_ENABLED, instrumentar_engine, renderizar, medidor, contador
+from .events import canal, relay, EVENTS_POLL_INTERVAL
+from .query_stats import QueryStatsMiddleware, instrumentar_engine as instrumentar_consultas
+from .profiling import ProfilingMiddleware
+from .traffic_capture import TrafficCaptureMiddleware, TRAFFIC_CAPTURE, configurar_captura
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# create_all skips indexes of tables that already exist, so create missing ones
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+# Count pool checkouts and SQLite "database is locked" errors for /metrics
+if METRICS_ENABLED:
+    instrumentar_engine(engine)
+
+# Count and time SQL statements per request, flag N+1 patterns and log slow queries
+instrumentar_consultas(engine)
+
 # Create admin user using direct SQL
 auth_routes.create_admin_user()
 
+# Multiple workers: each one feeds its change feed and cache invalidation from the change log
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if EVENTS_POLL_INTERVAL > 0:
+        relay.iniciar()
+    yield
+    relay.parar()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="API de Chamados Técnicos",
     description="API para sistema de gestão de chamados técnicos",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Allow all origins for simplicity in development
@@ -26,11 +56,61 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Per-request SQL statistics (X-DB-Queries/X-DB-Time headers when SQL_DEBUG=1)
+app.add_middleware(QueryStatsMiddleware)
+
+# Compress large JSON/text responses (gzip, or brotli when installed)
+if COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+# On-demand (X-Profile header, administrators) and 1-in-N sampling profiles
+app.add_middleware(ProfilingMiddleware)
+
+# Sanitized request traces for scripts/replay_traffic.py (opt-in, TRAFFIC_CAPTURE=1)
+if TRAFFIC_CAPTURE:
+    configurar_captura()
+    app.add_middleware(TrafficCaptureMiddleware)
+
+# Per-route request counts, latency and response sizes (outermost, so sizes are as sent)
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(cliente_routes.router)
 app.include_router(chamado_routes.router)
 app.include_router(auth_routes.router)
 app.include_router(caixa_routes.router)
+app.include_router(batch_routes.router)
+app.include_router(relatorio_routes.router)
+app.include_router(eventos_routes.router)
+app.include_router(sync_routes.router)
+
+# Prometheus metrics (text exposition format)
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        threads = limiter.statistics()
+        pool = engine.pool
+        caches = {nome: cache.metricas() for nome, cache in relatorio_routes.caches_do_processo().items()}
+        extras = [
+            medidor("threadpool_size", "Threads disponíveis para rotas síncronas", {(): threads.total_tokens}),
+            medidor("threadpool_busy", "Threads ocupadas por rotas síncronas", {(): threads.borrowed_tokens}),
+            medidor("threadpool_waiting", "Tarefas aguardando uma thread livre", {(): threads.tasks_waiting}),
+            medidor("sse_connections", "Conexões abertas no feed de eventos", {(): canal.conexoes}),
+        ]
+        if hasattr(pool, "checkedout"):
+            extras.append(medidor("db_pool_checked_out", "Conexões do pool em uso", {(): pool.checkedout()}))
+        for campo in ("hits", "misses", "computacoes", "coalescidas"):
+            extras.append(contador(
+                f"cache_{campo}_total", f"Contador '{campo}' dos caches em memória",
+                {(nome,): valores[campo] for nome, valores in caches.items()}, ("cache",)
+            ))
+        extras.append(medidor(
+            "cache_entries", "Entradas nos caches em memória",
+            {(nome,): valores["entradas"] for nome, valores in caches.items()}, ("cache",)
+        ))
+        return Response(content=renderizar(*extras), media_type="text/plain; version=0.0.4")
 
 # Root route
 @app.get("/")
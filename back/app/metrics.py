@@ -0,0 +1,214 @@
+"""
+Métricas da aplicação no formato texto do Prometheus.
+
+O MetricsMiddleware registra, por método e rota (o caminho declarado, por
+exemplo /api/chamados/{id_chamado}), o número de requisições por status, um
+histograma de latência, um histograma do tamanho das respostas e as
+requisições em andamento. instrumentar_engine conta as conexões retiradas do
+pool e os erros de banco ocupado do SQLite. O custo por requisição é um
+relógio e alguns incrementos protegidos por lock, sem dependências externas.
+
+Configuração (variáveis de ambiente):
+- METRICS_ENABLED: "0" desativa o middleware e o endpoint /metrics (padrão "1")
+"""
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+PREFIXO = "refritec_"
+
+# Limites dos histogramas: latência em segundos e tamanho das respostas em bytes
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BUCKETS_TAMANHO = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+# Requisições que não correspondem a nenhuma rota (404) ficam agrupadas,
+# para que caminhos arbitrários não criem séries novas
+ROTA_DESCONHECIDA = "<sem rota>"
+
+def _escapar(valor) -> str:
+    return str(valor).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _formatar_rotulos(nomes, valores, extra=None) -> str:
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return "{" + ",".join(pares) + "}" if pares else ""
+
+def _formatar_numero(valor) -> str:
+    if isinstance(valor, float):
+        return repr(valor) if valor != int(valor) else str(int(valor))
+    return str(valor)
+
+class _Metrica:
+    tipo = "untyped"
+
+    def __init__(self, nome: str, ajuda: str, rotulos=()):
+        self.nome = PREFIXO + nome
+        self.ajuda = ajuda
+        self.rotulos = tuple(rotulos)
+        self._lock = threading.Lock()
+        self._valores = {}
+
+    def cabecalho(self):
+        return [f"# HELP {self.nome} {self.ajuda}", f"# TYPE {self.nome} {self.tipo}"]
+
+    def linhas(self):
+        with self._lock:
+            valores = sorted(self._valores.items())
+        if not valores and not self.rotulos:
+            valores = [((), 0)]  # série sem rótulos aparece zerada desde o início
+        return self.cabecalho() + [
+            f"{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(valor)}"
+            for chave, valor in valores
+        ]
+
+class Contador(_Metrica):
+    """Valor que só cresce (requisições, checkouts, erros)"""
+    tipo = "counter"
+
+    def inc(self, *rotulos, n=1):
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + n
+
+class Medidor(_Metrica):
+    """Valor que sobe e desce (requisições em andamento)"""
+    tipo = "gauge"
+
+    def inc(self, *rotulos, n=1):
+        with self._lock:
+            self._valores[rotulos] = self._valores.get(rotulos, 0) + n
+
+    def dec(self, *rotulos, n=1):
+        self.inc(*rotulos, n=-n)
+
+class Histograma(_Metrica):
+    """Distribuição em faixas cumulativas, com soma e contagem"""
+    tipo = "histogram"
+
+    def __init__(self, nome: str, ajuda: str, rotulos=(), buckets=BUCKETS_LATENCIA):
+        super().__init__(nome, ajuda, rotulos)
+        self.buckets = tuple(buckets)
+
+    def observe(self, valor, *rotulos):
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._valores.get(rotulos)
+            if serie is None:
+                # Contagem por faixa (a última é +Inf), soma e total
+                serie = self._valores[rotulos] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def linhas(self):
+        with self._lock:
+            valores = sorted((chave, (list(s[0]), s[1], s[2])) for chave, s in self._valores.items())
+        saida = self.cabecalho()
+        for chave, (contagens, soma, total) in valores:
+            acumulado = 0
+            for limite, contagem in zip(self.buckets + (float("inf"),), contagens):
+                acumulado += contagem
+                le = "+Inf" if limite == float("inf") else _formatar_numero(limite)
+                rotulos = _formatar_rotulos(self.rotulos, chave, 'le="' + le + '"')
+                saida.append(f"{self.nome}_bucket{rotulos} {acumulado}")
+            saida.append(f"{self.nome}_sum{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(soma)}")
+            saida.append(f"{self.nome}_count{_formatar_rotulos(self.rotulos, chave)} {total}")
+        return saida
+
+requisicoes = Contador("http_requests_total", "Requisições HTTP concluídas", ("method", "route", "status"))
+latencia = Histograma(
+    "http_request_duration_seconds", "Tempo de resposta das requisições HTTP (exceto streams de eventos)",
+    ("method", "route"), BUCKETS_LATENCIA
+)
+tamanho_resposta = Histograma(
+    "http_response_size_bytes", "Tamanho do corpo das respostas HTTP, após a compressão",
+    ("method", "route"), BUCKETS_TAMANHO
+)
+em_andamento = Medidor("http_requests_in_progress", "Requisições HTTP em andamento", ("method",))
+checkouts_pool = Contador("db_pool_checkouts_total", "Conexões retiradas do pool do banco")
+erros_banco_ocupado = Contador(
+    "db_busy_errors_total", "Operações que esgotaram a espera do SQLite por um lock (database is locked)"
+)
+
+METRICAS = [requisicoes, latencia, tamanho_resposta, em_andamento, checkouts_pool, erros_banco_ocupado]
+
+class MetricsMiddleware:
+    """Middleware ASGI que registra contagem, latência e tamanho das respostas por rota"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metodo = scope["method"]
+        inicio = time.perf_counter()
+        status_code = 500
+        tamanho = 0
+        stream_eventos = False
+
+        async def send_wrapper(message):
+            nonlocal status_code, tamanho, stream_eventos
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for nome, valor in message.get("headers", []):
+                    if nome.lower() == b"content-type" and valor.startswith(b"text/event-stream"):
+                        stream_eventos = True
+            elif message["type"] == "http.response.body":
+                tamanho += len(message.get("body", b""))
+            await send(message)
+
+        em_andamento.inc(metodo)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            em_andamento.dec(metodo)
+            # O roteador do FastAPI grava a rota encontrada no scope
+            rota = getattr(scope.get("route"), "path", ROTA_DESCONHECIDA)
+            requisicoes.inc(metodo, rota, str(status_code))
+            tamanho_resposta.observe(tamanho, metodo, rota)
+            # Streams SSE duram a conexão inteira e distorceriam o histograma de latência
+            if not stream_eventos:
+                latencia.observe(time.perf_counter() - inicio, metodo, rota)
+
+def instrumentar_engine(engine):
+    """Conta checkouts do pool e erros de banco ocupado do engine"""
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        checkouts_pool.inc()
+
+    @event.listens_for(engine, "handle_error")
+    def _erro(contexto):
+        erro = contexto.original_exception
+        if isinstance(erro, sqlite3.OperationalError) and "locked" in str(erro):
+            erros_banco_ocupado.inc()
+
+def medidor(nome: str, ajuda: str, valores, rotulos=()):
+    """Linhas de um gauge calculado na hora da coleta; `valores` é {tupla de rótulos: valor}"""
+    metrica = Medidor(nome, ajuda, rotulos)
+    metrica._valores = dict(valores)
+    return metrica.linhas()
+
+def contador(nome: str, ajuda: str, valores, rotulos=()):
+    """Linhas de um counter mantido fora deste módulo (por exemplo, nos caches)"""
+    metrica = Contador(nome, ajuda, rotulos)
+    metrica._valores = dict(valores)
+    return metrica.linhas()
+
+def renderizar(*extras) -> str:
+    """Texto no formato de exposição do Prometheus; `extras` são listas de linhas adicionais"""
+    linhas = []
+    for metrica in METRICAS:
+        linhas.extend(metrica.linhas())
+    for extra in extras:
+        linhas.extend(extra)
+    return "\n".join(linhas) + "\n"
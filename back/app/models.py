@@ -1,9 +1,26 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Numeric, Date, Boolean, Enum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Numeric, Date, Boolean, Enum, Index, CheckConstraint
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, column, literal_column
 import enum
 from .database import Base
 
+class StatusChamadoEnum(str, enum.Enum):
+    ABERTO = "Aberto"
+    EM_ANDAMENTO = "Em Andamento"
+    CONCLUIDO = "Concluído"
+    CANCELADO = "Cancelado"
+
+# Status de chamados que ainda exigem trabalho
+STATUS_ATIVOS = (StatusChamadoEnum.ABERTO.value, StatusChamadoEnum.EM_ANDAMENTO.value)
+
+def filtro_status_ativos(coluna=column("status")):
+    """
+    Condição "status IN ('Aberto', 'Em Andamento')" com os valores literais.
+    O SQLite só usa um índice parcial quando a consulta repete a condição do
+    índice com as mesmas constantes; parâmetros (?) impedem o uso do índice.
+    """
+    return coluna.in_([literal_column(f"'{s}'") for s in STATUS_ATIVOS])
+
 class RoleEnum(str, enum.Enum):
     ADMINISTRADOR = "administrador"
     GERENTE = "gerente"
@@ -38,6 +55,7 @@ class Cliente(Base):
     
     # Relacionamento com chamados
     chamados = relationship("Chamado", back_populates="cliente", cascade="all, delete-orphan")
+    resumo = relationship("ResumoCliente", back_populates="cliente", uselist=False, cascade="all, delete-orphan")
     
     def __repr__(self):
         return f"<Cliente(id={self.id_cliente}, nome={self.nome}, telefone={self.telefone})>"
@@ -51,11 +69,11 @@ class Chamado(Base):
     id_usuario = Column(Integer, ForeignKey("Usuario.id_usuario"), nullable=True)
     descricao = Column(Text, nullable=False)
     aparelho = Column(String(100), nullable=False)
-    status = Column(String(50), nullable=False, default="Aberto")
+    status = Column(String(20), nullable=False, default=StatusChamadoEnum.ABERTO.value)
     valor = Column(Numeric(10, 2), default=0.00)
     observacao = Column(Text)
-    data_abertura = Column(DateTime, default=func.now())
-    data_prevista = Column(Date)
+    data_abertura = Column(DateTime, default=func.now(), index=True)
+    data_prevista = Column(Date, index=True)
     data_conclusao = Column(DateTime, nullable=True)
     
     # Relacionamentos
@@ -63,6 +81,33 @@ class Chamado(Base):
     tecnico = relationship("Usuario", back_populates="chamados")
     itens = relationship("ItemChamado", back_populates="chamado", cascade="all, delete-orphan")
     historico = relationship("HistoricoAlteracaoChamado", back_populates="chamado", cascade="all, delete-orphan")
+    intervalos_status = relationship("IntervaloStatusChamado", back_populates="chamado", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Apenas os status conhecidos (aplicada na criação da tabela)
+        CheckConstraint(
+            "status IN (%s)" % ", ".join(f"'{s.value}'" for s in StatusChamadoEnum),
+            name="ck_Chamados_status"
+        ),
+        # Agenda do técnico: chamados de um técnico por data prevista
+        Index("ix_Chamados_id_usuario_data_prevista", "id_usuario", "data_prevista"),
+        # Relatórios de chamados concluídos por período
+        Index("ix_Chamados_status_data_conclusao", "status", "data_conclusao"),
+        # Chamados e resumo de um cliente
+        Index("ix_Chamados_id_cliente_data_abertura", "id_cliente", "data_abertura"),
+        # Chamados de um técnico, do mais recente ao mais antigo
+        Index("ix_Chamados_id_usuario_data_abertura", "id_usuario", "data_abertura"),
+        # Backlog em aberto: índice parcial, não cresce com o histórico de concluídos
+        Index(
+            "ix_Chamados_ativos_status_data_abertura", "status", "data_abertura", "data_prevista",
+            sqlite_where=filtro_status_ativos()
+        ),
+        # Atrasados e backlog por técnico, apenas entre os chamados em aberto
+        Index(
+            "ix_Chamados_ativos_id_usuario_data_prevista", "id_usuario", "data_prevista",
+            sqlite_where=filtro_status_ativos()
+        ),
+    )
     
     def __repr__(self):
         return f"<Chamado(id={self.id_chamado}, cliente_id={self.id_cliente}, tecnico_id={self.id_usuario}, status={self.status})>"
@@ -72,7 +117,7 @@ class ItemChamado(Base):
     __tablename__ = "Itens_Chamado"
     
     id_item_chamado = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    id_chamado = Column(Integer, ForeignKey("Chamados.id_chamado"), nullable=False)
+    id_chamado = Column(Integer, ForeignKey("Chamados.id_chamado"), nullable=False, index=True)
     descricao = Column(Text, nullable=False)
     quantidade = Column(Integer, default=1)
     valor_unitario = Column(Numeric(10, 2), nullable=False)
@@ -101,6 +146,49 @@ class HistoricoAlteracaoChamado(Base):
     def __repr__(self):
         return f"<HistoricoAlteracao(id={self.id_historico}, chamado_id={self.id_chamado}, campo={self.campo_alterado})>"
 
+class IntervaloStatusChamado(Base):
+    """Modelo para a tabela Intervalos_Status_Chamados (tempo de cada chamado em cada status)"""
+    __tablename__ = "Intervalos_Status_Chamados"
+    
+    id_intervalo = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id_chamado = Column(Integer, ForeignKey("Chamados.id_chamado"), nullable=False)
+    status = Column(String(50), nullable=False)
+    id_usuario = Column(Integer, nullable=True)  # técnico responsável ao entrar no status
+    entrou_em = Column(DateTime, nullable=False)
+    saiu_em = Column(DateTime, nullable=True)  # NULL enquanto o chamado está no status
+    
+    # Relacionamento
+    chamado = relationship("Chamado", back_populates="intervalos_status")
+    
+    __table_args__ = (
+        # Intervalo aberto de um chamado (fechado a cada mudança de status)
+        Index("ix_Intervalos_Status_Chamados_id_chamado_saiu_em", "id_chamado", "saiu_em"),
+        # Métricas de SLA por status e período
+        Index("ix_Intervalos_Status_Chamados_status_entrou_em", "status", "entrou_em"),
+    )
+    
+    def __repr__(self):
+        return f"<IntervaloStatusChamado(id={self.id_intervalo}, chamado_id={self.id_chamado}, status={self.status})>"
+
+class ResumoCliente(Base):
+    """Modelo para a tabela Resumo_Cliente (agregados de todo o histórico do cliente)"""
+    __tablename__ = "Resumo_Cliente"
+    
+    id_cliente = Column(Integer, ForeignKey("Cliente.id_cliente"), primary_key=True)
+    total_chamados = Column(Integer, nullable=False, default=0)  # exceto cancelados
+    chamados_abertos = Column(Integer, nullable=False, default=0)  # "Aberto" ou "Em Andamento"
+    chamados_concluidos = Column(Integer, nullable=False, default=0)
+    valor_total = Column(Numeric(10, 2), nullable=False, default=0.00)  # soma dos concluídos
+    ultima_visita = Column(DateTime, nullable=True)  # conclusão mais recente
+    aparelhos_frequentes = Column(Text)  # JSON: [{"aparelho": ..., "quantidade": ...}]
+    atualizado_em = Column(DateTime, default=func.now())
+    
+    # Relacionamento
+    cliente = relationship("Cliente", back_populates="resumo")
+    
+    def __repr__(self):
+        return f"<ResumoCliente(cliente_id={self.id_cliente}, total={self.total_chamados}, abertos={self.chamados_abertos})>"
+
 class Caixa(Base):
     """Modelo para a tabela Caixa (Controle de Caixa)"""
     __tablename__ = "Caixa"
@@ -118,5 +206,33 @@ class Caixa(Base):
 
     usuario = relationship("Usuario")
 
+    __table_args__ = (
+        # Lançamentos e totais do mês (listagem, soma e fechamento)
+        Index("ix_Caixa_mes_ano", "mes", "ano"),
+        # Listagem do mais recente ao mais antigo, sem filtro de mês
+        Index("ix_Caixa_data_lancamento", "data_lancamento"),
+    )
+
+    def __repr__(self):
+        return f"<Caixa(id={self.id_caixa}, tipo={self.tipo}, valor={self.valor}, mes={self.mes}, ano={self.ano}, fechado={self.fechado})>" 
+
+class RegistroAlteracao(Base):
+    """Modelo para a tabela Registro_Alteracoes (log de alterações, somente inserção, para sincronização)"""
+    __tablename__ = "Registro_Alteracoes"
+
+    id_registro = Column(Integer, primary_key=True, autoincrement=True)  # cursor da sincronização
+    entidade = Column(String(20), nullable=False)  # 'chamado', 'item_chamado' ou 'caixa'
+    id_entidade = Column(Integer, nullable=False)
+    acao = Column(String(10), nullable=False)  # 'alterado' ou 'removido'
+    id_usuario = Column(Integer, nullable=True)  # técnico responsável após a alteração
+    id_usuario_anterior = Column(Integer, nullable=True)  # técnico anterior, quando o chamado foi reatribuído
+    data_alteracao = Column(DateTime, default=func.now())
+
+    __table_args__ = (
+        # Sincronização de funcionários: alterações dos seus chamados a partir do cursor
+        Index("ix_Registro_Alteracoes_id_usuario_id_registro", "id_usuario", "id_registro"),
+        Index("ix_Registro_Alteracoes_id_usuario_anterior_id_registro", "id_usuario_anterior", "id_registro"),
+    )
+
     def __repr__(self):
-        return f"<Caixa(id={self.id_caixa}, tipo={self.tipo}, valor={self.valor}, mes={self.mes}, ano={self.ano}, fechado={self.fechado})>" 
\ No newline at end of file
+        return f"<RegistroAlteracao(id={self.id_registro}, entidade={self.entidade}, id_entidade={self.id_entidade}, acao={self.acao})>"
@@ -0,0 +1,57 @@
+"""
+Contagem do total de registros das listas paginadas.
+
+O total exato exige um COUNT sobre todas as linhas do filtro a cada página.
+As rotas de listagem aceitam o parâmetro `contagem` para escolher outro modo:
+- exata: COUNT completo (padrão, comportamento original)
+- cache: COUNT completo, reaproveitado por alguns segundos para o mesmo filtro
+- estimada: conta no máximo COUNT_ESTIMATE_LIMIT + 1 linhas; acima disso o
+  total volta como "mais de N" (total = N e total_is_estimate = true)
+- nenhuma: não conta; a navegação usa has_more
+
+Configuração (variáveis de ambiente):
+- COUNT_CACHE_TTL: segundos de validade de uma contagem em cache (padrão 60)
+- COUNT_ESTIMATE_LIMIT: limite de linhas da contagem estimada (padrão 1000)
+"""
+import enum
+import os
+from typing import Optional, Tuple
+
+from sqlalchemy import func
+
+from .cache import TTLCache
+
+COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "60"))
+COUNT_ESTIMATE_LIMIT = int(os.getenv("COUNT_ESTIMATE_LIMIT", "1000"))
+
+class ModoContagem(str, enum.Enum):
+    EXATA = "exata"
+    CACHE = "cache"
+    ESTIMADA = "estimada"
+    NENHUMA = "nenhuma"
+
+def contar_total(query, modo: ModoContagem, cache: TTLCache, chave) -> Tuple[Optional[int], bool]:
+    """
+    Conta as linhas da query (já filtrada) conforme o modo.
+    Retorna (total, total_is_estimate); total é None no modo "nenhuma".
+    A chave identifica o filtro no cache e só é usada no modo "cache".
+    """
+    if modo == ModoContagem.NENHUMA:
+        return None, False
+
+    if modo == ModoContagem.ESTIMADA:
+        # Para de contar logo após o limite: o custo não cresce com o resultado
+        limitada = query.order_by(None).limit(COUNT_ESTIMATE_LIMIT + 1).subquery()
+        total = query.session.query(func.count()).select_from(limitada).scalar() or 0
+        if total > COUNT_ESTIMATE_LIMIT:
+            return COUNT_ESTIMATE_LIMIT, True
+        return total, False
+
+    if modo == ModoContagem.CACHE:
+        total = cache.get(chave)
+        if total is None:
+            total = query.order_by(None).count()
+            cache.set(chave, total)
+        return total, False
+
+    return query.order_by(None).count(), False
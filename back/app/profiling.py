@@ -0,0 +1,196 @@
+"""
+Perfil de requisições por amostragem de pilhas, no formato "collapsed stacks"
+(uma linha por pilha: "quadro;quadro;... contagem"), aceito por flamegraph.pl,
+speedscope e similares.
+
+Sob demanda: um administrador envia o cabeçalho X-Profile ou o parâmetro
+_profile em qualquer rota. "retornar" devolve o perfil no lugar da resposta
+(o status original vai em X-Profile-Status); "salvar" grava o perfil em
+PROFILE_DIR e devolve a resposta normal, com o nome do arquivo em
+X-Profile-File. Com PROFILE_SAMPLE_RATE = N, uma em cada N requisições é
+gravada em disco, mantendo apenas os PROFILE_MAX_FILES arquivos mais recentes.
+
+Uma thread lê sys._current_frames() a cada PROFILE_INTERVAL_MS enquanto a
+requisição executa. Todas as threads do processo são amostradas (a rota pode
+rodar no loop de eventos ou no threadpool), exceto as ociosas; requisições
+simultâneas aparecem no mesmo perfil, identificadas pelo nome da thread.
+
+Configuração (variáveis de ambiente):
+- PROFILE_INTERVAL_MS: intervalo entre amostras (padrão 5)
+- PROFILE_SAMPLE_RATE: grava 1 em cada N requisições (padrão 0, desativado)
+- PROFILE_DIR: diretório dos perfis gravados (padrão logs/profiles, relativo ao diretório back/)
+- PROFILE_MAX_FILES: perfis mantidos em disco (padrão 50)
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from urllib.parse import parse_qs
+
+from .models import RoleEnum
+
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_SAMPLE_RATE = int(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_DIR = os.getenv(
+    "PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "profiles")
+)
+PROFILE_MAX_FILES = int(os.getenv("PROFILE_MAX_FILES", "50"))
+
+MODOS = ("retornar", "salvar")
+
+# Funções em que uma thread está apenas esperando trabalho (amostras descartadas)
+QUADROS_OCIOSOS = {
+    ("threading.py", "wait"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+}
+
+def _nome_quadro(codigo) -> str:
+    arquivo = codigo.co_filename
+    pasta, nome = os.path.split(arquivo)
+    return f"{codigo.co_name} ({os.path.basename(pasta)}/{nome}:{codigo.co_firstlineno})"
+
+class AmostradorPilhas(threading.Thread):
+    """Thread que conta as pilhas de todas as threads ativas até ser parada"""
+
+    def __init__(self, intervalo_ms: float = PROFILE_INTERVAL_MS):
+        super().__init__(name="amostrador-perfil", daemon=True)
+        self.intervalo = intervalo_ms / 1000
+        self.pilhas = Counter()
+        self.amostras = 0
+        self._parar = threading.Event()
+
+    def run(self):
+        proprio = threading.get_ident()
+        nomes = {}
+        while not self._parar.wait(self.intervalo):
+            self.amostras += 1
+            for ident, quadro in sys._current_frames().items():
+                if ident == proprio:
+                    continue
+                codigo = quadro.f_code
+                if (os.path.basename(codigo.co_filename), codigo.co_name) in QUADROS_OCIOSOS:
+                    continue
+                pilha = []
+                while quadro is not None:
+                    pilha.append(_nome_quadro(quadro.f_code))
+                    quadro = quadro.f_back
+                if ident not in nomes:
+                    thread = threading._active.get(ident)
+                    nomes[ident] = thread.name if thread else str(ident)
+                pilha.append(nomes[ident])
+                self.pilhas[";".join(reversed(pilha))] += 1
+
+    def parar(self) -> str:
+        """Para a amostragem e retorna o perfil no formato collapsed stacks"""
+        self._parar.set()
+        self.join()
+        return "".join(f"{pilha} {n}\n" for pilha, n in self.pilhas.most_common())
+
+def _cabecalho(scope, nome: bytes):
+    for chave, valor in scope["headers"]:
+        if chave == nome:
+            return valor.decode("latin-1")
+    return None
+
+def modo_solicitado(scope):
+    """Modo pedido via X-Profile ou _profile, apenas para administradores autenticados"""
+    modo = _cabecalho(scope, b"x-profile")
+    if modo is None:
+        modo = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("_profile", [None])[0]
+    if modo not in MODOS:
+        return None
+    api_key = os.getenv("API_KEY")
+    if not api_key or _cabecalho(scope, b"x-api-key") != api_key:
+        return None
+    if _cabecalho(scope, b"x-user-role") != RoleEnum.ADMINISTRADOR.value:
+        return None
+    return modo
+
+def nome_perfil(metodo: str, caminho: str) -> str:
+    """Nome do arquivo do perfil: data e hora, método e caminho (ordena do mais antigo ao mais novo)"""
+    rota = caminho.strip("/").replace("/", "_") or "raiz"
+    return f"{datetime.now():%Y%m%d-%H%M%S-%f}-{metodo}-{rota[:80]}.collapsed"
+
+def salvar_perfil(perfil: str, nome: str):
+    """Grava o perfil em PROFILE_DIR e remove os mais antigos além de PROFILE_MAX_FILES"""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(os.path.join(PROFILE_DIR, nome), "w", encoding="utf-8") as arquivo:
+        arquivo.write(perfil)
+    arquivos = sorted(
+        (a for a in os.listdir(PROFILE_DIR) if a.endswith(".collapsed")),
+        reverse=True
+    )
+    for antigo in arquivos[PROFILE_MAX_FILES:]:
+        try:
+            os.remove(os.path.join(PROFILE_DIR, antigo))
+        except OSError:
+            pass
+
+class ProfilingMiddleware:
+    """Middleware ASGI que amostra as pilhas durante as requisições escolhidas"""
+
+    def __init__(self, app, taxa_amostragem: int = PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.taxa_amostragem = taxa_amostragem
+        self._contador = itertools.count(1)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        modo = modo_solicitado(scope)
+        if modo is None and self.taxa_amostragem > 0 and next(self._contador) % self.taxa_amostragem == 0:
+            modo = "salvar"
+        if modo is None:
+            await self.app(scope, receive, send)
+            return
+
+        amostrador = AmostradorPilhas()
+        inicio = time.perf_counter()
+        status_original = 500
+        amostrador.start()
+
+        if modo == "retornar":
+            async def send_descartando(message):
+                nonlocal status_original
+                if message["type"] == "http.response.start":
+                    status_original = message["status"]
+            try:
+                await self.app(scope, receive, send_descartando)
+            finally:
+                perfil = amostrador.parar()
+            corpo = perfil.encode()
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/plain; charset=utf-8"),
+                    (b"content-length", str(len(corpo)).encode()),
+                    (b"x-profile-status", str(status_original).encode()),
+                    (b"x-profile-samples", str(amostrador.amostras).encode()),
+                    (b"x-profile-time", f"{(time.perf_counter() - inicio) * 1000:.1f}".encode()),
+                ],
+            })
+            await send({"type": "http.response.body", "body": corpo})
+            return
+
+        # "salvar": o nome do arquivo é definido antes do início da resposta, para ir no cabeçalho
+        nome = nome_perfil(scope["method"], scope["path"])
+
+        async def send_com_cabecalho(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"x-profile-file", nome.encode()),
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_com_cabecalho)
+        finally:
+            perfil = amostrador.parar()
+            salvar_perfil(perfil, nome)
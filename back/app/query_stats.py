@@ -0,0 +1,150 @@
+"""
+Contagem e tempo das consultas SQL por requisição, detecção de N+1 e log de consultas lentas.
+
+Os eventos do engine medem cada comando executado e somam o resultado na
+requisição em andamento (ContextVar preenchida pelo QueryStatsMiddleware,
+que também vale nas threads das rotas síncronas). Ao final da requisição,
+um mesmo comando repetido N_PLUS_ONE_THRESHOLD vezes ou mais é registrado
+como provável N+1. Comandos mais lentos que SLOW_QUERY_MS vão para um log
+rotativo junto com o EXPLAIN QUERY PLAN.
+
+Configuração (variáveis de ambiente):
+- SQL_DEBUG: "1" adiciona os cabeçalhos X-DB-Queries e X-DB-Time (ms) às respostas (padrão "0")
+- N_PLUS_ONE_THRESHOLD: repetições do mesmo comando para acusar N+1 (padrão 10; 0 desativa)
+- SLOW_QUERY_MS: limite, em ms, para o log de consultas lentas (padrão 200; 0 desativa)
+- SLOW_QUERY_LOG: arquivo do log de consultas lentas (padrão logs/slow_queries.log, relativo ao diretório back/)
+- SLOW_QUERY_LOG_MAX_BYTES: tamanho de cada arquivo antes da rotação (padrão 5000000)
+- SLOW_QUERY_LOG_BACKUPS: arquivos antigos mantidos (padrão 3)
+
+O tempo medido é o da execução do comando; linhas lidas depois, no fetch, não entram.
+"""
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+
+from sqlalchemy import event
+
+SQL_DEBUG = os.getenv("SQL_DEBUG", "0") == "1"
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv(
+    "SLOW_QUERY_LOG",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "slow_queries.log")
+)
+SLOW_QUERY_LOG_MAX_BYTES = int(os.getenv("SLOW_QUERY_LOG_MAX_BYTES", "5000000"))
+SLOW_QUERY_LOG_BACKUPS = int(os.getenv("SLOW_QUERY_LOG_BACKUPS", "3"))
+
+logger = logging.getLogger("refritec.sql")
+logger_lentas = logging.getLogger("refritec.sql.lentas")
+logger_lentas.propagate = False
+
+class EstatisticasRequisicao:
+    """Consultas executadas durante uma requisição"""
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo = 0.0  # segundos
+        self.por_comando = Counter()
+
+    def registrar(self, comando: str, duracao: float):
+        self.consultas += 1
+        self.tempo += duracao
+        self.por_comando[comando] += 1
+
+    def repetidos(self, limite: int = N_PLUS_ONE_THRESHOLD):
+        """Comandos executados `limite` vezes ou mais, do mais repetido ao menos"""
+        if limite <= 0:
+            return []
+        return [(comando, n) for comando, n in self.por_comando.most_common() if n >= limite]
+
+estatisticas_atuais = ContextVar("estatisticas_sql", default=None)
+
+def _configurar_log_lentas():
+    if logger_lentas.handlers:
+        return
+    diretorio = os.path.dirname(SLOW_QUERY_LOG)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    handler = RotatingFileHandler(
+        SLOW_QUERY_LOG, maxBytes=SLOW_QUERY_LOG_MAX_BYTES, backupCount=SLOW_QUERY_LOG_BACKUPS, encoding="utf-8"
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger_lentas.addHandler(handler)
+    logger_lentas.setLevel(logging.INFO)
+
+def _plano(cursor, dialeto: str, comando: str, parametros) -> str:
+    """EXPLAIN do comando, executado em um cursor novo da mesma conexão"""
+    prefixo = "EXPLAIN QUERY PLAN " if dialeto == "sqlite" else "EXPLAIN "
+    try:
+        linhas = cursor.connection.cursor().execute(prefixo + comando, parametros).fetchall()
+    except Exception as e:  # o plano é apenas informativo
+        return f"(plano indisponível: {e})"
+    if dialeto == "sqlite":
+        return "\n".join(f"  {linha[3]}" for linha in linhas)
+    return "\n".join(f"  {linha}" for linha in linhas)
+
+def instrumentar_engine(engine):
+    """Registra os eventos que medem cada comando executado pelo engine"""
+    if SLOW_QUERY_MS > 0:
+        _configurar_log_lentas()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _antes(conn, cursor, comando, parametros, contexto, executemany):
+        conn.info.setdefault("inicio_consultas", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _depois(conn, cursor, comando, parametros, contexto, executemany):
+        duracao = time.perf_counter() - conn.info["inicio_consultas"].pop()
+        estatisticas = estatisticas_atuais.get()
+        if estatisticas is not None:
+            estatisticas.registrar(comando, duracao)
+        if SLOW_QUERY_MS > 0 and duracao * 1000 >= SLOW_QUERY_MS:
+            plano = ""
+            if not executemany and comando.lstrip()[:6].upper() in ("SELECT", "WITH"):
+                plano = "\n" + _plano(cursor, conn.dialect.name, comando, parametros)
+            logger_lentas.info("%.1f ms\n%s\nparâmetros: %r%s", duracao * 1000, comando, parametros, plano)
+
+    @event.listens_for(engine, "handle_error")
+    def _erro(contexto):
+        # Comando que falhou não chega ao after_cursor_execute: descarta o início pendente
+        conn = contexto.connection
+        if conn is not None and conn.info.get("inicio_consultas"):
+            conn.info["inicio_consultas"].pop()
+
+class QueryStatsMiddleware:
+    """
+    Middleware ASGI que abre as estatísticas de SQL de cada requisição, acusa N+1 ao final
+    e, com SQL_DEBUG, envia X-DB-Queries e X-DB-Time (consultas feitas até o início da resposta)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        estatisticas = EstatisticasRequisicao()
+        token = estatisticas_atuais.set(estatisticas)
+
+        async def send_wrapper(message):
+            if SQL_DEBUG and message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + [
+                    (b"x-db-queries", str(estatisticas.consultas).encode()),
+                    (b"x-db-time", f"{estatisticas.tempo * 1000:.1f}".encode()),
+                ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            estatisticas_atuais.reset(token)
+            for comando, repeticoes in estatisticas.repetidos():
+                logger.warning(
+                    "Possível N+1 em %s %s: comando executado %d vezes: %s",
+                    scope["method"], scope["path"], repeticoes, " ".join(comando.split())[:300]
+                )
@@ -0,0 +1,167 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlencode, urlsplit
+import anyio
+import json
+import os
+
+from ..database import SessionLocal, batch_session
+from .chamado_routes import verify_api_key
+
+# Número máximo de sub-requisições aceitas em um único lote
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+
+# Cabeçalhos da requisição original que não fazem sentido nas sub-requisições
+HEADERS_IGNORADOS = {b"content-length", b"content-type", b"accept-encoding"}
+
+class BatchSubRequest(BaseModel):
+    """Uma requisição GET a ser executada dentro do lote"""
+    id: Optional[str] = Field(None, example="estatisticas")
+    method: str = Field("GET", example="GET")
+    path: str = Field(..., example="/api/chamados/statistics")
+    params: Dict[str, Any] = Field(default_factory=dict, example={"date": "2024-06-01"})
+
+class BatchRequest(BaseModel):
+    requests: List[BatchSubRequest]
+
+class BatchSubResponse(BaseModel):
+    id: Optional[str] = None
+    status: int
+    body: Any = None
+
+class BatchResponse(BaseModel):
+    responses: List[BatchSubResponse]
+
+router = APIRouter(
+    prefix="/api/batch",
+    tags=["batch"],
+    responses={
+        400: {"description": "Lote inválido"},
+        401: {"description": "API Key inválida"}
+    },
+    dependencies=[Depends(verify_api_key)]  # Apply API key verification to all routes
+)
+
+def validar_sub_requisicao(sub: BatchSubRequest):
+    """Garante que a sub-requisição é uma leitura para uma rota da própria API"""
+    if sub.method.upper() != "GET":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Método '{sub.method}' não permitido em lote; apenas GET"
+        )
+    path = urlsplit(sub.path).path
+    # O feed de eventos é um stream sem fim e não cabe em uma resposta de lote
+    if not path.startswith("/") or path.rstrip("/") in (router.prefix, "/api/eventos"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Caminho '{sub.path}' inválido para requisição em lote"
+        )
+
+async def executar_sub_requisicao(request: Request, sub: BatchSubRequest) -> BatchSubResponse:
+    """
+    Executa uma sub-requisição diretamente na aplicação ASGI, sem passar pela rede.
+    Os cabeçalhos de autenticação e papel da requisição original são repassados,
+    de modo que cada rota aplica as mesmas verificações de permissão de sempre.
+    """
+    partes = urlsplit(sub.path)
+    query_string = partes.query
+    if sub.params:
+        extra = urlencode(sub.params, doseq=True)
+        query_string = f"{query_string}&{extra}" if query_string else extra
+
+    headers = [
+        (nome, valor) for nome, valor in request.scope["headers"]
+        if nome not in HEADERS_IGNORADOS
+    ]
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": request.url.scheme,
+        "path": partes.path,
+        "raw_path": partes.path.encode(),
+        "root_path": request.scope.get("root_path", ""),
+        "query_string": query_string.encode(),
+        "headers": headers,
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+        # Marca a sub-requisição (a captura de tráfego grava apenas o lote)
+        "sub_requisicao_lote": True,
+    }
+
+    corpo_enviado = False
+    resposta_concluida = anyio.Event()
+
+    async def receive():
+        nonlocal corpo_enviado
+        if not corpo_enviado:
+            corpo_enviado = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Respostas em streaming aguardam a desconexão do cliente: só ocorre ao final
+        await resposta_concluida.wait()
+        return {"type": "http.disconnect"}
+
+    resposta = {"status": status.HTTP_500_INTERNAL_SERVER_ERROR, "body": b""}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            resposta["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            resposta["body"] += message.get("body", b"")
+            if not message.get("more_body", False):
+                resposta_concluida.set()
+
+    try:
+        await request.app(scope, receive, send)
+    except Exception:
+        # O erro já foi registrado pelo ServerErrorMiddleware; o lote continua
+        pass
+    finally:
+        resposta_concluida.set()
+
+    try:
+        body = json.loads(resposta["body"]) if resposta["body"] else None
+    except ValueError:
+        body = resposta["body"].decode("utf-8", errors="replace")
+
+    return BatchSubResponse(id=sub.id, status=resposta["status"], body=body)
+
+@router.post("", response_model=BatchResponse)
+async def executar_lote(lote: BatchRequest, request: Request):
+    """
+    Executa várias requisições GET da API em uma única chamada HTTP.
+
+    - Todas as sub-requisições compartilham a mesma sessão do banco de dados
+    - No SQLite, as leituras ocorrem em uma única transação (mesmo snapshot)
+    - Cada sub-requisição passa pelas mesmas verificações de papel da rota original
+    - A resposta mantém a ordem das sub-requisições, cada uma com seu status
+    """
+    if not lote.requests:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="O lote não contém requisições"
+        )
+    if len(lote.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"O lote aceita no máximo {BATCH_MAX_REQUESTS} requisições"
+        )
+    for sub in lote.requests:
+        validar_sub_requisicao(sub)
+
+    db = SessionLocal()
+    token = batch_session.set(db)
+    try:
+        if db.get_bind().dialect.name == "sqlite":
+            # Abre a transação de leitura explicitamente para fixar o snapshot do lote
+            db.connection().exec_driver_sql("BEGIN")
+        respostas = []
+        for sub in lote.requests:
+            respostas.append(await executar_sub_requisicao(request, sub))
+        return BatchResponse(responses=respostas)
+    finally:
+        batch_session.reset(token)
+        db.rollback()
+        db.close()
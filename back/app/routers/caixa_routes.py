@@ -7,6 +7,9 @@ from datetime import date
 from ..database import get_db
 from ..models import Caixa, RoleEnum
 from ..schemas import Caixa as CaixaSchema, CaixaCreate, CaixaUpdate
+from ..streaming import stream_json_array
+from ..events import publicar_evento
+from ..change_log import registrar_alteracao
 from .chamado_routes import get_current_user_role
 
 router = APIRouter(
@@ -29,22 +32,31 @@ def list_caixa(
     db: Session = Depends(get_db),
     current_user_role: str = Depends(get_current_user_role),
     page: int = Query(1, ge=1),
-    per_page: int = Query(20, ge=1, le=100),
+    per_page: int = Query(20, ge=0, le=100, description="0 retorna todos os lançamentos do filtro"),
     mes: Optional[int] = Query(None),
     ano: Optional[int] = Query(None),
     tipo: Optional[str] = Query(None, description="entrada ou saida")
 ):
+    """
+    Lista lançamentos de caixa, enviados em streaming e lidos do banco em lotes.
+    - Paginado por padrão (20 por página); per_page=0 retorna todos os lançamentos do filtro
+    """
     check_admin_or_manager(current_user_role)
-    query = db.query(Caixa)
-    if mes:
-        query = query.filter(Caixa.mes == mes)
-    if ano:
-        query = query.filter(Caixa.ano == ano)
-    if tipo:
-        query = query.filter(Caixa.tipo == tipo)
-    total = query.count()
-    caixas = query.order_by(Caixa.data_lancamento.desc()).offset((page-1)*per_page).limit(per_page).all()
-    return caixas
+
+    def montar_query(session: Session):
+        query = session.query(Caixa)
+        if mes:
+            query = query.filter(Caixa.mes == mes)
+        if ano:
+            query = query.filter(Caixa.ano == ano)
+        if tipo:
+            query = query.filter(Caixa.tipo == tipo)
+        query = query.order_by(Caixa.data_lancamento.desc())
+        if per_page:
+            query = query.offset((page-1)*per_page).limit(per_page)
+        return query
+
+    return stream_json_array(montar_query, lambda caixa: CaixaSchema.model_validate(caixa).model_dump_json().encode())
 
 @router.get("/sum", response_model=dict)
 def sum_caixa(
@@ -86,8 +98,11 @@ def create_caixa(
     try:
         caixa = Caixa(**caixa_in.dict())
         db.add(caixa)
+        db.flush()
+        registrar_alteracao(db, "caixa", caixa.id_caixa)
         db.commit()
         db.refresh(caixa)
+        publicar_evento("caixa", caixa.id_caixa, "criado")
         return caixa
     except IntegrityError:
         db.rollback()
@@ -107,8 +122,10 @@ def update_caixa(
     update_data = caixa_update.dict(exclude_unset=True)
     for key, value in update_data.items():
         setattr(caixa, key, value)
+    registrar_alteracao(db, "caixa", id_caixa)
     db.commit()
     db.refresh(caixa)
+    publicar_evento("caixa", id_caixa, "atualizado", update_data.keys())
     return caixa
 
 @router.delete("/{id_caixa}", status_code=200)
@@ -122,5 +139,7 @@ def delete_caixa(
     if not caixa:
         raise HTTPException(status_code=404, detail="Lançamento de caixa não encontrado")
     db.delete(caixa)
+    registrar_alteracao(db, "caixa", id_caixa, "removido")
     db.commit()
+    publicar_evento("caixa", id_caixa, "removido")
     return {"message": f"Lançamento de caixa {id_caixa} removido com sucesso"} 
\ No newline at end of file
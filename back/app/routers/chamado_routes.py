@@ -1,20 +1,38 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status, Path, Header, Security
+from fastapi.responses import Response
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy import func
 from typing import List, Optional, Dict, Any
-from datetime import datetime, date, timedelta
+from datetime import datetime, date, time, timedelta
 from pydantic import BaseModel
+import enum
 import os
 
 from ..database import get_db
-from ..models import Chamado, Cliente, ItemChamado, HistoricoAlteracaoChamado, Usuario, RoleEnum, Caixa
+from ..cache import TTLCache
+from ..status_intervals import registrar_status
+from ..client_summary import atualizar_resumo_cliente, CAMPOS_RESUMO
+from ..events import publicar_evento, registrar_invalidacao
+from ..change_log import registrar_alteracao
+from ..pagination import ModoContagem, contar_total, COUNT_CACHE_TTL
+from ..fast_json import (
+    pagina_chamados_json,
+    pagina_chamados_cursor_json,
+    selecionar_colunas_chamado,
+    linha_para_chamado,
+    json_response,
+    CHAMADOS_POR_DIA_ADAPTER,
+    AGENDA_ADAPTER
+)
+from ..models import Chamado, Cliente, ItemChamado, HistoricoAlteracaoChamado, Usuario, RoleEnum, Caixa, StatusChamadoEnum, filtro_status_ativos
 from ..schemas import (
     Chamado as ChamadoSchema,
     ChamadoCreate,
     ChamadoUpdate,
     ChamadoDetail,
     ChamadoPaginated,
+    ChamadoCursorPaginated,
     ItemChamado as ItemChamadoSchema,
     ItemChamadoCreate,
     ItemChamadoUpdate
@@ -71,6 +89,48 @@ class ChamadoStatistics(BaseModel):
     chamados_by_client: Dict[str, int]
     total_clientes: int = 0
 
+# Define technician agenda schema
+class AgendaTecnico(BaseModel):
+    id_usuario: int
+    data: date
+    hoje: List[ChamadoSchema]
+    proximos_dias: Dict[str, List[ChamadoSchema]]
+    atrasados: List[ChamadoSchema]
+
+# Dias seguintes (após hoje) incluídos na agenda do técnico
+AGENDA_DIAS = 7
+
+# Agendas já serializadas, por técnico; invalidadas pelas rotas de escrita
+agenda_cache = TTLCache(ttl=float(os.getenv("AGENDA_CACHE_TTL", "300")), maxsize=256)
+
+# Função auxiliar para invalidar a agenda dos técnicos afetados por uma escrita
+def invalidar_agenda(*ids_usuario):
+    for id_usuario in ids_usuario:
+        if id_usuario is not None:
+            agenda_cache.delete(id_usuario)
+
+# Totais de list_chamados por filtro (modo contagem=cache); limpos a cada escrita
+contagem_cache = TTLCache(ttl=COUNT_CACHE_TTL, maxsize=512)
+
+# Estatísticas do painel: um único cálculo para requisições simultâneas, limpo a cada escrita
+estatisticas_cache = TTLCache(ttl=float(os.getenv("STATISTICS_CACHE_TTL", "10")), maxsize=4)
+
+# Relatórios (routers/relatorio_routes.py) já serializados, por intervalo e filtro; limpos a cada escrita
+relatorio_cache = TTLCache(ttl=float(os.getenv("RELATORIO_CACHE_TTL", "600")), maxsize=128)
+
+# Função auxiliar para invalidar os caches afetados por qualquer escrita em chamados
+def invalidar_listas():
+    contagem_cache.clear()
+    estatisticas_cache.clear()
+    relatorio_cache.clear()
+
+# Com vários workers, as escritas feitas em outros processos chegam pelo log de alterações
+@registrar_invalidacao
+def invalidar_por_evento(evento: dict):
+    if evento["entidade"] == "chamado":
+        invalidar_agenda(*evento["usuarios"])
+        invalidar_listas()
+
 # Função auxiliar para verificar se um cliente existe
 def get_cliente_or_404(db: Session, id_cliente: int):
     cliente = db.query(Cliente).filter(Cliente.id_cliente == id_cliente).first()
@@ -122,6 +182,59 @@ def registrar_historico(db: Session, id_chamado: int, campo: str, valor_antigo,
     )
     db.add(historico)
 
+# Número máximo de dias aceitos pelas visões de calendário
+CALENDARIO_MAX_DIAS = 366
+
+# Último ano aceito pelas visões de calendário: o dia seguinte ao intervalo precisa existir
+CALENDARIO_ANO_MAXIMO = 9998
+
+# Data usada para agrupar os chamados nas visões de calendário
+class CampoCalendario(str, enum.Enum):
+    DATA_PREVISTA = "data_prevista"
+    DATA_ABERTURA = "data_abertura"
+
+# Função auxiliar para buscar os chamados de um intervalo de dias, agrupados por dia
+def chamados_por_dia(
+    db: Session,
+    coluna,
+    inicio: date,
+    fim: date,
+    current_user_role: str,
+    current_user_id: int
+):
+    """
+    Filtra a coluna indexada pelo intervalo semiaberto [inicio, fim + 1 dia),
+    o que permite busca por faixa no índice, e agrupa o resultado em uma única passada.
+    """
+    limite = fim + timedelta(days=1)
+    if coluna is Chamado.data_abertura:
+        query = db.query(Chamado).filter(
+            coluna >= datetime.combine(inicio, time.min),
+            coluna < datetime.combine(limite, time.min)
+        )
+    else:
+        query = db.query(Chamado).filter(coluna >= inicio, coluna < limite)
+    
+    # Aplicar filtro baseado no papel do usuário
+    if current_user_role == RoleEnum.FUNCIONARIO.value:
+        query = query.filter(Chamado.id_usuario == current_user_id)
+    
+    rows = selecionar_colunas_chamado(query.order_by(coluna, Chamado.data_abertura)).all()
+    
+    chamados_by_day = {}
+    current_date = inicio
+    while current_date <= fim:
+        chamados_by_day[current_date.isoformat()] = []
+        current_date += timedelta(days=1)
+    
+    for row in rows:
+        chamado = linha_para_chamado(row)
+        valor = chamado[coluna.key]
+        dia = valor.date() if isinstance(valor, datetime) else valor
+        chamados_by_day[dia.isoformat()].append(chamado)
+    
+    return json_response(CHAMADOS_POR_DIA_ADAPTER, chamados_by_day)
+
 # Função auxiliar para calcular o valor total de itens de um chamado
 def calcular_valor_total_itens(db: Session, id_chamado: int):
     total = db.query(
@@ -132,40 +245,30 @@ def calcular_valor_total_itens(db: Session, id_chamado: int):
     
     return total
 
-# IMPORTANT: Statistics endpoints must be defined BEFORE any path parameter routes
-@router.get("/statistics", response_model=ChamadoStatistics)
-def get_chamado_statistics(db: Session = Depends(get_db)):
-    """
-    Retorna estatísticas dos chamados, incluindo:
-    - Total de chamados por status
-    - Valor total em aberto
-    - Valor recebido no mês atual
-    - Contagem de chamados por cliente
-    """
-    # Obter data do início do mês atual
-    today = date.today()
+# Função auxiliar para calcular as estatísticas com consultas agrupadas
+def calcular_estatisticas(db: Session, today: date) -> ChamadoStatistics:
     first_day_of_month = date(today.year, today.month, 1)
     
-    # Contar chamados por status
-    total_open = db.query(func.count(Chamado.id_chamado)).filter(Chamado.status == "Aberto").scalar() or 0
-    total_in_progress = db.query(func.count(Chamado.id_chamado)).filter(Chamado.status == "Em Andamento").scalar() or 0
-    total_completed = db.query(func.count(Chamado.id_chamado)).filter(Chamado.status == "Concluído").scalar() or 0
-    total_canceled = db.query(func.count(Chamado.id_chamado)).filter(Chamado.status == "Cancelado").scalar() or 0
+    # Contar chamados por status (uma única consulta agrupada)
+    por_status = dict(
+        db.query(Chamado.status, func.count(Chamado.id_chamado)).group_by(Chamado.status).all()
+    )
+    
+    # Soma dos itens de um conjunto de chamados, sem uma consulta por chamado
+    def soma_itens(*filtros) -> float:
+        total = db.query(
+            func.sum(ItemChamado.quantidade * ItemChamado.valor_unitario)
+        ).join(Chamado, Chamado.id_chamado == ItemChamado.id_chamado).filter(*filtros).scalar()
+        return float(total or 0)
     
     # Chamados em andamento
-    chamados_em_andamento = db.query(Chamado).filter(Chamado.status == "Em Andamento").all()
-    total_value_open = 0.0
-    for chamado in chamados_em_andamento:
-        total_value_open += calcular_valor_total_itens(db, chamado.id_chamado)
+    total_value_open = soma_itens(Chamado.status == "Em Andamento")
     
     # Chamados concluídos no mês atual
-    chamados_concluidos_mes = db.query(Chamado).filter(
+    valor_recebido_mes = soma_itens(
         Chamado.status == "Concluído",
         Chamado.data_conclusao >= first_day_of_month
-    ).all()
-    valor_recebido_mes = 0.0
-    for chamado in chamados_concluidos_mes:
-        valor_recebido_mes += calcular_valor_total_itens(db, chamado.id_chamado)
+    )
     
     # Contagem de chamados por cliente
     chamados_by_client = {}
@@ -179,16 +282,102 @@ def get_chamado_statistics(db: Session = Depends(get_db)):
         chamados_by_client[client_name] = count
     
     return ChamadoStatistics(
-        total_open=total_open,
-        total_in_progress=total_in_progress,
-        total_completed=total_completed,
-        total_canceled=total_canceled,
+        total_open=por_status.get("Aberto", 0),
+        total_in_progress=por_status.get("Em Andamento", 0),
+        total_completed=por_status.get("Concluído", 0),
+        total_canceled=por_status.get("Cancelado", 0),
         total_value_open=total_value_open,
         valor_recebido_mes=valor_recebido_mes,
         chamados_by_client=chamados_by_client,
         total_clientes=0  # Will be filled by cliente_routes endpoint
     )
 
+# IMPORTANT: Statistics endpoints must be defined BEFORE any path parameter routes
+@router.get("/statistics", response_model=ChamadoStatistics)
+def get_chamado_statistics(db: Session = Depends(get_db)):
+    """
+    Retorna estatísticas dos chamados, incluindo:
+    - Total de chamados por status
+    - Valor total em aberto
+    - Valor recebido no mês atual
+    - Contagem de chamados por cliente
+    Requisições simultâneas compartilham um único cálculo, e o resultado fica em
+    cache por STATISTICS_CACHE_TTL segundos ou até a próxima escrita em chamados.
+    """
+    today = date.today()
+    return estatisticas_cache.get_or_compute(today, lambda: calcular_estatisticas(db, today))
+
+@router.get("/agenda", response_model=AgendaTecnico)
+def get_agenda_tecnico(
+    id_usuario: Optional[int] = Query(None, description="ID do técnico (padrão: usuário atual)"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role),
+    current_user_id: int = Header(..., description="Current user ID")
+):
+    """
+    Agenda do técnico: chamados previstos para hoje, para os próximos 7 dias
+    e chamados em aberto com data prevista já vencida.
+    - Funcionários só podem ver a própria agenda
+    - A agenda fica em cache até uma escrita alterar data prevista, técnico ou status
+    """
+    if id_usuario is None:
+        id_usuario = current_user_id
+    
+    # Verificar permissão de acesso
+    if current_user_role == RoleEnum.FUNCIONARIO.value and id_usuario != current_user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Você não tem permissão para ver a agenda de outros técnicos"
+        )
+    
+    hoje = date.today()
+    cached = agenda_cache.get(id_usuario)
+    if cached is not None and cached[0] == hoje:
+        return Response(content=cached[1], media_type="application/json")
+    
+    get_usuario_or_404(db, id_usuario)
+    
+    # Hoje e próximos dias: faixa do índice (id_usuario, data_prevista)
+    fim = hoje + timedelta(days=AGENDA_DIAS + 1)
+    proximos = selecionar_colunas_chamado(
+        db.query(Chamado).filter(
+            Chamado.id_usuario == id_usuario,
+            Chamado.data_prevista >= hoje,
+            Chamado.data_prevista < fim,
+            Chamado.status != "Cancelado"
+        ).order_by(Chamado.data_prevista, Chamado.data_abertura)
+    ).all()
+    
+    # Atrasados: data prevista vencida e chamado ainda ativo
+    atrasados = selecionar_colunas_chamado(
+        db.query(Chamado).filter(
+            Chamado.id_usuario == id_usuario,
+            Chamado.data_prevista < hoje,
+            filtro_status_ativos(Chamado.status)
+        ).order_by(Chamado.data_prevista, Chamado.data_abertura)
+    ).all()
+    
+    proximos_dias = {
+        (hoje + timedelta(days=i)).isoformat(): [] for i in range(1, AGENDA_DIAS + 1)
+    }
+    agenda_hoje = []
+    for row in proximos:
+        chamado = linha_para_chamado(row)
+        if chamado["data_prevista"] == hoje:
+            agenda_hoje.append(chamado)
+        else:
+            proximos_dias[chamado["data_prevista"].isoformat()].append(chamado)
+    
+    content = AGENDA_ADAPTER.dump_json({
+        "id_usuario": id_usuario,
+        "data": hoje,
+        "hoje": agenda_hoje,
+        "proximos_dias": proximos_dias,
+        "atrasados": [linha_para_chamado(row) for row in atrasados],
+    })
+    agenda_cache.set(id_usuario, (hoje, content))
+    return Response(content=content, media_type="application/json")
+
 # Rotas de Chamados
 @router.post("/", response_model=ChamadoSchema, status_code=status.HTTP_201_CREATED)
 def create_chamado(chamado: ChamadoCreate, db: Session = Depends(get_db)):
@@ -211,7 +400,11 @@ def create_chamado(chamado: ChamadoCreate, db: Session = Depends(get_db)):
     if chamado.id_usuario:
         get_usuario_or_404(db, chamado.id_usuario)
     
-    # Criar novo chamado
+    # Criar novo chamado (já concluído: a conclusão é a própria abertura)
+    data_abertura = datetime.now()
+    data_conclusao = chamado.data_conclusao
+    if chamado.status == 'Concluído' and data_conclusao is None:
+        data_conclusao = data_abertura
     try:
         db_chamado = Chamado(
             id_cliente=chamado.id_cliente,
@@ -221,13 +414,20 @@ def create_chamado(chamado: ChamadoCreate, db: Session = Depends(get_db)):
             status=chamado.status,
             observacao=chamado.observacao,
             data_prevista=chamado.data_prevista,
-            data_abertura=datetime.now(),
-            data_conclusao=chamado.data_conclusao,
+            data_abertura=data_abertura,
+            data_conclusao=data_conclusao,
             valor=0.0  # Valor inicial zerado
         )
         db.add(db_chamado)
+        db.flush()
+        registrar_status(db, db_chamado, db_chamado.data_abertura)
+        atualizar_resumo_cliente(db, db_chamado.id_cliente)
+        registrar_alteracao(db, "chamado", db_chamado.id_chamado, id_usuario=db_chamado.id_usuario)
         db.commit()
         db.refresh(db_chamado)
+        invalidar_agenda(db_chamado.id_usuario)
+        invalidar_listas()
+        publicar_evento("chamado", db_chamado.id_chamado, "criado", usuarios=[db_chamado.id_usuario])
         return db_chamado
     except IntegrityError:
         db.rollback()
@@ -240,13 +440,15 @@ def create_chamado(chamado: ChamadoCreate, db: Session = Depends(get_db)):
 def list_chamados(
     page: int = Query(1, ge=1, description="Número da página"),
     per_page: int = Query(10, ge=1, le=100, description="Itens por página"),
-    status: Optional[str] = Query(None, description="Filtrar por status"),
+    status: Optional[StatusChamadoEnum] = Query(None, description="Filtrar por status"),
     id_cliente: Optional[int] = Query(None, description="Filtrar por cliente"),
     id_usuario: Optional[int] = Query(None, description="Filtrar por técnico"),
     data_inicio: Optional[date] = Query(None, description="Filtrar por data de abertura (início)"),
     data_fim: Optional[date] = Query(None, description="Filtrar por data de abertura (fim)"),
     data_conclusao_inicio: Optional[date] = Query(None, description="Filtrar por data de conclusão (início)"),
     data_conclusao_fim: Optional[date] = Query(None, description="Filtrar por data de conclusão (fim)"),
+    fast: bool = Query(False, description="Serialização rápida: seleciona só as colunas da resposta"),
+    contagem: ModoContagem = Query(ModoContagem.EXATA, description="Total: exata, cache, estimada ou nenhuma"),
     db: Session = Depends(get_db),
     current_user_role: str = Depends(get_current_user_role),
     current_user_id: int = Header(..., description="Current user ID")
@@ -255,9 +457,12 @@ def list_chamados(
     Lista todos os chamados com suporte a paginação e filtros.
     - Administradores e gerentes podem ver todos os chamados
     - Funcionários só podem ver seus próprios chamados
+    - Com fast=true, a página é serializada pelo caminho rápido (mesmo formato)
+    - contagem escolhe como o total é obtido (ver app/pagination.py); has_more
+      indica se existe próxima página em qualquer modo
     """
     # Construir a query base
-    query = db.query(Chamado).options(joinedload(Chamado.cliente), joinedload(Chamado.tecnico))
+    query = db.query(Chamado)
     
     # Aplicar filtros baseados no papel do usuário
     if current_user_role == RoleEnum.FUNCIONARIO.value:
@@ -265,7 +470,7 @@ def list_chamados(
     
     # Aplicar filtros adicionais se fornecidos
     if status:
-        query = query.filter(Chamado.status == status)
+        query = query.filter(Chamado.status == status.value)
     if id_cliente:
         query = query.filter(Chamado.id_cliente == id_cliente)
     if id_usuario:
@@ -283,16 +488,28 @@ def list_chamados(
     query = query.order_by(Chamado.data_abertura.desc())
     
     # Contar total de registros para paginação
-    total = query.count()
+    chave = (
+        current_user_id if current_user_role == RoleEnum.FUNCIONARIO.value else None,
+        status, id_cliente, id_usuario, data_inicio, data_fim,
+        data_conclusao_inicio, data_conclusao_fim
+    )
+    total, total_is_estimate = contar_total(query, contagem, contagem_cache, chave)
+    
+    if fast:
+        return pagina_chamados_json(query, total, page, per_page, total_is_estimate)
     
-    # Aplicar paginação
-    chamados = query.offset((page - 1) * per_page).limit(per_page).all()
+    # Aplicar paginação (uma linha a mais indica se existe próxima página)
+    chamados = query.options(
+        joinedload(Chamado.cliente), joinedload(Chamado.tecnico)
+    ).offset((page - 1) * per_page).limit(per_page + 1).all()
     
     return {
         "total": total,
         "page": page,
         "per_page": per_page,
-        "items": chamados
+        "items": chamados[:per_page],
+        "has_more": len(chamados) > per_page,
+        "total_is_estimate": total_is_estimate
     }
 
 @router.get("/{id_chamado}", response_model=ChamadoDetail)
@@ -350,35 +567,78 @@ def get_chamado(
     
     return response
 
-@router.get("/cliente/{id_cliente}", response_model=List[ChamadoSchema])
+# Função auxiliar para aplicar os filtros de status e período e paginar por cursor
+def pagina_filtrada_por_cursor(
+    query,
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+    status_filtro: Optional[StatusChamadoEnum],
+    data_inicio: Optional[date],
+    data_fim: Optional[date]
+):
+    if status_filtro:
+        query = query.filter(Chamado.status == status_filtro.value)
+    # Intervalo semiaberto sobre data_abertura, para usar o índice composto
+    if data_inicio:
+        query = query.filter(Chamado.data_abertura >= datetime.combine(data_inicio, time.min))
+    if data_fim:
+        query = query.filter(Chamado.data_abertura < datetime.combine(data_fim + timedelta(days=1), time.min))
+    
+    total = query.with_entities(func.count(Chamado.id_chamado)).scalar() or 0
+    try:
+        return pagina_chamados_cursor_json(query, total, page, per_page, cursor)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido"
+        )
+
+@router.get("/cliente/{id_cliente}", response_model=ChamadoCursorPaginated)
 def get_chamados_by_cliente(
     id_cliente: int = Path(..., description="ID do cliente"),
+    page: int = Query(1, ge=1, description="Número da página (ignorado quando há cursor)"),
+    per_page: int = Query(10, ge=1, le=100, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor next_cursor da página anterior"),
+    status_filtro: Optional[StatusChamadoEnum] = Query(None, alias="status", description="Filtrar por status"),
+    data_inicio: Optional[date] = Query(None, description="Filtrar por data de abertura (início)"),
+    data_fim: Optional[date] = Query(None, description="Filtrar por data de abertura (fim, inclusive)"),
     db: Session = Depends(get_db)
 ):
     """
-    Lista todos os chamados de um cliente específico.
+    Lista os chamados de um cliente, do mais recente ao mais antigo, com paginação.
+    - Para percorrer as páginas, envie o next_cursor recebido como cursor (paginação
+      por chave, sem OFFSET, sobre o índice id_cliente + data_abertura)
+    - Filtros opcionais por status e por período de abertura
     """
     # Verificar se o cliente existe
     get_cliente_or_404(db, id_cliente)
     
-    # Buscar os chamados do cliente
-    chamados = db.query(Chamado).options(
-        joinedload(Chamado.tecnico)
-    ).filter(Chamado.id_cliente == id_cliente).order_by(Chamado.data_abertura.desc()).all()
-    
-    return chamados
+    query = db.query(Chamado).filter(Chamado.id_cliente == id_cliente)
+    return pagina_filtrada_por_cursor(
+        query, page, per_page, cursor, status_filtro, data_inicio, data_fim
+    )
 
-@router.get("/tecnico/{id_usuario}", response_model=List[ChamadoSchema])
+@router.get("/tecnico/{id_usuario}", response_model=ChamadoCursorPaginated)
 def get_chamados_by_tecnico(
     id_usuario: int = Path(..., description="ID do técnico"),
+    page: int = Query(1, ge=1, description="Número da página (ignorado quando há cursor)"),
+    per_page: int = Query(10, ge=1, le=100, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor next_cursor da página anterior"),
+    status_filtro: Optional[StatusChamadoEnum] = Query(None, alias="status", description="Filtrar por status"),
+    data_inicio: Optional[date] = Query(None, description="Filtrar por data de abertura (início)"),
+    data_fim: Optional[date] = Query(None, description="Filtrar por data de abertura (fim, inclusive)"),
     db: Session = Depends(get_db),
     current_user_role: str = Depends(get_current_user_role),
     current_user_id: int = Header(..., description="Current user ID")
 ):
     """
-    Lista todos os chamados atribuídos a um técnico específico.
+    Lista os chamados atribuídos a um técnico, do mais recente ao mais antigo, com paginação.
     - Administradores e gerentes podem ver chamados de qualquer técnico
     - Funcionários só podem ver seus próprios chamados
+    - Para percorrer as páginas, envie o next_cursor recebido como cursor (paginação
+      por chave, sem OFFSET, sobre o índice id_usuario + data_abertura)
+    - Filtros opcionais por status e por período de abertura
     """
     # Verificar se o usuário existe
     get_usuario_or_404(db, id_usuario)
@@ -390,12 +650,10 @@ def get_chamados_by_tecnico(
             detail="Você não tem permissão para ver chamados de outros técnicos"
         )
     
-    # Buscar os chamados do técnico
-    chamados = db.query(Chamado).options(
-        joinedload(Chamado.cliente)
-    ).filter(Chamado.id_usuario == id_usuario).order_by(Chamado.data_abertura.desc()).all()
-    
-    return chamados
+    query = db.query(Chamado).filter(Chamado.id_usuario == id_usuario)
+    return pagina_filtrada_por_cursor(
+        query, page, per_page, cursor, status_filtro, data_inicio, data_fim
+    )
 
 @router.put("/{id_chamado}", response_model=ChamadoSchema)
 def update_chamado(
@@ -433,13 +691,32 @@ def update_chamado(
     
     try:
         status_was = db_chamado.status
+        usuario_was = db_chamado.id_usuario
+        campos_alterados = set()
         for key, value in update_data.items():
             old_value = getattr(db_chamado, key)
             if old_value != value:  # Só registra no histórico se o valor mudou
                 registrar_historico(db, id_chamado, key, old_value, value)
                 setattr(db_chamado, key, value)
+                campos_alterados.add(key)
+
+        # Fechar o intervalo do status anterior e abrir o do novo status
+        if 'status' in campos_alterados:
+            registrar_status(db, db_chamado)
+
+            # Data de conclusão (relatórios): marcada ao concluir, limpa ao reabrir
+            data_conclusao = db_chamado.data_conclusao
+            if db_chamado.status == 'Concluído' and data_conclusao is None:
+                data_conclusao = datetime.now()
+            elif status_was == 'Concluído' and 'data_conclusao' not in update_data:
+                data_conclusao = None
+            if data_conclusao != db_chamado.data_conclusao:
+                registrar_historico(db, id_chamado, 'data_conclusao', db_chamado.data_conclusao, data_conclusao)
+                db_chamado.data_conclusao = data_conclusao
+                campos_alterados.add('data_conclusao')
 
         # Se status mudou para 'Concluído' e não era antes, registrar no Caixa
+        caixa_entry = None
         if (
             'status' in update_data and
             update_data['status'] == 'Concluído' and
@@ -460,9 +737,30 @@ def update_chamado(
                 data_criacao=datetime.now()
             )
             db.add(caixa_entry)
+            db.flush()
+            registrar_alteracao(db, "caixa", caixa_entry.id_caixa)
+
+        if campos_alterados & CAMPOS_RESUMO:
+            atualizar_resumo_cliente(db, db_chamado.id_cliente)
+
+        if campos_alterados:
+            registrar_alteracao(
+                db, "chamado", id_chamado,
+                id_usuario=db_chamado.id_usuario, id_usuario_anterior=usuario_was
+            )
 
         db.commit()
         db.refresh(db_chamado)
+        # A agenda guarda o chamado completo: qualquer alteração a invalida
+        if campos_alterados:
+            invalidar_agenda(usuario_was, db_chamado.id_usuario)
+            invalidar_listas()
+            publicar_evento(
+                "chamado", id_chamado, "atualizado", campos_alterados,
+                usuarios=[usuario_was, db_chamado.id_usuario]
+            )
+        if caixa_entry is not None:
+            publicar_evento("caixa", caixa_entry.id_caixa, "criado")
         return db_chamado
     except IntegrityError:
         db.rollback()
@@ -489,8 +787,14 @@ def delete_chamado(id_chamado: int, db: Session = Depends(get_db)):
         
         # Atualizar status para "Cancelado"
         db_chamado.status = "Cancelado"
+        registrar_status(db, db_chamado)
+        atualizar_resumo_cliente(db, db_chamado.id_cliente)
+        registrar_alteracao(db, "chamado", id_chamado, id_usuario=db_chamado.id_usuario)
         
         db.commit()
+        invalidar_agenda(db_chamado.id_usuario)
+        invalidar_listas()
+        publicar_evento("chamado", id_chamado, "atualizado", ["status"], usuarios=[db_chamado.id_usuario])
         return {"message": f"Chamado {id_chamado} cancelado com sucesso"}
     except Exception as e:
         db.rollback()
@@ -539,17 +843,26 @@ def create_item_chamado(
             valor_unitario=item.valor_unitario
         )
         db.add(db_item)
+        db.flush()
+        registrar_alteracao(db, "item_chamado", db_item.id_item_chamado, id_usuario=db_chamado.id_usuario)
         
         # Atualizar o valor total do chamado
         db.commit()
         db.refresh(db_item)
         
         # Recalcular valor total e atualizar chamado
+        campos_evento = ["itens"]
         novo_valor = calcular_valor_total_itens(db, id_chamado)
         if db_chamado.valor != novo_valor:
             registrar_historico(db, id_chamado, "valor", db_chamado.valor, novo_valor)
             db_chamado.valor = novo_valor
+            atualizar_resumo_cliente(db, db_chamado.id_cliente)
+            registrar_alteracao(db, "chamado", db_chamado.id_chamado, id_usuario=db_chamado.id_usuario)
             db.commit()
+            invalidar_agenda(db_chamado.id_usuario)
+            invalidar_listas()
+            campos_evento.append("valor")
+        publicar_evento("chamado", db_chamado.id_chamado, "atualizado", campos_evento, usuarios=[db_chamado.id_usuario])
         
         return db_item
     except IntegrityError:
@@ -624,16 +937,24 @@ def update_item_chamado(
         update_data = item_update.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_item, key, value)
+        registrar_alteracao(db, "item_chamado", id_item_chamado, id_usuario=db_chamado.id_usuario)
         
         db.commit()
         db.refresh(db_item)
         
         # Recalcular valor total e atualizar chamado
+        campos_evento = ["itens"]
         novo_valor = calcular_valor_total_itens(db, db_item.id_chamado)
         if db_chamado.valor != novo_valor:
             registrar_historico(db, db_item.id_chamado, "valor", db_chamado.valor, novo_valor)
             db_chamado.valor = novo_valor
+            atualizar_resumo_cliente(db, db_chamado.id_cliente)
+            registrar_alteracao(db, "chamado", db_chamado.id_chamado, id_usuario=db_chamado.id_usuario)
             db.commit()
+            invalidar_agenda(db_chamado.id_usuario)
+            invalidar_listas()
+            campos_evento.append("valor")
+        publicar_evento("chamado", db_chamado.id_chamado, "atualizado", campos_evento, usuarios=[db_chamado.id_usuario])
         
         return db_item
     except IntegrityError:
@@ -681,14 +1002,22 @@ def delete_item_chamado(
         
         # Excluir o item
         db.delete(db_item)
+        registrar_alteracao(db, "item_chamado", id_item_chamado, "removido", id_usuario=db_chamado.id_usuario)
         db.commit()
         
         # Recalcular valor total e atualizar chamado
+        campos_evento = ["itens"]
         novo_valor = calcular_valor_total_itens(db, id_chamado)
         if db_chamado.valor != novo_valor:
             registrar_historico(db, id_chamado, "valor", db_chamado.valor, novo_valor)
             db_chamado.valor = novo_valor
+            atualizar_resumo_cliente(db, db_chamado.id_cliente)
+            registrar_alteracao(db, "chamado", db_chamado.id_chamado, id_usuario=db_chamado.id_usuario)
             db.commit()
+            invalidar_agenda(db_chamado.id_usuario)
+            invalidar_listas()
+            campos_evento.append("valor")
+        publicar_evento("chamado", db_chamado.id_chamado, "atualizado", campos_evento, usuarios=[db_chamado.id_usuario])
         
         return {"message": f"Item {id_item_chamado} removido com sucesso"}
     except Exception as e:
@@ -706,7 +1035,7 @@ def get_chamados_by_week(
     current_user_id: int = Header(..., description="Current user ID")
 ):
     """
-    Retorna os chamados agrupados por dia da semana.
+    Retorna os chamados agrupados por dia da semana (pela data de abertura).
     - Administradores e gerentes podem ver chamados de qualquer técnico
     - Funcionários só podem ver seus próprios chamados
     Se start_date não for fornecida, usa a data atual como início da semana.
@@ -716,37 +1045,77 @@ def get_chamados_by_week(
         today = date.today()
         # Ajusta para o início da semana (segunda-feira)
         start_date = today - timedelta(days=today.weekday())
+    elif start_date.year > CALENDARIO_ANO_MAXIMO:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A data inicial deve ser anterior a {CALENDARIO_ANO_MAXIMO + 1}"
+        )
     
     # Calcula o fim da semana (domingo)
     end_date = start_date + timedelta(days=6)
     
-    # Construir a query base
-    query = db.query(Chamado).options(
-        joinedload(Chamado.cliente),
-        joinedload(Chamado.tecnico)
-    ).filter(
-        func.date(Chamado.data_abertura) >= start_date,
-        func.date(Chamado.data_abertura) <= end_date
+    return chamados_por_dia(
+        db, Chamado.data_abertura, start_date, end_date, current_user_role, current_user_id
     )
+
+@router.get("/calendar/month", response_model=Dict[str, List[ChamadoSchema]])
+def get_chamados_by_month(
+    ano: Optional[int] = Query(None, ge=2000, le=CALENDARIO_ANO_MAXIMO, description="Ano (padrão: ano atual)"),
+    mes: Optional[int] = Query(None, ge=1, le=12, description="Mês (padrão: mês atual)"),
+    campo: CampoCalendario = Query(CampoCalendario.DATA_PREVISTA, description="Data usada no agrupamento"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role),
+    current_user_id: int = Header(..., description="Current user ID")
+):
+    """
+    Retorna os chamados de um mês agrupados por dia.
+    - Por padrão agrupa pela data prevista (agenda); campo=data_abertura agrupa pela abertura
+    - Administradores e gerentes podem ver chamados de qualquer técnico
+    - Funcionários só podem ver seus próprios chamados
+    """
+    today = date.today()
+    inicio = date(ano or today.year, mes or today.month, 1)
+    proximo_mes = date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+    fim = proximo_mes - timedelta(days=1)
     
-    # Aplicar filtro baseado no papel do usuário
-    if current_user_role == RoleEnum.FUNCIONARIO.value:
-        query = query.filter(Chamado.id_usuario == current_user_id)
-    
-    # Busca os chamados da semana
-    chamados = query.order_by(Chamado.data_abertura).all()
-    
-    # Agrupa os chamados por dia
-    chamados_by_day = {}
-    current_date = start_date
-    while current_date <= end_date:
-        chamados_by_day[current_date.isoformat()] = [
-            chamado for chamado in chamados 
-            if chamado.data_abertura.date() == current_date
-        ]
-        current_date += timedelta(days=1)
+    return chamados_por_dia(
+        db, getattr(Chamado, campo.value), inicio, fim, current_user_role, current_user_id
+    )
+
+@router.get("/calendar/range", response_model=Dict[str, List[ChamadoSchema]])
+def get_chamados_by_range(
+    start: date = Query(..., description="Primeiro dia do intervalo"),
+    end: date = Query(..., description="Último dia do intervalo (inclusive)"),
+    campo: CampoCalendario = Query(CampoCalendario.DATA_PREVISTA, description="Data usada no agrupamento"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role),
+    current_user_id: int = Header(..., description="Current user ID")
+):
+    """
+    Retorna os chamados de um intervalo de dias (start..end) agrupados por dia.
+    - Por padrão agrupa pela data prevista (agenda); campo=data_abertura agrupa pela abertura
+    - Administradores e gerentes podem ver chamados de qualquer técnico
+    - Funcionários só podem ver seus próprios chamados
+    """
+    if end < start:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data final deve ser igual ou posterior à data inicial"
+        )
+    if end.year > CALENDARIO_ANO_MAXIMO:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A data final deve ser anterior a {CALENDARIO_ANO_MAXIMO + 1}"
+        )
+    if (end - start).days + 1 > CALENDARIO_MAX_DIAS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"O intervalo pode ter no máximo {CALENDARIO_MAX_DIAS} dias"
+        )
     
-    return chamados_by_day
+    return chamados_por_dia(
+        db, getattr(Chamado, campo.value), start, end, current_user_role, current_user_id
+    )
 
 @router.get("/calendar/day", response_model=List[ChamadoSchema])
 def get_chamados_by_day(
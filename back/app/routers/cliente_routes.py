@@ -4,9 +4,14 @@ from sqlalchemy.exc import IntegrityError
 from typing import List, Optional, Dict
 from sqlalchemy.sql import func
 from pydantic import BaseModel
+from datetime import datetime
+import json
 import os
 
 from ..database import get_db
+from ..cache import TTLCache
+from ..client_summary import obter_resumo_cliente
+from ..pagination import ModoContagem, contar_total, COUNT_CACHE_TTL
 from ..models import Cliente
 from ..schemas import Cliente as ClienteSchema
 from ..schemas import ClienteCreate, ClienteUpdate, ClientePaginated
@@ -38,20 +43,46 @@ router = APIRouter(
     dependencies=[Depends(verify_api_key)]  # Apply API key verification to all routes
 )
 
+# Totais de list_clientes por filtro (modo contagem=cache); limpos a cada escrita
+contagem_cache = TTLCache(ttl=COUNT_CACHE_TTL, maxsize=512)
+
+# Estatísticas de clientes: um único cálculo para requisições simultâneas, limpo a cada escrita
+estatisticas_cache = TTLCache(ttl=float(os.getenv("STATISTICS_CACHE_TTL", "10")), maxsize=1)
+
 # Define statistics schema
 class ClienteStats(BaseModel):
     total_clientes: int
 
+# Define client summary schema
+class AparelhoFrequente(BaseModel):
+    aparelho: str
+    quantidade: int
+
+class ClienteResumo(BaseModel):
+    id_cliente: int
+    nome: str
+    telefone: str
+    endereco: Optional[str] = None
+    total_chamados: int
+    chamados_abertos: int
+    chamados_concluidos: int
+    valor_total: float
+    ultima_visita: Optional[datetime] = None
+    aparelhos_frequentes: List[AparelhoFrequente]
+
 # IMPORTANT: Statistics endpoints must be defined BEFORE any path parameter routes
 @router.get("/statistics", response_model=ClienteStats)
 def get_cliente_statistics(db: Session = Depends(get_db)):
     """
     Retorna estatísticas dos clientes, incluindo:
     - Total de clientes cadastrados
+    Requisições simultâneas compartilham um único cálculo (cache curto, limpo ao criar clientes).
     """
-    total_clientes = db.query(func.count(Cliente.id_cliente)).scalar() or 0
+    def calcular():
+        total_clientes = db.query(func.count(Cliente.id_cliente)).scalar() or 0
+        return ClienteStats(total_clientes=total_clientes)
     
-    return ClienteStats(total_clientes=total_clientes)
+    return estatisticas_cache.get_or_compute("clientes", calcular)
 
 @router.post("/", response_model=ClienteSchema, status_code=status.HTTP_201_CREATED)
 def create_cliente(cliente: ClienteCreate, db: Session = Depends(get_db)):
@@ -80,6 +111,8 @@ def create_cliente(cliente: ClienteCreate, db: Session = Depends(get_db)):
         db.add(db_cliente)
         db.commit()
         db.refresh(db_cliente)
+        contagem_cache.clear()
+        estatisticas_cache.clear()
         return db_cliente
     except IntegrityError:
         db.rollback()
@@ -114,6 +147,37 @@ def get_cliente(id_cliente: int, db: Session = Depends(get_db)):
         )
     return db_cliente
 
+@router.get("/{id_cliente}/resumo", response_model=ClienteResumo)
+def get_cliente_resumo(id_cliente: int, db: Session = Depends(get_db)):
+    """
+    Resumo de todo o histórico do cliente:
+    - Total de chamados (exceto cancelados), abertos e concluídos
+    - Valor total gasto (chamados concluídos) e data da última visita
+    - Aparelhos mais atendidos
+    Os valores vêm da tabela de resumo, mantida pelas rotas de escrita de chamados
+    e itens; os chamados em si ficam em GET /api/chamados/?id_cliente= (paginado).
+    """
+    db_cliente = db.query(Cliente).filter(Cliente.id_cliente == id_cliente).first()
+    if db_cliente is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Cliente com ID {id_cliente} não encontrado"
+        )
+    resumo = obter_resumo_cliente(db, id_cliente)
+    
+    return ClienteResumo(
+        id_cliente=db_cliente.id_cliente,
+        nome=db_cliente.nome,
+        telefone=db_cliente.telefone,
+        endereco=db_cliente.endereco,
+        total_chamados=resumo.total_chamados,
+        chamados_abertos=resumo.chamados_abertos,
+        chamados_concluidos=resumo.chamados_concluidos,
+        valor_total=float(resumo.valor_total or 0),
+        ultima_visita=resumo.ultima_visita,
+        aparelhos_frequentes=json.loads(resumo.aparelhos_frequentes or "[]")
+    )
+
 @router.get("/", response_model=ClientePaginated)
 def list_clientes(
     page: int = Query(1, ge=1, description="Número da página"),
@@ -121,6 +185,7 @@ def list_clientes(
     search: Optional[str] = Query(None, description="Filtrar por nome ou telefone"),
     nome: Optional[str] = Query(None, description="Filtrar por nome"),
     telefone: Optional[str] = Query(None, description="Filtrar por telefone"),
+    contagem: ModoContagem = Query(ModoContagem.EXATA, description="Total: exata, cache, estimada ou nenhuma"),
     db: Session = Depends(get_db)
 ):
     """
@@ -130,6 +195,9 @@ def list_clientes(
     - search: Busca unificada por nome OU telefone
     - nome: Filtro específico por nome
     - telefone: Filtro específico por telefone
+    
+    O parâmetro contagem escolhe como o total é obtido (exata, cache, estimada
+    ou nenhuma); has_more indica se existe próxima página em qualquer modo.
     """
     # Construir a query base
     query = db.query(Cliente)
@@ -148,16 +216,20 @@ def list_clientes(
             query = query.filter(Cliente.telefone.ilike(f"%{telefone}%"))
     
     # Contar total de registros para paginação
-    total = query.count()
+    total, total_is_estimate = contar_total(
+        query, contagem, contagem_cache, (search, nome, telefone)
+    )
     
-    # Aplicar paginação
-    clientes = query.offset((page - 1) * per_page).limit(per_page).all()
+    # Aplicar paginação (uma linha a mais indica se existe próxima página)
+    clientes = query.offset((page - 1) * per_page).limit(per_page + 1).all()
     
     return {
         "total": total,
         "page": page,
         "per_page": per_page,
-        "items": clientes
+        "items": clientes[:per_page],
+        "has_more": len(clientes) > per_page,
+        "total_is_estimate": total_is_estimate
     }
 
 @router.put("/{id_cliente}", response_model=ClienteSchema)
@@ -200,6 +272,8 @@ def update_cliente(
     try:
         db.commit()
         db.refresh(db_cliente)
+        # Nome e telefone alterados mudam o resultado das buscas
+        contagem_cache.clear()
         return db_cliente
     except IntegrityError:
         db.rollback()
@@ -0,0 +1,93 @@
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+
+from ..models import RoleEnum
+from ..events import canal, formatar_sse, evento_reset, INSTANCIA, EVENTS_HEARTBEAT
+from .chamado_routes import get_current_user_role
+
+router = APIRouter(
+    prefix="/api/eventos",
+    tags=["eventos"],
+    responses={
+        401: {"description": "API Key inválida"},
+        403: {"description": "Acesso não autorizado"}
+    }
+)
+
+# Função auxiliar para decidir quais eventos cada papel pode receber
+def filtro_por_papel(role: str, id_usuario: int):
+    if role in [RoleEnum.ADMINISTRADOR.value, RoleEnum.GERENTE.value]:
+        return lambda evento: True
+    # Funcionários recebem apenas os seus chamados (inclusive os que deixaram de ser seus)
+    return lambda evento: evento["entidade"] == "chamado" and id_usuario in evento["usuarios"]
+
+# Função auxiliar para interpretar o Last-Event-ID ("instancia:versao")
+def versao_do_ultimo_evento(last_event_id: Optional[str]) -> Optional[int]:
+    if not last_event_id:
+        return None
+    instancia, _, versao = last_event_id.partition(":")
+    if instancia != INSTANCIA or not versao.isdigit():
+        return -1  # id de outro processo ou inválido: o cliente precisa recarregar
+    return int(versao)
+
+@router.get("/")
+async def stream_eventos(
+    request: Request,
+    current_user_role: str = Depends(get_current_user_role),
+    current_user_id: int = Header(..., description="Current user ID"),
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID", description="Último evento recebido, para retomar após reconexão")
+):
+    """
+    Feed de alterações em tempo real (Server-Sent Events).
+    Cada evento traz entidade ("chamado" ou "caixa"), id, ação, campos alterados e versão;
+    o cliente deve buscar novamente apenas o que mudou.
+    - Administradores e gerentes recebem todos os eventos
+    - Funcionários recebem apenas eventos dos seus próprios chamados
+    - Um evento "reset" indica que eventos foram perdidos e que tudo deve ser recarregado
+    """
+    filtro = filtro_por_papel(current_user_role, current_user_id)
+    versao = versao_do_ultimo_evento(last_event_id)
+
+    async def gerar():
+        # Assina antes de ler o histórico: eventos repetidos são descartados pela versão
+        assinatura = canal.assinar(asyncio.get_running_loop(), filtro)
+        try:
+            ultima = 0
+            if versao is not None:
+                pendentes = canal.desde(versao) if versao >= 0 else None
+                if pendentes is None:
+                    yield evento_reset()
+                else:
+                    ultima = versao
+                    for evento in pendentes:
+                        if filtro(evento):
+                            yield formatar_sse(evento)
+                        ultima = evento["versao"]
+            yield f"retry: 3000\n: conectado {INSTANCIA}\n\n"
+            while True:
+                if assinatura.estourou:
+                    # Conexão lenta perdeu eventos: descarta a fila e pede recarga
+                    assinatura.estourou = False
+                    while not assinatura.fila.empty():
+                        assinatura.fila.get_nowait()
+                    yield evento_reset()
+                    continue
+                try:
+                    evento = await asyncio.wait_for(assinatura.fila.get(), timeout=EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+                    continue
+                if evento["versao"] > ultima:
+                    yield formatar_sse(evento)
+        finally:
+            canal.cancelar(assinatura)
+
+    return StreamingResponse(
+        gerar(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,400 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from typing import Dict, List, Optional
+from datetime import datetime, date, time, timedelta
+from pydantic import BaseModel
+
+from ..database import get_db
+from ..models import Chamado, ItemChamado, Usuario, IntervaloStatusChamado, STATUS_ATIVOS, filtro_status_ativos
+from . import chamado_routes, cliente_routes
+from .chamado_routes import get_current_user_role, relatorio_cache
+from .caixa_routes import check_admin_or_manager
+
+router = APIRouter(
+    prefix="/api/relatorios",
+    tags=["relatorios"],
+    responses={
+        401: {"description": "API Key inválida"},
+        403: {"description": "Acesso não autorizado"}
+    },
+    dependencies=[Depends(get_current_user_role)]
+)
+
+# Intervalo padrão dos relatórios, em dias, terminando hoje
+RELATORIO_DIAS_PADRAO = 30
+
+class ProdutividadeSemana(BaseModel):
+    semana: date  # segunda-feira da semana
+    concluidos: int
+
+class ProdutividadeTecnico(BaseModel):
+    id_usuario: int
+    nome: str
+    concluidos: int
+    tempo_medio_horas: Optional[float] = None
+    receita_itens: float
+    backlog_aberto: int
+    por_semana: List[ProdutividadeSemana]
+
+class RelatorioProdutividade(BaseModel):
+    data_inicio: date
+    data_fim: date
+    tecnicos: List[ProdutividadeTecnico]
+
+class MetricaSLA(BaseModel):
+    status: str
+    id_usuario: Optional[int] = None
+    quantidade: int
+    media_horas: float
+    p50_horas: float
+    p90_horas: float
+    p95_horas: float
+    max_horas: float
+
+class RelatorioSLA(BaseModel):
+    data_inicio: date
+    data_fim: date
+    por_status: List[MetricaSLA]
+    por_tecnico: List[MetricaSLA]
+
+class GrupoAging(BaseModel):
+    status: str
+    faixa_dias: str  # dias desde a abertura
+    prazo: str  # atrasado, no_prazo ou sem_previsao
+    quantidade: int
+    valor_itens: float
+
+class TotalAging(BaseModel):
+    chave: str
+    quantidade: int
+    valor_itens: float
+
+class RelatorioAging(BaseModel):
+    data_referencia: date
+    quantidade: int
+    valor_itens: float
+    por_faixa: List[TotalAging]
+    por_prazo: List[TotalAging]
+    grupos: List[GrupoAging]
+
+# Faixas de idade do backlog: (rótulo, idade máxima em dias; None = sem limite)
+FAIXAS_AGING = (("0-3", 3), ("4-7", 7), ("8-15", 15), ("15+", None))
+
+# Situações do prazo (data prevista) dos chamados em aberto
+PRAZOS_AGING = ("atrasado", "no_prazo", "sem_previsao")
+
+class MetricasCache(BaseModel):
+    entradas: int
+    hits: int
+    misses: int
+    computacoes: int
+    coalescidas: int
+    economizadas: int
+
+# Função auxiliar para resolver e validar o intervalo de um relatório
+def resolver_intervalo(data_inicio: Optional[date], data_fim: Optional[date]):
+    data_fim = data_fim or date.today()
+    data_inicio = data_inicio or data_fim - timedelta(days=RELATORIO_DIAS_PADRAO - 1)
+    if data_fim < data_inicio:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A data final deve ser igual ou posterior à data inicial"
+        )
+    return data_inicio, data_fim
+
+@router.get("/produtividade", response_model=RelatorioProdutividade)
+def get_relatorio_produtividade(
+    data_inicio: Optional[date] = Query(None, description="Início do período de conclusão (padrão: 30 dias atrás)"),
+    data_fim: Optional[date] = Query(None, description="Fim do período de conclusão, inclusive (padrão: hoje)"),
+    id_usuario: Optional[int] = Query(None, description="Filtrar por técnico"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role)
+):
+    """
+    Produtividade por técnico no período, calculada com consultas agrupadas no banco:
+    - Chamados concluídos no período, no total e por semana
+    - Tempo médio (em horas) entre abertura e conclusão
+    - Receita dos itens dos chamados concluídos no período
+    - Backlog atual de chamados abertos ou em andamento
+    Acesso permitido apenas para administradores e gerentes.
+    """
+    check_admin_or_manager(current_user_role)
+    data_inicio, data_fim = resolver_intervalo(data_inicio, data_fim)
+
+    chave = ("produtividade", data_inicio, data_fim, id_usuario)
+    cached = relatorio_cache.get(chave)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # Intervalo semiaberto sobre data_conclusao (índice status + data_conclusao)
+    concluidos_no_periodo = (
+        Chamado.status == "Concluído",
+        Chamado.data_conclusao >= datetime.combine(data_inicio, time.min),
+        Chamado.data_conclusao < datetime.combine(data_fim + timedelta(days=1), time.min),
+        Chamado.id_usuario.isnot(None),
+    )
+    filtro_tecnico = (Chamado.id_usuario == id_usuario,) if id_usuario else ()
+
+    # Total concluído e tempo médio de atendimento por técnico
+    horas = (func.julianday(Chamado.data_conclusao) - func.julianday(Chamado.data_abertura)) * 24
+    totais = db.query(
+        Chamado.id_usuario, func.count(Chamado.id_chamado), func.avg(horas)
+    ).filter(*concluidos_no_periodo, *filtro_tecnico).group_by(Chamado.id_usuario).all()
+
+    # Concluídos por semana (semana iniciando na segunda-feira)
+    semana = func.date(Chamado.data_conclusao, "-6 days", "weekday 1")
+    semanas = db.query(
+        Chamado.id_usuario, semana, func.count(Chamado.id_chamado)
+    ).filter(*concluidos_no_periodo, *filtro_tecnico).group_by(
+        Chamado.id_usuario, semana
+    ).order_by(Chamado.id_usuario, semana).all()
+
+    # Receita dos itens dos chamados concluídos no período
+    receitas = db.query(
+        Chamado.id_usuario, func.sum(ItemChamado.quantidade * ItemChamado.valor_unitario)
+    ).join(ItemChamado, ItemChamado.id_chamado == Chamado.id_chamado).filter(
+        *concluidos_no_periodo, *filtro_tecnico
+    ).group_by(Chamado.id_usuario).all()
+
+    # Backlog atual (independe do período)
+    backlogs = db.query(
+        Chamado.id_usuario, func.count(Chamado.id_chamado)
+    ).filter(
+        filtro_status_ativos(Chamado.status), Chamado.id_usuario.isnot(None), *filtro_tecnico
+    ).group_by(Chamado.id_usuario).all()
+
+    ids = {row[0] for row in totais} | {row[0] for row in backlogs}
+    nomes = dict(
+        db.query(Usuario.id_usuario, Usuario.nome).filter(Usuario.id_usuario.in_(ids)).all()
+    ) if ids else {}
+
+    por_tecnico = {
+        id_tecnico: {
+            "id_usuario": id_tecnico,
+            "nome": nomes.get(id_tecnico, ""),
+            "concluidos": 0,
+            "tempo_medio_horas": None,
+            "receita_itens": 0.0,
+            "backlog_aberto": 0,
+            "por_semana": [],
+        }
+        for id_tecnico in ids
+    }
+    for id_tecnico, total, media in totais:
+        por_tecnico[id_tecnico]["concluidos"] = total
+        por_tecnico[id_tecnico]["tempo_medio_horas"] = round(media, 2) if media is not None else None
+    for id_tecnico, inicio_semana, total in semanas:
+        por_tecnico[id_tecnico]["por_semana"].append({"semana": inicio_semana, "concluidos": total})
+    for id_tecnico, receita in receitas:
+        por_tecnico[id_tecnico]["receita_itens"] = float(receita or 0)
+    for id_tecnico, total in backlogs:
+        por_tecnico[id_tecnico]["backlog_aberto"] = total
+
+    relatorio = RelatorioProdutividade(
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        tecnicos=sorted(por_tecnico.values(), key=lambda t: t["nome"])
+    )
+    content = relatorio.model_dump_json().encode()
+    relatorio_cache.set(chave, content)
+    return Response(content=content, media_type="application/json")
+
+# Função auxiliar para calcular percentis de tempo em status, agrupados no banco
+def percentis_tempo_em_status(db: Session, filtros, por_tecnico: bool):
+    """
+    Numera as durações de cada grupo com ROW_NUMBER() e obtém o percentil p
+    pela posição mais próxima (menor duração com posição >= p * total).
+    """
+    intervalo = IntervaloStatusChamado
+    fim = func.coalesce(intervalo.saiu_em, datetime.now())
+    horas = (func.julianday(fim) - func.julianday(intervalo.entrou_em)) * 24
+    chaves = [intervalo.status] + ([intervalo.id_usuario] if por_tecnico else [])
+
+    duracoes = db.query(
+        *chaves,
+        horas.label("horas"),
+        func.row_number().over(partition_by=chaves, order_by=horas).label("posicao"),
+        func.count().over(partition_by=chaves).label("total")
+    ).filter(*filtros).subquery()
+
+    colunas = [duracoes.c.status] + ([duracoes.c.id_usuario] if por_tecnico else [])
+
+    def percentil(p: float):
+        return func.min(case((duracoes.c.posicao >= duracoes.c.total * p, duracoes.c.horas)))
+
+    rows = db.query(
+        *colunas,
+        func.max(duracoes.c.total),
+        func.avg(duracoes.c.horas),
+        percentil(0.5),
+        percentil(0.9),
+        percentil(0.95),
+        func.max(duracoes.c.horas)
+    ).group_by(*colunas).order_by(*colunas).all()
+
+    metricas = []
+    for row in rows:
+        if por_tecnico:
+            status_, id_tecnico, *valores = row
+        else:
+            (status_, *valores), id_tecnico = row, None
+        quantidade, media, p50, p90, p95, maximo = valores
+        metricas.append(MetricaSLA(
+            status=status_,
+            id_usuario=id_tecnico,
+            quantidade=quantidade,
+            media_horas=round(media, 2),
+            p50_horas=round(p50, 2),
+            p90_horas=round(p90, 2),
+            p95_horas=round(p95, 2),
+            max_horas=round(maximo, 2)
+        ))
+    return metricas
+
+@router.get("/sla", response_model=RelatorioSLA)
+def get_relatorio_sla(
+    data_inicio: Optional[date] = Query(None, description="Início do período de entrada no status (padrão: 30 dias atrás)"),
+    data_fim: Optional[date] = Query(None, description="Fim do período de entrada no status, inclusive (padrão: hoje)"),
+    id_usuario: Optional[int] = Query(None, description="Filtrar por técnico"),
+    incluir_em_curso: bool = Query(True, description="Incluir chamados que ainda estão no status (duração até agora)"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role)
+):
+    """
+    Tempo que os chamados passam em "Aberto" e "Em Andamento", a partir da tabela
+    de intervalos de status: quantidade, média, p50, p90, p95 e máximo (em horas),
+    por status e por status/técnico, para intervalos iniciados no período.
+    Acesso permitido apenas para administradores e gerentes.
+    """
+    check_admin_or_manager(current_user_role)
+    data_inicio, data_fim = resolver_intervalo(data_inicio, data_fim)
+
+    chave = ("sla", data_inicio, data_fim, id_usuario, incluir_em_curso)
+    cached = relatorio_cache.get(chave)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    intervalo = IntervaloStatusChamado
+    filtros = [
+        intervalo.status.in_(STATUS_ATIVOS),
+        intervalo.entrou_em >= datetime.combine(data_inicio, time.min),
+        intervalo.entrou_em < datetime.combine(data_fim + timedelta(days=1), time.min),
+    ]
+    if id_usuario:
+        filtros.append(intervalo.id_usuario == id_usuario)
+    if not incluir_em_curso:
+        filtros.append(intervalo.saiu_em.isnot(None))
+
+    relatorio = RelatorioSLA(
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        por_status=percentis_tempo_em_status(db, filtros, por_tecnico=False),
+        por_tecnico=percentis_tempo_em_status(db, filtros, por_tecnico=True)
+    )
+    content = relatorio.model_dump_json().encode()
+    relatorio_cache.set(chave, content)
+    return Response(content=content, media_type="application/json")
+
+@router.get("/aging", response_model=RelatorioAging)
+def get_relatorio_aging(
+    id_usuario: Optional[int] = Query(None, description="Filtrar por técnico"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role)
+):
+    """
+    Envelhecimento do backlog: quantidade e valor dos itens dos chamados "Aberto"
+    e "Em Andamento", por faixa de dias desde a abertura (0-3, 4-7, 8-15, 15+) e
+    por situação do prazo (atrasado, no prazo, sem data prevista).
+    Calculado em uma única consulta agrupada sobre o índice parcial de chamados
+    em aberto, que não cresce com o histórico de concluídos.
+    Acesso permitido apenas para administradores e gerentes.
+    """
+    check_admin_or_manager(current_user_role)
+    hoje = date.today()
+
+    # Faixas por dia de calendário: abertura a partir da meia-noite do dia limite
+    faixa = case(
+        *[
+            (Chamado.data_abertura >= datetime.combine(hoje - timedelta(days=dias), time.min), rotulo)
+            for rotulo, dias in FAIXAS_AGING if dias is not None
+        ],
+        else_=FAIXAS_AGING[-1][0]
+    )
+    prazo = case(
+        (Chamado.data_prevista.is_(None), "sem_previsao"),
+        (Chamado.data_prevista < hoje, "atrasado"),
+        else_="no_prazo"
+    )
+
+    filtros = [filtro_status_ativos(Chamado.status)]
+    if id_usuario:
+        filtros.append(Chamado.id_usuario == id_usuario)
+
+    # Um chamado pode ter vários itens: conta chamados distintos e soma os itens
+    rows = db.query(
+        Chamado.status,
+        faixa.label("faixa"),
+        prazo.label("prazo"),
+        func.count(func.distinct(Chamado.id_chamado)),
+        func.coalesce(func.sum(ItemChamado.quantidade * ItemChamado.valor_unitario), 0)
+    ).outerjoin(
+        ItemChamado, ItemChamado.id_chamado == Chamado.id_chamado
+    ).filter(*filtros).group_by(Chamado.status, "faixa", "prazo").all()
+
+    grupos = []
+    por_faixa = {rotulo: [0, 0.0] for rotulo, _ in FAIXAS_AGING}
+    por_prazo = {chave: [0, 0.0] for chave in PRAZOS_AGING}
+    for status_, faixa_dias, situacao, quantidade, valor in rows:
+        valor = float(valor)
+        grupos.append(GrupoAging(
+            status=status_,
+            faixa_dias=faixa_dias,
+            prazo=situacao,
+            quantidade=quantidade,
+            valor_itens=round(valor, 2)
+        ))
+        for totais in (por_faixa[faixa_dias], por_prazo[situacao]):
+            totais[0] += quantidade
+            totais[1] += valor
+
+    ordem_faixas = [rotulo for rotulo, _ in FAIXAS_AGING]
+    grupos.sort(key=lambda g: (g.status, ordem_faixas.index(g.faixa_dias), PRAZOS_AGING.index(g.prazo)))
+
+    return RelatorioAging(
+        data_referencia=hoje,
+        quantidade=sum(g.quantidade for g in grupos),
+        valor_itens=round(sum(g.valor_itens for g in grupos), 2),
+        por_faixa=[
+            TotalAging(chave=chave, quantidade=q, valor_itens=round(v, 2))
+            for chave, (q, v) in por_faixa.items()
+        ],
+        por_prazo=[
+            TotalAging(chave=chave, quantidade=q, valor_itens=round(v, 2))
+            for chave, (q, v) in por_prazo.items()
+        ],
+        grupos=grupos
+    )
+
+# Função auxiliar com os caches em memória do processo, por nome (também usada em /metrics)
+def caches_do_processo():
+    return {
+        "estatisticas_chamados": chamado_routes.estatisticas_cache,
+        "estatisticas_clientes": cliente_routes.estatisticas_cache,
+        "agenda": chamado_routes.agenda_cache,
+        "contagem_chamados": chamado_routes.contagem_cache,
+        "contagem_clientes": cliente_routes.contagem_cache,
+        "relatorios": relatorio_cache,
+    }
+
+@router.get("/cache", response_model=Dict[str, MetricasCache])
+def get_metricas_cache(current_user_role: str = Depends(get_current_user_role)):
+    """
+    Contadores dos caches em memória deste processo: acertos, cálculos executados
+    e requisições que aguardaram um cálculo em andamento (single-flight).
+    "economizadas" é o número de cálculos evitados (hits + coalescidas).
+    Acesso permitido apenas para administradores e gerentes.
+    """
+    check_admin_or_manager(current_user_role)
+    return {nome: cache.metricas() for nome, cache in caches_do_processo().items()}
@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends, Header, Query
+from sqlalchemy.orm import Session, joinedload
+from pydantic import BaseModel
+from typing import List, Optional
+
+from ..database import get_db
+from ..models import Chamado, ItemChamado, Caixa, RoleEnum
+from ..schemas import Chamado as ChamadoSchema, ItemChamado as ItemChamadoSchema, Caixa as CaixaSchema
+from ..change_log import SYNC_BATCH_LIMIT, alteracoes_desde, cursor_atual
+from .chamado_routes import get_current_user_role
+
+router = APIRouter(
+    prefix="/api/sync",
+    tags=["sync"],
+    responses={
+        401: {"description": "API Key inválida"},
+        403: {"description": "Acesso não autorizado"}
+    }
+)
+
+# Ids por consulta IN ao carregar os registros alterados
+TAMANHO_LOTE_IN = 500
+
+class RegistroRemovido(BaseModel):
+    entidade: str
+    id: int
+
+class SyncResponse(BaseModel):
+    cursor: int
+    has_more: bool = False
+    chamados: List[ChamadoSchema] = []
+    itens: List[ItemChamadoSchema] = []
+    caixa: List[CaixaSchema] = []
+    removidos: List[RegistroRemovido] = []
+
+# Função auxiliar para carregar registros por id em lotes (options: relacionamentos a carregar junto)
+def carregar_por_ids(db: Session, modelo, coluna_id, ids, options=()):
+    ids = list(ids)
+    encontrados = {}
+    for inicio in range(0, len(ids), TAMANHO_LOTE_IN):
+        consulta = db.query(modelo).options(*options)
+        for registro in consulta.filter(coluna_id.in_(ids[inicio:inicio + TAMANHO_LOTE_IN])):
+            encontrados[getattr(registro, coluna_id.key)] = registro
+    return encontrados
+
+@router.get("/", response_model=SyncResponse)
+def sync(
+    since: Optional[int] = Query(None, ge=0, description="Cursor retornado pela sincronização anterior"),
+    limite: int = Query(SYNC_BATCH_LIMIT, ge=1, le=SYNC_BATCH_LIMIT, description="Máximo de alterações lidas do log"),
+    db: Session = Depends(get_db),
+    current_user_role: str = Depends(get_current_user_role),
+    current_user_id: int = Header(..., description="Current user ID")
+):
+    """
+    Sincronização incremental: retorna o estado atual dos chamados, itens e lançamentos de caixa
+    alterados depois do cursor, e os removidos (ou que deixaram de ser visíveis) em `removidos`.
+    - Sem `since`, retorna apenas o cursor atual (obtenha-o antes da carga inicial)
+    - Com `has_more`, chame de novo com o `cursor` retornado
+    - Administradores e gerentes recebem tudo; funcionários, apenas seus chamados e itens
+    """
+    if since is None:
+        return SyncResponse(cursor=cursor_atual(db))
+
+    funcionario = current_user_role == RoleEnum.FUNCIONARIO.value
+    registros, has_more = alteracoes_desde(
+        db, since, limite, id_usuario=current_user_id if funcionario else None
+    )
+    if not registros:
+        return SyncResponse(cursor=since)
+
+    # Vários registros da mesma entidade valem por um: o estado atual é lido uma vez
+    ids = {"chamado": set(), "item_chamado": set(), "caixa": set()}
+    for registro in registros:
+        ids[registro.entidade].add(registro.id_entidade)
+
+    # Cliente e técnico vêm no mesmo SELECT: o schema do chamado inclui os dois
+    chamados = carregar_por_ids(
+        db, Chamado, Chamado.id_chamado, ids["chamado"],
+        options=(joinedload(Chamado.cliente), joinedload(Chamado.tecnico))
+    )
+    itens = carregar_por_ids(db, ItemChamado, ItemChamado.id_item_chamado, ids["item_chamado"])
+    caixa = carregar_por_ids(db, Caixa, Caixa.id_caixa, ids["caixa"])
+
+    # Técnico atual dos chamados dos itens, para filtrar itens de chamados reatribuídos
+    donos = {}
+    if funcionario and itens:
+        ids_chamados_itens = {item.id_chamado for item in itens.values()}
+        donos = {
+            id_chamado: chamado.id_usuario
+            for id_chamado, chamado in carregar_por_ids(db, Chamado, Chamado.id_chamado, ids_chamados_itens).items()
+        }
+
+    resposta = SyncResponse(cursor=registros[-1].id_registro, has_more=has_more)
+    for id_chamado in sorted(ids["chamado"]):
+        chamado = chamados.get(id_chamado)
+        if chamado is None or (funcionario and chamado.id_usuario != current_user_id):
+            resposta.removidos.append(RegistroRemovido(entidade="chamado", id=id_chamado))
+        else:
+            resposta.chamados.append(ChamadoSchema.model_validate(chamado))
+    for id_item in sorted(ids["item_chamado"]):
+        item = itens.get(id_item)
+        if item is None or (funcionario and donos.get(item.id_chamado) != current_user_id):
+            resposta.removidos.append(RegistroRemovido(entidade="item_chamado", id=id_item))
+        else:
+            resposta.itens.append(ItemChamadoSchema.model_validate(item))
+    for id_caixa in sorted(ids["caixa"]):
+        lancamento = caixa.get(id_caixa)
+        if lancamento is None:
+            resposta.removidos.append(RegistroRemovido(entidade="caixa", id=id_caixa))
+        else:
+            resposta.caixa.append(CaixaSchema.model_validate(lancamento))
+    return resposta
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any, ForwardRef
 from datetime import datetime, date
+from .models import StatusChamadoEnum
 
 # Esquemas para Cliente
 class ClienteBase(BaseModel):
@@ -35,10 +36,12 @@ class ClienteDetail(Cliente):
 # Esquemas para paginação
 class PaginatedResponse(BaseModel):
     """Esquema genérico para respostas paginadas"""
-    total: int
+    total: Optional[int] = None  # None quando a contagem foi dispensada
     page: int
     per_page: int
     items: List
+    has_more: bool = False
+    total_is_estimate: bool = False  # total é um limite inferior ("mais de N")
 
 class ClientePaginated(PaginatedResponse):
     """Esquema para resposta paginada de clientes"""
@@ -89,18 +92,24 @@ class ChamadoBase(BaseModel):
 
 class ChamadoCreate(ChamadoBase):
     """Esquema para criação de chamado"""
-    pass
+    status: StatusChamadoEnum = Field(StatusChamadoEnum.ABERTO.value, example="Aberto")
+    
+    class Config:
+        use_enum_values = True
 
 class ChamadoUpdate(BaseModel):
     """Esquema para atualização de chamado"""
     id_usuario: Optional[int] = Field(None, example=1, description="ID do técnico responsável")
     descricao: Optional[str] = Field(None, min_length=5, example="Geladeira não gela - atualizado")
     aparelho: Optional[str] = Field(None, min_length=2, example="Geladeira Brastemp Frost Free")
-    status: Optional[str] = Field(None, example="Em Análise")
+    status: Optional[StatusChamadoEnum] = Field(None, example="Em Andamento")
     valor: Optional[float] = Field(None, ge=0, example=150.0)
     observacao: Optional[str] = Field(None, example="Técnico identificou problema no compressor")
     data_prevista: Optional[date] = Field(None, example="2024-01-15")
     data_conclusao: Optional[datetime] = Field(None, example="2023-12-15T14:30:00")
+    
+    class Config:
+        use_enum_values = True
 
 class Chamado(ChamadoBase):
     """Esquema para respostas de chamado"""
@@ -129,6 +138,10 @@ class ChamadoPaginated(PaginatedResponse):
     """Esquema para resposta paginada de chamados"""
     items: List[Chamado]
 
+class ChamadoCursorPaginated(ChamadoPaginated):
+    """Esquema para resposta paginada de chamados com cursor para a próxima página"""
+    next_cursor: Optional[str] = None
+
 # Schemas de Usuário
 class UsuarioBase(BaseModel):
     nome: str
@@ -0,0 +1,101 @@
+"""
+Manutenção da tabela Intervalos_Status_Chamados.
+
+Cada linha registra um período em que um chamado ficou em um status
+(entrou_em .. saiu_em). As rotas de escrita chamam registrar_status a cada
+mudança de status, e backfill_intervalos reconstrói a tabela a partir do
+histórico de alterações para os dados já existentes.
+"""
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from .models import Chamado, HistoricoAlteracaoChamado, IntervaloStatusChamado
+
+def registrar_status(db: Session, chamado: Chamado, quando: Optional[datetime] = None):
+    """
+    Fecha o intervalo aberto do chamado e abre um novo no status atual.
+    Deve ser chamada na mesma transação que altera o status (antes do commit).
+    """
+    quando = quando or datetime.now()
+    db.query(IntervaloStatusChamado).filter(
+        IntervaloStatusChamado.id_chamado == chamado.id_chamado,
+        IntervaloStatusChamado.saiu_em.is_(None)
+    ).update({IntervaloStatusChamado.saiu_em: quando}, synchronize_session=False)
+    db.add(IntervaloStatusChamado(
+        id_chamado=chamado.id_chamado,
+        status=chamado.status,
+        id_usuario=chamado.id_usuario,
+        entrou_em=quando
+    ))
+
+def _intervalos_do_chamado(chamado_row, mudancas):
+    """
+    Reconstrói os intervalos de um chamado a partir das mudanças de status, em ordem.
+    O histórico não permite saber o técnico de cada período, então usa o técnico atual.
+    """
+    id_chamado, id_usuario, status_atual, data_abertura = chamado_row
+    # O status inicial é o valor antigo da primeira mudança (ou o atual, se nunca mudou)
+    status = mudancas[0][0] if mudancas and mudancas[0][0] else status_atual
+    inicio = data_abertura
+    intervalos = []
+    for valor_antigo, valor_novo, data_alteracao in mudancas:
+        intervalos.append({
+            "id_chamado": id_chamado,
+            "status": status,
+            "id_usuario": id_usuario,
+            "entrou_em": inicio,
+            "saiu_em": data_alteracao,
+        })
+        status, inicio = valor_novo, data_alteracao
+    intervalos.append({
+        "id_chamado": id_chamado,
+        "status": status,
+        "id_usuario": id_usuario,
+        "entrou_em": inicio,
+        "saiu_em": None,
+    })
+    return intervalos
+
+def backfill_intervalos(db: Session, lote: int = 1000) -> int:
+    """
+    Recria todos os intervalos a partir do histórico de status, em lotes de chamados.
+    Idempotente: apaga os intervalos de cada lote antes de inseri-los novamente.
+    Retorna o número de intervalos criados.
+    """
+    total = 0
+    ultimo_id = 0
+    while True:
+        chamados = db.query(
+            Chamado.id_chamado, Chamado.id_usuario, Chamado.status, Chamado.data_abertura
+        ).filter(Chamado.id_chamado > ultimo_id).order_by(Chamado.id_chamado).limit(lote).all()
+        if not chamados:
+            break
+        ids = [row[0] for row in chamados]
+
+        mudancas = {}
+        for id_chamado, valor_antigo, valor_novo, data_alteracao in db.query(
+            HistoricoAlteracaoChamado.id_chamado,
+            HistoricoAlteracaoChamado.valor_antigo,
+            HistoricoAlteracaoChamado.valor_novo,
+            HistoricoAlteracaoChamado.data_alteracao
+        ).filter(
+            HistoricoAlteracaoChamado.id_chamado.in_(ids),
+            HistoricoAlteracaoChamado.campo_alterado == "status"
+        ).order_by(HistoricoAlteracaoChamado.id_chamado, HistoricoAlteracaoChamado.id_historico):
+            mudancas.setdefault(id_chamado, []).append((valor_antigo, valor_novo, data_alteracao))
+
+        intervalos = []
+        for row in chamados:
+            intervalos.extend(_intervalos_do_chamado(row, mudancas.get(row[0], [])))
+
+        db.query(IntervaloStatusChamado).filter(
+            IntervaloStatusChamado.id_chamado.in_(ids)
+        ).delete(synchronize_session=False)
+        db.bulk_insert_mappings(IntervaloStatusChamado, intervalos)
+        db.commit()
+
+        total += len(intervalos)
+        ultimo_id = ids[-1]
+    return total
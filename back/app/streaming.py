@@ -0,0 +1,53 @@
+"""
+Respostas JSON em streaming para listas sem limite de tamanho.
+
+As linhas são lidas do banco em lotes (`yield_per`) e o array JSON é escrito
+aos poucos em uma StreamingResponse, de modo que o pico de memória depende
+do tamanho do lote e não do número de linhas encontradas.
+"""
+import os
+from typing import Callable
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from .database import SessionLocal, batch_session
+
+# Número de linhas lidas do cursor (e serializadas) por vez
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+
+def stream_json_array(
+    montar_query: Callable[[Session], object],
+    serializar: Callable[[object], bytes],
+    batch_size: int = STREAM_BATCH_SIZE,
+) -> StreamingResponse:
+    """
+    Retorna uma StreamingResponse com um array JSON.
+
+    - montar_query recebe a sessão e devolve a query (ORM ou de colunas) a percorrer
+    - serializar converte cada linha em bytes JSON de um elemento do array
+
+    A iteração acontece depois que a rota retorna, então o gerador usa uma
+    sessão própria (ou a do lote em execução) em vez da sessão da dependência.
+    """
+    def gerar():
+        shared = batch_session.get()
+        db = shared if shared is not None else SessionLocal()
+        try:
+            buffer = [b"["]
+            primeiro = True
+            for i, row in enumerate(montar_query(db).yield_per(batch_size), start=1):
+                if not primeiro:
+                    buffer.append(b",")
+                buffer.append(serializar(row))
+                primeiro = False
+                if i % batch_size == 0:
+                    yield b"".join(buffer)
+                    buffer = []
+            buffer.append(b"]")
+            yield b"".join(buffer)
+        finally:
+            if shared is None:
+                db.close()
+
+    return StreamingResponse(gerar(), media_type="application/json")
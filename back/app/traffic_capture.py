@@ -0,0 +1,189 @@
+"""
+Captura do tráfego real para reprodução (scripts/replay_traffic.py).
+
+Com TRAFFIC_CAPTURE=1, cada requisição vira uma linha JSON compacta no
+arquivo TRAFFIC_CAPTURE_FILE, com o instante, método, rota declarada
+(por exemplo /api/chamados/{id_chamado}), caminho, query string, status,
+duração e os cabeçalhos de CABECALHOS_CAPTURADOS. A API key e quaisquer
+outros cabeçalhos nunca são gravados. O corpo das escritas (JSON) só é
+gravado com TRAFFIC_CAPTURE_BODIES=1, pois pode conter dados de clientes;
+sem ele, a reprodução pula as escritas. O corpo de /api/batch, que só
+contém caminhos de leitura, é sempre gravado, e as sub-requisições do lote
+não geram registros próprios. O corpo das rotas de autenticação (/login,
+/users) nunca é gravado, e as chaves de CHAVES_SECRETAS são removidas de
+qualquer corpo antes da gravação.
+
+As linhas são gravadas por uma thread própria (QueueListener), fora do
+loop de eventos. O arquivo é rotacionado por tamanho e os antigos são
+comprimidos com gzip. Streams de eventos (SSE) não são capturados. Com
+vários workers (run.py), cada um chama configurar_captura após o fork e
+grava no seu próprio arquivo, pois a rotação não é segura entre processos.
+
+Configuração (variáveis de ambiente):
+- TRAFFIC_CAPTURE: "1" ativa a captura (padrão "0")
+- TRAFFIC_CAPTURE_FILE: arquivo da captura (padrão logs/traffic.jsonl, relativo ao diretório back/)
+- TRAFFIC_CAPTURE_MAX_BYTES: tamanho de cada arquivo antes da rotação (padrão 20000000)
+- TRAFFIC_CAPTURE_BACKUPS: arquivos antigos mantidos (padrão 10)
+- TRAFFIC_CAPTURE_RATE: captura 1 em cada N requisições (padrão 1, todas)
+- TRAFFIC_CAPTURE_BODIES: "1" grava o corpo JSON das escritas (padrão "0")
+- TRAFFIC_CAPTURE_MAX_BODY: tamanho máximo do corpo gravado, em bytes (padrão 65536)
+"""
+import gzip
+import itertools
+import json
+import logging
+import os
+import queue
+import shutil
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+TRAFFIC_CAPTURE = os.getenv("TRAFFIC_CAPTURE", "0") == "1"
+TRAFFIC_CAPTURE_FILE = os.getenv(
+    "TRAFFIC_CAPTURE_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "traffic.jsonl")
+)
+TRAFFIC_CAPTURE_MAX_BYTES = int(os.getenv("TRAFFIC_CAPTURE_MAX_BYTES", "20000000"))
+TRAFFIC_CAPTURE_BACKUPS = int(os.getenv("TRAFFIC_CAPTURE_BACKUPS", "10"))
+TRAFFIC_CAPTURE_RATE = max(int(os.getenv("TRAFFIC_CAPTURE_RATE", "1")), 1)
+TRAFFIC_CAPTURE_BODIES = os.getenv("TRAFFIC_CAPTURE_BODIES", "0") == "1"
+TRAFFIC_CAPTURE_MAX_BODY = int(os.getenv("TRAFFIC_CAPTURE_MAX_BODY", "65536"))
+
+# Únicos cabeçalhos gravados: identificam o papel e o usuário, sem segredos
+CABECALHOS_CAPTURADOS = (b"x-user-role", b"current-user-id", b"accept-encoding", b"last-event-id")
+
+METODOS_ESCRITA = ("POST", "PUT", "PATCH", "DELETE")
+
+# Corpos sempre gravados: o lote contém apenas caminhos de leitura
+CAMINHOS_CORPO_SEMPRE = ("/api/batch",)
+
+# Corpos nunca gravados: login e cadastro de usuários levam senhas
+CAMINHOS_CORPO_NUNCA = ("/login", "/users")
+
+# Chaves removidas de qualquer corpo gravado, em qualquer nível
+CHAVES_SECRETAS = ("password", "senha", "token")
+
+logger_captura = logging.getLogger("refritec.captura")
+logger_captura.propagate = False
+
+def _nome_comprimido(nome: str) -> str:
+    return nome + ".gz"
+
+def _comprimir(origem: str, destino: str):
+    with open(origem, "rb") as entrada, gzip.open(destino, "wb") as saida:
+        shutil.copyfileobj(entrada, saida)
+    os.remove(origem)
+
+def configurar_captura(arquivo: str = TRAFFIC_CAPTURE_FILE) -> QueueListener:
+    """Liga o logger da captura a um arquivo rotativo, escrito por uma thread própria"""
+    # Chamada de novo num worker após o fork: a thread do processo pai não existe mais
+    for handler_antigo in list(logger_captura.handlers):
+        logger_captura.removeHandler(handler_antigo)
+    diretorio = os.path.dirname(arquivo)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    handler = RotatingFileHandler(
+        arquivo, maxBytes=TRAFFIC_CAPTURE_MAX_BYTES, backupCount=TRAFFIC_CAPTURE_BACKUPS, encoding="utf-8",
+        delay=True
+    )
+    # Arquivos rotacionados são comprimidos: traffic.jsonl.1.gz, traffic.jsonl.2.gz, ...
+    handler.namer = _nome_comprimido
+    handler.rotator = _comprimir
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    fila = queue.SimpleQueue()
+    logger_captura.addHandler(QueueHandler(fila))
+    logger_captura.setLevel(logging.INFO)
+    ouvinte = QueueListener(fila, handler)
+    ouvinte.start()
+    return ouvinte
+
+def _corpo_json(corpo: bytes):
+    """Corpo como JSON, ou None se vazio, grande demais ou inválido"""
+    if not corpo or len(corpo) > TRAFFIC_CAPTURE_MAX_BODY:
+        return None
+    try:
+        return json.loads(corpo)
+    except ValueError:
+        return None
+
+def _sem_segredos(valor):
+    """Cópia do JSON sem as chaves de CHAVES_SECRETAS"""
+    if isinstance(valor, dict):
+        return {
+            chave: _sem_segredos(item) for chave, item in valor.items()
+            if chave.lower() not in CHAVES_SECRETAS
+        }
+    if isinstance(valor, list):
+        return [_sem_segredos(item) for item in valor]
+    return valor
+
+def _rota_autenticacao(caminho: str) -> bool:
+    caminho = caminho.rstrip("/")
+    return any(caminho == base or caminho.startswith(base + "/") for base in CAMINHOS_CORPO_NUNCA)
+
+class TrafficCaptureMiddleware:
+    """Middleware ASGI que grava um registro sanitizado de cada requisição"""
+
+    def __init__(self, app, taxa: int = TRAFFIC_CAPTURE_RATE, corpos: bool = TRAFFIC_CAPTURE_BODIES):
+        self.app = app
+        self.taxa = taxa
+        self.corpos = corpos
+        self._contador = itertools.count(1)
+
+    async def __call__(self, scope, receive, send):
+        # Sub-requisições de um lote já estão no registro do lote
+        if (
+            scope["type"] != "http"
+            or scope.get("sub_requisicao_lote")
+            or next(self._contador) % self.taxa != 0
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        instante = time.time()
+        inicio = time.perf_counter()
+        status_code = 500
+        stream_eventos = False
+        partes = []
+        guardar_corpo = (
+            scope["method"] in METODOS_ESCRITA
+            and not _rota_autenticacao(scope["path"])
+            and (self.corpos or scope["path"].rstrip("/") in CAMINHOS_CORPO_SEMPRE)
+        )
+
+        async def receive_wrapper():
+            message = await receive()
+            if guardar_corpo and message["type"] == "http.request":
+                partes.append(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message):
+            nonlocal status_code, stream_eventos
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for nome, valor in message.get("headers", []):
+                    if nome.lower() == b"content-type" and valor.startswith(b"text/event-stream"):
+                        stream_eventos = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            if not stream_eventos:
+                registro = {
+                    "t": round(instante, 3),
+                    "m": scope["method"],
+                    "r": getattr(scope.get("route"), "path", None),
+                    "p": scope["path"],
+                    "q": scope.get("query_string", b"").decode("latin-1"),
+                    "h": {
+                        nome.decode("latin-1"): valor.decode("latin-1")
+                        for nome, valor in scope["headers"] if nome in CABECALHOS_CAPTURADOS
+                    },
+                    "s": status_code,
+                    "d": round((time.perf_counter() - inicio) * 1000, 2),
+                }
+                corpo = _corpo_json(b"".join(partes)) if guardar_corpo else None
+                if corpo is not None:
+                    registro["b"] = _sem_segredos(corpo)
+                logger_captura.info(json.dumps(registro, ensure_ascii=False, separators=(",", ":")))
@@ -1,10 +1,191 @@
-import uvicorn
+"""
+Production launcher for the API.
+
+With gunicorn installed (Linux), the app is imported once in the master
+(preload) and forked into WEB_CONCURRENCY uvicorn workers. Each worker is
+replaced after MAX_REQUESTS requests, plus up to MAX_REQUESTS_JITTER, so that
+memory growth is capped and the workers do not all restart at once. uvicorn
+uses uvloop and httptools when they are installed. Without gunicorn (for
+example on Windows), uvicorn starts the workers itself, with no preload or
+recycling.
+
+Before starting, the launcher checks the worker count against the memory
+budget. It measures the master after the import and assumes each worker takes
+that much plus WORKER_HEADROOM_MB. If the master, the workers and
+MEMORY_RESERVE_MB do not fit in MEMORY_LIMIT_MB (or in the container limit,
+if lower), it starts fewer workers.
+
+Each worker keeps its own caches, metrics and change-feed (SSE) channel.
+With more than one worker, EVENTS_POLL_INTERVAL defaults to 1. Each worker
+then reads the change log (app/events.py) and publishes the writes of every
+worker to its SSE clients. The same reads clear its chamado caches. SQLite is
+switched to WAL mode so that readers in other workers are not blocked by a
+write.
+
+Configuration (environment variables):
+- HOST, PORT: bind address (default 0.0.0.0:8000)
+- WEB_CONCURRENCY: number of workers (default: the CPUs available)
+- MEMORY_LIMIT_MB: memory available to the API (default 1024)
+- MEMORY_RESERVE_MB: kept free for the OS, the SQLite page cache and spikes (default 256)
+- WORKER_HEADROOM_MB: expected growth of a worker over the imported app (default 96)
+- MAX_REQUESTS: requests served before a worker is replaced, 0 disables (default 2000)
+- MAX_REQUESTS_JITTER: random extra requests per worker (default 200)
+- WORKER_TIMEOUT: seconds before a stuck worker is killed and replaced (default 60)
+- GRACEFUL_TIMEOUT: seconds a recycled worker gets to finish its requests (default 30)
+- KEEPALIVE: seconds an idle HTTP connection stays open (default 5)
+
+Usage:
+    python run.py
+"""
+import gc
+import itertools
+import os
+import sys
+
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+MEMORY_LIMIT_MB = int(os.getenv("MEMORY_LIMIT_MB", "1024"))
+MEMORY_RESERVE_MB = int(os.getenv("MEMORY_RESERVE_MB", "256"))
+WORKER_HEADROOM_MB = int(os.getenv("WORKER_HEADROOM_MB", "96"))
+MAX_REQUESTS = int(os.getenv("MAX_REQUESTS", "2000"))
+MAX_REQUESTS_JITTER = int(os.getenv("MAX_REQUESTS_JITTER", "200"))
+WORKER_TIMEOUT = int(os.getenv("WORKER_TIMEOUT", "60"))
+GRACEFUL_TIMEOUT = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+KEEPALIVE = int(os.getenv("KEEPALIVE", "5"))
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def container_limit_mb():
+    """cgroup memory limit (v2, then v1) in MB, or None when unlimited or unknown"""
+    for path in ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory/memory.limit_in_bytes"):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < 1 << 50:
+            return int(value) // (1024 * 1024)
+        return None
+    return None
+
+def current_rss_mb():
+    """Resident memory of this process in MB, or None where /proc is missing"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return None
+
+def fit_workers(workers: int, master_mb: int) -> int:
+    """Largest worker count up to `workers` that fits in the memory budget (at least 1)"""
+    limit = MEMORY_LIMIT_MB
+    cgroup = container_limit_mb()
+    if cgroup is not None and cgroup < limit:
+        limit = cgroup
+    worker_mb = master_mb + WORKER_HEADROOM_MB
+    fitting = max((limit - MEMORY_RESERVE_MB - master_mb) // worker_mb, 1)
+    total = master_mb + min(workers, fitting) * worker_mb + MEMORY_RESERVE_MB
+    print(f"Memory budget: {limit} MB; master {master_mb} MB, ~{worker_mb} MB per worker, "
+          f"{MEMORY_RESERVE_MB} MB reserve; {min(workers, fitting)} worker(s) ~{total} MB")
+    if workers > fitting:
+        print(f"WARNING: {workers} workers do not fit in {limit} MB, starting {fitting}", file=sys.stderr)
+        return fitting
+    if total > limit:
+        print(f"WARNING: even one worker exceeds the {limit} MB budget", file=sys.stderr)
+    return workers
+
+def enable_sqlite_wal(engine):
+    """WAL lets the other workers keep reading while one of them writes (persistent per database file)"""
+    if engine.url.get_backend_name() == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+
+def worker_capture_file(base: str, slot: int) -> str:
+    """logs/traffic.jsonl -> logs/traffic.w0.jsonl: rotation is not safe across processes"""
+    root, ext = os.path.splitext(base)
+    return f"{root}.w{slot}{ext}"
+
+def run_gunicorn(workers: int):
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        def load_config(self):
+            settings = {
+                "bind": f"{HOST}:{PORT}",
+                "workers": workers,
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "preload_app": True,
+                "max_requests": MAX_REQUESTS,
+                "max_requests_jitter": MAX_REQUESTS_JITTER if MAX_REQUESTS else 0,
+                "timeout": WORKER_TIMEOUT,
+                "graceful_timeout": GRACEFUL_TIMEOUT,
+                "keepalive": KEEPALIVE,
+                "pre_fork": pre_fork,
+                "post_fork": post_fork,
+            }
+            for key, value in settings.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    def pre_fork(server, worker):
+        # Stable slot per live worker, reused by its replacement (names the capture file)
+        taken = {getattr(w, "slot", None) for w in server.WORKERS.values()}
+        worker.slot = next(i for i in itertools.count() if i not in taken)
+
+    def post_fork(server, worker):
+        from app.database import engine
+        from app import traffic_capture
+        # Connections opened by the master at import must not be shared with the workers
+        engine.dispose(close=False)
+        if traffic_capture.TRAFFIC_CAPTURE:
+            # The master's writer thread does not exist in the worker
+            base = traffic_capture.TRAFFIC_CAPTURE_FILE
+            traffic_capture.configurar_captura(worker_capture_file(base, worker.slot) if workers > 1 else base)
+
+    Server().run()
+
+def run_uvicorn(workers: int):
+    import uvicorn
+
+    print("gunicorn is not installed: no preload or worker recycling", file=sys.stderr)
+    uvicorn.run("app.main:app", host=HOST, port=PORT, workers=workers, timeout_keep_alive=KEEPALIVE)
 
 if __name__ == "__main__":
-    # Run the application with Uvicorn with hot reloading enabled
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=False  
-    ) 
\ No newline at end of file
+    workers = int(os.getenv("WEB_CONCURRENCY", "0")) or available_cpus()
+    if workers > 1:
+        # Must be set before the app is imported: the change feed then follows the change log
+        os.environ.setdefault("EVENTS_POLL_INTERVAL", "1")
+
+    try:
+        import gunicorn  # noqa: F401
+        has_gunicorn = True
+    except ImportError:
+        has_gunicorn = False
+
+    # Import once to measure it: with preload the workers are forked from this process
+    from app.database import engine
+    import app.main  # noqa: F401
+    master_mb = current_rss_mb()
+    if master_mb is None:
+        print("Memory budget not checked: process memory is not readable here", file=sys.stderr)
+    else:
+        workers = fit_workers(workers, master_mb)
+    if workers > 1:
+        enable_sqlite_wal(engine)
+    engine.dispose()
+
+    if has_gunicorn:
+        # Objects created so far are never collected: keeps the GC from copying shared pages in each worker
+        gc.freeze()
+        run_gunicorn(workers)
+    else:
+        run_uvicorn(workers)
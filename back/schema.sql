@@ -15,7 +15,8 @@ CREATE TABLE Chamado (
     id_usuario INTEGER,
     descricao TEXT NOT NULL,
     aparelho VARCHAR(100) NOT NULL,
-    status VARCHAR(50) NOT NULL DEFAULT 'Aberto',
+    status VARCHAR(20) NOT NULL DEFAULT 'Aberto'
+        CHECK (status IN ('Aberto', 'Em Andamento', 'Concluído', 'Cancelado')),
     valor DECIMAL(10,2) DEFAULT 0.00,
     observacao TEXT,
     data_abertura DATETIME DEFAULT CURRENT_TIMESTAMP,
@@ -74,13 +75,63 @@ CREATE TABLE Caixa (
     FOREIGN KEY (id_usuario) REFERENCES Usuario(id_usuario)
 );
 
+-- IntervaloStatusChamado (time spent in each status) table
+CREATE TABLE IntervaloStatusChamado (
+    id_intervalo INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_chamado INTEGER NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    id_usuario INTEGER,
+    entrou_em DATETIME NOT NULL,
+    saiu_em DATETIME,
+    FOREIGN KEY (id_chamado) REFERENCES Chamado(id_chamado)
+);
+
+-- ResumoCliente (lifetime aggregates per client) table
+CREATE TABLE ResumoCliente (
+    id_cliente INTEGER PRIMARY KEY,
+    total_chamados INTEGER NOT NULL DEFAULT 0,
+    chamados_abertos INTEGER NOT NULL DEFAULT 0,
+    chamados_concluidos INTEGER NOT NULL DEFAULT 0,
+    valor_total DECIMAL(10, 2) NOT NULL DEFAULT 0.00,
+    ultima_visita DATETIME,
+    aparelhos_frequentes TEXT,
+    atualizado_em DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (id_cliente) REFERENCES Cliente(id_cliente)
+);
+
+-- RegistroAlteracao (append-only change log for delta sync) table
+CREATE TABLE RegistroAlteracao (
+    id_registro INTEGER PRIMARY KEY AUTOINCREMENT,
+    entidade VARCHAR(20) NOT NULL,
+    id_entidade INTEGER NOT NULL,
+    acao VARCHAR(10) NOT NULL CHECK (acao IN ('alterado', 'removido')),
+    id_usuario INTEGER,
+    id_usuario_anterior INTEGER,
+    data_alteracao DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Create indexes for better performance
 CREATE INDEX idx_chamado_cliente ON Chamado(id_cliente);
+CREATE INDEX idx_chamado_cliente_data_abertura ON Chamado(id_cliente, data_abertura);
 CREATE INDEX idx_chamado_usuario ON Chamado(id_usuario);
+CREATE INDEX idx_chamado_usuario_data_abertura ON Chamado(id_usuario, data_abertura);
+CREATE INDEX idx_chamado_data_abertura ON Chamado(data_abertura);
+CREATE INDEX idx_chamado_data_prevista ON Chamado(data_prevista);
+CREATE INDEX idx_chamado_usuario_data_prevista ON Chamado(id_usuario, data_prevista);
+CREATE INDEX idx_chamado_status_data_conclusao ON Chamado(status, data_conclusao);
+CREATE INDEX idx_chamado_ativos_status_data_abertura ON Chamado(status, data_abertura, data_prevista)
+    WHERE status IN ('Aberto', 'Em Andamento');
+CREATE INDEX idx_chamado_ativos_usuario_data_prevista ON Chamado(id_usuario, data_prevista)
+    WHERE status IN ('Aberto', 'Em Andamento');
 CREATE INDEX idx_historico_chamado ON HistoricoAlteracaoChamado(id_chamado);
 CREATE INDEX idx_item_chamado ON ItemChamado(id_chamado);
 CREATE INDEX idx_usuario_username ON Usuario(username);
 CREATE INDEX idx_caixa_mes_ano ON Caixa(mes, ano);
+CREATE INDEX idx_caixa_data_lancamento ON Caixa(data_lancamento);
+CREATE INDEX idx_intervalo_chamado_saiu_em ON IntervaloStatusChamado(id_chamado, saiu_em);
+CREATE INDEX idx_intervalo_status_entrou_em ON IntervaloStatusChamado(status, entrou_em);
+CREATE INDEX idx_registro_usuario ON RegistroAlteracao(id_usuario, id_registro);
+CREATE INDEX idx_registro_usuario_anterior ON RegistroAlteracao(id_usuario_anterior, id_registro);
 
 -- Create a view to calculate total value of service calls based on items
 CREATE VIEW ChamadoValorTotal AS
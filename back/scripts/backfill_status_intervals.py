@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the Intervalos_Status_Chamados table from the status change history.
+
+Run once after upgrading (and any time the table needs to be rebuilt); it is idempotent.
+"""
+
+import sys
+import os
+import logging
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal, Base, engine
+from app.status_intervals import backfill_intervalos
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def main():
+    """Create the table if needed and replay the history into status intervals"""
+    Base.metadata.create_all(bind=engine)
+    
+    db = SessionLocal()
+    try:
+        total = backfill_intervalos(db)
+        logger.info(f"Status intervals rebuilt: {total}")
+    except Exception as e:
+        logger.error(f"Error rebuilding status intervals: {str(e)}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
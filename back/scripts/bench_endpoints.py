@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Endpoint benchmark suite on synthetic databases.
+
+For each size it builds (or reuses) a SQLite database with that many chamados,
+using scripts/generate_data.py with a fixed seed and end date, imports the real
+FastAPI app against a temporary copy of it and drives the routes in-process
+with TestClient. The copy is deleted afterwards, so the writes of a run never
+reach the cached database and every run measures the same data. For every scenario it reports latency percentiles and the number
+of SQL statements per request (X-DB-Queries), as JSON.
+
+Each size runs in its own subprocess, because the app binds its engine to
+DATABASE_URL at import time. In-memory caches are disabled (TTL 0) unless
+--with-caches is given, so the numbers reflect the queries themselves.
+
+Usage:
+    python scripts/bench_endpoints.py [--sizes 10000 100000 1000000] [--requests 50]
+        [--db-dir back/bench_data] [--output bench.json] [--baseline old.json --tolerance 0.25]
+
+With --baseline, exits with status 1 when a scenario's p95 grew by more than
+--tolerance (fraction) compared with the same size in the baseline file.
+"""
+
+import sys
+import os
+import argparse
+import json
+import platform
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import datetime, date
+
+# Add the parent directory to the Python path
+BACK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACK_DIR)
+
+# Only imports sqlalchemy: the app is imported after DATABASE_URL is set (see run_size)
+from generate_data import SEED, SURNAMES, default_clientes, generate
+
+# Fixed end date: the same size always yields the same database, whatever the day of the run
+END_DATE = date(2026, 1, 31)
+
+API_KEY = "bench"
+ADMIN = {"X-API-Key": API_KEY, "X-User-Role": "administrador", "current-user-id": "1"}
+
+def populate(database_url: str, chamados: int):
+    """Generate a database with `chamados` chamados (see generate_data.py)"""
+    generate(database_url, chamados, end_date=END_DATE)
+
+def scenarios(chamados: int, rnd: random.Random):
+    """(name, method, path factory, json body factory) of the benchmarked routes"""
+    today = END_DATE
+    n_clientes = default_clientes(chamados)
+    return [
+        ("list", "GET", lambda: "/api/chamados/?page=1&per_page=20", None),
+        ("list_filtered", "GET", lambda: f"/api/chamados/?page=1&per_page=20&status=Aberto&id_cliente={rnd.randint(1, n_clientes)}", None),
+        ("search_clientes", "GET", lambda: f"/api/clientes/?page=1&per_page=20&nome={rnd.choice(SURNAMES)}", None),
+        ("statistics", "GET", lambda: "/api/chamados/statistics", None),
+        ("calendar_month", "GET", lambda: f"/api/chamados/calendar/month?ano={today.year}&mes={today.month}", None),
+        ("detail", "GET", lambda: f"/api/chamados/{rnd.randint(1, chamados)}", None),
+        ("item_write", "POST", lambda: f"/api/chamados/{rnd.randint(1, chamados)}/itens",
+         lambda: {"descricao": "Peça de bancada", "quantidade": 1, "valor_unitario": 50.0}),
+        ("caixa_sum", "GET", lambda: f"/api/caixa/sum?mes={today.month}&ano={today.year}", None),
+    ]
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+def run_size(chamados: int, db_path: str, requests: int, with_caches: bool) -> dict:
+    """Runs inside the per-size subprocess: populate if needed, then benchmark every scenario on a copy"""
+    # The scenarios write (item_write): run them on a throwaway copy next to the cached database
+    run_dir = tempfile.mkdtemp(dir=os.path.dirname(db_path))
+    copy_path = os.path.join(run_dir, os.path.basename(db_path))
+    # Must be set before anything imports app.database (generate_data does), which binds the engine on import
+    os.environ.update(DATABASE_URL=f"sqlite:///{copy_path}", API_KEY=API_KEY, SQL_DEBUG="1", SLOW_QUERY_MS="0")
+    if not with_caches:
+        for var in ("STATISTICS_CACHE_TTL", "AGENDA_CACHE_TTL", "COUNT_CACHE_TTL", "RELATORIO_CACHE_TTL"):
+            os.environ[var] = "0"
+
+    build_seconds = None
+    if not os.path.exists(db_path):
+        start = time.perf_counter()
+        # Built under a temporary name: an interrupted build is not reused as a complete database
+        partial = db_path + ".partial"
+        if os.path.exists(partial):
+            os.remove(partial)
+        populate(f"sqlite:///{partial}", chamados)
+        os.replace(partial, db_path)
+        build_seconds = round(time.perf_counter() - start, 1)
+
+    try:
+        shutil.copyfile(db_path, copy_path)
+        results = run_scenarios(chamados, requests)
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+    return {"chamados": chamados, "build_seconds": build_seconds, "scenarios": results}
+
+def run_scenarios(chamados: int, requests: int) -> dict:
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    client = TestClient(app)
+    rnd = random.Random(SEED)
+    results = {}
+    for name, method, path, body in scenarios(chamados, rnd):
+        client.request(method, path(), headers=ADMIN, json=body() if body else None)  # warm-up
+        latencies, queries, errors, rejected = [], [], 0, 0
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = client.request(method, path(), headers=ADMIN, json=body() if body else None)
+            latencies.append((time.perf_counter() - start) * 1000)
+            # 4xx are expected for some random targets (e.g. items on a cancelled chamado)
+            if response.status_code >= 500:
+                errors += 1
+            elif response.status_code >= 400:
+                rejected += 1
+            queries.append(int(response.headers.get("x-db-queries", 0)))
+        results[name] = {
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "p99_ms": round(percentile(latencies, 99), 2),
+            "mean_ms": round(sum(latencies) / len(latencies), 2),
+            "queries_per_request": round(sum(queries) / len(queries), 2),
+            "errors": errors,
+            "rejected": rejected,
+        }
+    # Closes the connections before the copy is deleted
+    from app.database import engine
+    engine.dispose()
+    return results
+
+def compare(current: dict, baseline: dict, tolerance: float):
+    """List of p95 regressions (size, scenario, old, new) above the tolerance"""
+    regressions = []
+    for size, result in current["results"].items():
+        old = baseline.get("results", {}).get(size)
+        if not old:
+            continue
+        for name, stats in result["scenarios"].items():
+            previous = old["scenarios"].get(name)
+            if previous and stats["p95_ms"] > previous["p95_ms"] * (1 + tolerance):
+                regressions.append((size, name, previous["p95_ms"], stats["p95_ms"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--requests", type=int, default=50, help="Measured requests per scenario")
+    parser.add_argument("--db-dir", default=os.path.join(BACK_DIR, "bench_data"),
+                        help="Where the generated databases are kept and reused (default: back/bench_data)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--with-caches", action="store_true", help="Keep the in-memory caches enabled")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed p95 growth before failing")
+    parser.add_argument("--run-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_size:
+        print(json.dumps(run_size(args.run_size, args.db, args.requests, args.with_caches)))
+        return
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "with_caches": args.with_caches,
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        db_path = os.path.abspath(os.path.join(args.db_dir, f"bench_{size}.db"))
+        command = [sys.executable, os.path.abspath(__file__), "--run-size", str(size), "--db", db_path,
+                   "--requests", str(args.requests)]
+        if args.with_caches:
+            command.append("--with-caches")
+        # The user routes open chamados.db in the working directory: keep it with the databases
+        output = subprocess.run(command, cwd=args.db_dir, capture_output=True, text=True)
+        if output.returncode != 0:
+            sys.stderr.write(output.stderr)
+            sys.exit(output.returncode)
+        result = json.loads(output.stdout.strip().splitlines()[-1])
+        report["results"][str(size)] = result
+        print(json.dumps(result), file=sys.stderr)
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    print(text)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for size, name, old, new in regressions:
+            print(f"REGRESSION {size} {name}: p95 {old} ms -> {new} ms", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the chamado list serialization paths.
+
+Compares, per 1k rows, the default path (ORM objects + joinedload validated
+through the response_model, as FastAPI does) with the fast path from
+app/fast_json.py (selected columns + precompiled TypeAdapter).
+
+Usage:
+    python scripts/bench_serialization.py [--rows 1000 5000 20000] [--repeat 5]
+"""
+
+import sys
+import os
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, date, timedelta
+from typing import List
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, joinedload
+
+from app.database import Base
+from app.models import Usuario, Cliente, Chamado
+from app.schemas import Chamado as ChamadoSchema
+from app.fast_json import CHAMADO_LIST_ADAPTER, selecionar_colunas_chamado, linha_para_chamado
+
+SLOW_ADAPTER = TypeAdapter(List[ChamadoSchema])
+
+def populate(db, rows: int):
+    """Insert `rows` chamados spread over a few clients and technicians"""
+    tecnicos = [Usuario(nome=f"Técnico {i}", username=f"tec{i}", senha="x", role="funcionario") for i in range(5)]
+    clientes = [Cliente(telefone=f"1199{i:07d}", nome=f"Cliente {i}", endereco="Rua das Flores, 123") for i in range(50)]
+    db.add_all(tecnicos + clientes)
+    db.flush()
+    now = datetime.now()
+    db.bulk_insert_mappings(Chamado, [
+        {
+            "id_cliente": clientes[i % len(clientes)].id_cliente,
+            "id_usuario": tecnicos[i % len(tecnicos)].id_usuario,
+            "descricao": "Geladeira não gela, cliente relata barulho no compressor",
+            "aparelho": "Geladeira Brastemp Frost Free",
+            "status": "Aberto",
+            "valor": 150.0,
+            "observacao": "Verificar gás",
+            "data_abertura": now - timedelta(minutes=i),
+            "data_prevista": date.today() + timedelta(days=i % 10),
+        }
+        for i in range(rows)
+    ])
+    db.commit()
+
+def slow_path(db) -> bytes:
+    """ORM objects validated through the response_model and encoded like FastAPI's JSONResponse"""
+    chamados = db.query(Chamado).options(
+        joinedload(Chamado.cliente), joinedload(Chamado.tecnico)
+    ).order_by(Chamado.data_abertura.desc()).all()
+    validated = SLOW_ADAPTER.validate_python(chamados)
+    content = jsonable_encoder(SLOW_ADAPTER.dump_python(validated, mode="json"))
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def fast_path(db) -> bytes:
+    """Selected columns serialized by the precompiled TypeAdapter"""
+    query = db.query(Chamado).order_by(Chamado.data_abertura.desc())
+    rows = selecionar_colunas_chamado(query).all()
+    return CHAMADO_LIST_ADAPTER.dump_json([linha_para_chamado(row) for row in rows])
+
+def measure(func, db, repeat: int) -> float:
+    """Best wall time in seconds over `repeat` runs (session cleared between runs)"""
+    best = float("inf")
+    for _ in range(repeat):
+        db.expunge_all()
+        start = time.perf_counter()
+        func(db)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            Base.metadata.create_all(bind=engine)
+            db = sessionmaker(bind=engine)()
+            populate(db, rows)
+            assert json.loads(slow_path(db)) == json.loads(fast_path(db)), "fast path output differs"
+            slow = measure(slow_path, db, args.repeat)
+            fast = measure(fast_path, db, args.repeat)
+            db.close()
+            engine.dispose()
+        results.append({
+            "rows": rows,
+            "slow_ms_per_1k": round(slow * 1000 * 1000 / rows, 2),
+            "fast_ms_per_1k": round(fast * 1000 * 1000 / rows, 2),
+            "speedup": round(slow / fast, 2),
+        })
+        print(json.dumps(results[-1]))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Query-plan regression check for the API routes.
+
+Generates (or reuses) a populated SQLite database with generate_data.py, calls
+every route through the app in-process and captures each SQL statement it runs.
+Every SELECT, UPDATE and DELETE is then passed through EXPLAIN QUERY PLAN. The
+check fails when a plan reads a whole large table without an index ("SCAN
+Chamados"), unless the statement matches an entry of ALLOWED_SCANS for that
+route and table. It also fails
+when a route has no sample request in REQUESTS, so new routes must be added here.
+
+With --strict, full index scans ("SCAN Chamados USING INDEX ...") fail too.
+Those are usually fine when a LIMIT stops them early, but they are worth a look.
+
+Usage:
+    python scripts/check_query_plans.py [--db plans.db] [--chamados 20000] [--strict] [--verbose]
+
+Exits with status 1 on any failure, so it can run in CI after model or filter changes.
+"""
+
+import sys
+import os
+import argparse
+import re
+import sqlite3
+import tempfile
+from collections import defaultdict
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Only imports sqlalchemy: the app is imported after DATABASE_URL is set (see main)
+from generate_data import ADMIN_ID, GERENTE_ID, generate
+
+API_KEY = "plans"
+
+# Tables that grow with the business: a plain SCAN of any of them is a regression
+WATCHED_TABLES = {
+    "Chamados", "Itens_Chamado", "Cliente", "Caixa", "Historico_Alteracao_Chamados",
+    "Intervalos_Status_Chamados", "Registro_Alteracoes", "Resumo_Cliente",
+}
+
+# Intended scans: (method, route, table) -> [(regex searched in the statement, why)]
+STATISTICS_BY_CLIENT = (
+    r'GROUP BY "Cliente".nome',
+    "chamados per client over every client; cached for STATISTICS_CACHE_TTL",
+)
+ALLOWED_SCANS = {
+    ("GET", "/api/clientes/", "Cliente"): [
+        (r"LIKE", "substring search (ILIKE '%...%') cannot use a B-tree index"),
+        (r'FROM "Cliente" LIMIT', "no filter and no order: LIMIT stops the scan after one page"),
+    ],
+    ("GET", "/api/chamados/", "Chamados"): [
+        (r"count\(\*\) .* LIMIT \? OFFSET \?\) AS anon_1$", "contagem=estimada counts a LIMIT-bounded subquery"),
+    ],
+    ("GET", "/api/chamados/statistics", "Cliente"): [STATISTICS_BY_CLIENT],
+    ("POST", "/api/batch", "Cliente"): [STATISTICS_BY_CLIENT],
+}
+
+# Routes that do not go through the SQLAlchemy engine, or that never finish
+SKIPPED_ROUTES = {
+    ("POST", "/login"): "auth routes use sqlite3 directly",
+    ("POST", "/users"): "auth routes use sqlite3 directly",
+    ("PUT", "/users/{username}"): "auth routes use sqlite3 directly",
+    ("DELETE", "/users/{username}"): "auth routes use sqlite3 directly",
+    ("GET", "/users"): "auth routes use sqlite3 directly",
+    ("GET", "/api/eventos/"): "server-sent event stream, no SQL",
+    ("GET", "/metrics"): "process counters, no SQL",
+    ("GET", "/"): "static message",
+}
+
+TECNICO_ID = GERENTE_ID + 1
+
+def headers(role: str = "administrador", user_id: int = ADMIN_ID):
+    return {"X-API-Key": API_KEY, "X-User-Role": role, "current-user-id": str(user_id)}
+
+ADMIN = headers()
+FUNCIONARIO = headers("funcionario", TECNICO_ID)
+
+def sample_ids(db_path: str) -> dict:
+    """Ids of existing rows to fill the path parameters"""
+    conn = sqlite3.connect(db_path)
+
+    def one(name: str, sql: str):
+        row = conn.execute(sql).fetchone()
+        if row is None or row[0] is None:
+            raise SystemExit(f"No sample {name} in {db_path}: generate a larger database (--chamados)")
+        return row[0]
+
+    # The technician's most recent chamado, preferring one still in progress, then open
+    chamado = one(
+        f"chamado of technician {TECNICO_ID}",
+        f"SELECT id_chamado FROM Chamados WHERE id_usuario = {TECNICO_ID} "
+        "ORDER BY CASE status WHEN 'Em Andamento' THEN 0 WHEN 'Aberto' THEN 1 ELSE 2 END, id_chamado DESC LIMIT 1"
+    )
+    ids = {
+        "chamado": chamado,
+        "chamado_removido": one(
+            "open chamado to delete",
+            f"SELECT id_chamado FROM Chamados WHERE status = 'Aberto' AND id_chamado != {chamado} "
+            "ORDER BY id_chamado LIMIT 1"
+        ),
+        "cliente": one("cliente", "SELECT id_cliente FROM Cliente ORDER BY id_cliente LIMIT 1"),
+        "caixa": one("caixa entry", "SELECT max(id_caixa) FROM Caixa"),
+        "item": one(
+            "item",
+            f"SELECT coalesce((SELECT min(id_item_chamado) FROM Itens_Chamado WHERE id_chamado = {chamado}), "
+            "(SELECT max(id_item_chamado) FROM Itens_Chamado))"
+        ),
+    }
+    ids["telefone"] = one("telefone", f"SELECT telefone FROM Cliente WHERE id_cliente = {ids['cliente']}")
+    # Outside the generated range (119...), and new on every run against a reused database
+    ids["telefone_novo"] = f"118{one('cliente count', 'SELECT count(*) FROM Cliente'):08d}"
+    conn.close()
+    return ids
+
+def requests_for(ids: dict, today) -> list:
+    """(method, route, url, request kwargs); writes come last, deletions at the very end"""
+    c, cl, cx, it = ids["chamado"], ids["cliente"], ids["caixa"], ids["item"]
+    month = f"ano={today.year}&mes={today.month}"
+    return [
+        ("GET", "/api/clientes/statistics", "/api/clientes/statistics", {}),
+        ("GET", "/api/clientes/", "/api/clientes/?per_page=20", {}),
+        ("GET", "/api/clientes/", "/api/clientes/?per_page=20&search=Silva", {}),
+        ("GET", "/api/clientes/", "/api/clientes/?per_page=20&nome=Silva&contagem=estimada", {}),
+        ("GET", "/api/clientes/", f"/api/clientes/?per_page=20&telefone={ids['telefone'][:6]}", {}),
+        ("GET", "/api/clientes/telefone/{numero_telefone}", f"/api/clientes/telefone/{ids['telefone']}", {}),
+        ("GET", "/api/clientes/{id_cliente}", f"/api/clientes/{cl}", {}),
+        ("GET", "/api/clientes/{id_cliente}/resumo", f"/api/clientes/{cl}/resumo", {}),
+        ("GET", "/api/chamados/statistics", "/api/chamados/statistics", {}),
+        ("GET", "/api/chamados/agenda", "/api/chamados/agenda", {"headers": FUNCIONARIO}),
+        ("GET", "/api/chamados/", "/api/chamados/?per_page=20", {}),
+        ("GET", "/api/chamados/", "/api/chamados/?per_page=20", {"headers": FUNCIONARIO}),
+        ("GET", "/api/chamados/", "/api/chamados/?per_page=20&status=Aberto", {}),
+        ("GET", "/api/chamados/", f"/api/chamados/?per_page=20&id_cliente={cl}", {}),
+        ("GET", "/api/chamados/", f"/api/chamados/?per_page=20&id_usuario={TECNICO_ID}&fast=true", {}),
+        ("GET", "/api/chamados/", f"/api/chamados/?per_page=20&data_inicio={today.replace(day=1)}&data_fim={today}", {}),
+        ("GET", "/api/chamados/", f"/api/chamados/?per_page=20&status=Concluído&data_conclusao_inicio={today.replace(day=1)}", {}),
+        ("GET", "/api/chamados/", "/api/chamados/?per_page=20&contagem=estimada", {}),
+        ("GET", "/api/chamados/{id_chamado}", f"/api/chamados/{c}", {}),
+        ("GET", "/api/chamados/cliente/{id_cliente}", f"/api/chamados/cliente/{cl}", {}),
+        ("GET", "/api/chamados/tecnico/{id_usuario}", f"/api/chamados/tecnico/{TECNICO_ID}?per_page=20", {"headers": FUNCIONARIO}),
+        ("GET", "/api/chamados/tecnico/{id_usuario}", f"/api/chamados/tecnico/{TECNICO_ID}?per_page=20&status=Aberto", {}),
+        ("GET", "/api/chamados/{id_chamado}/itens", f"/api/chamados/{c}/itens", {}),
+        ("GET", "/api/chamados/calendar/week", "/api/chamados/calendar/week", {}),
+        ("GET", "/api/chamados/calendar/month", f"/api/chamados/calendar/month?{month}", {}),
+        ("GET", "/api/chamados/calendar/range", f"/api/chamados/calendar/range?start={today.replace(day=1)}&end={today}", {}),
+        ("GET", "/api/chamados/calendar/day", "/api/chamados/calendar/day", {"headers": FUNCIONARIO}),
+        ("GET", "/api/caixa/", f"/api/caixa/?{month}&per_page=0", {}),
+        ("GET", "/api/caixa/", "/api/caixa/?per_page=50&tipo=entrada", {}),
+        ("GET", "/api/caixa/sum", f"/api/caixa/sum?{month}", {}),
+        ("GET", "/api/caixa/{id_caixa}", f"/api/caixa/{cx}", {}),
+        ("GET", "/api/relatorios/produtividade", "/api/relatorios/produtividade", {}),
+        ("GET", "/api/relatorios/sla", "/api/relatorios/sla", {}),
+        ("GET", "/api/relatorios/aging", "/api/relatorios/aging", {}),
+        ("GET", "/api/relatorios/cache", "/api/relatorios/cache", {}),
+        ("GET", "/api/sync/", "/api/sync/", {}),
+        ("GET", "/api/sync/", "/api/sync/?since=0", {"headers": FUNCIONARIO}),
+        ("POST", "/api/batch", "/api/batch", {"json": {"requests": [
+            {"path": "/api/chamados/statistics"}, {"path": f"/api/chamados/{c}"},
+        ]}}),
+        ("POST", "/api/clientes/", "/api/clientes/", {"json": {"telefone": ids["telefone_novo"], "nome": "Cliente Plano"}}),
+        ("PUT", "/api/clientes/{id_cliente}", f"/api/clientes/{cl}", {"json": {"endereco": "Rua Nova, 1"}}),
+        ("POST", "/api/chamados/", "/api/chamados/", {"json": {
+            "id_cliente": cl, "id_usuario": TECNICO_ID, "descricao": "Geladeira não gela", "aparelho": "Geladeira",
+        }}),
+        ("PUT", "/api/chamados/{id_chamado}", f"/api/chamados/{c}", {"json": {"observacao": "Aguardando peça"}}),
+        ("POST", "/api/chamados/{id_chamado}/itens", f"/api/chamados/{c}/itens", {"json": {
+            "descricao": "Termostato", "quantidade": 1, "valor_unitario": 90,
+        }}),
+        ("PUT", "/api/chamados/itens/{id_item_chamado}", f"/api/chamados/itens/{it}", {"json": {"quantidade": 2}}),
+        ("PUT", "/api/chamados/{id_chamado}", f"/api/chamados/{c}", {"json": {"status": "Concluído"}}),
+        ("POST", "/api/caixa/", "/api/caixa/", {"json": {
+            "descricao": "Compra de peças", "valor": 100, "tipo": "saida", "data_lancamento": str(today),
+            "mes": today.month, "ano": today.year,
+        }}),
+        ("PUT", "/api/caixa/{id_caixa}", f"/api/caixa/{cx}", {"json": {"fechado": True}}),
+        ("DELETE", "/api/chamados/itens/{id_item_chamado}", f"/api/chamados/itens/{it}", {}),
+        ("DELETE", "/api/chamados/{id_chamado}", f"/api/chamados/{ids['chamado_removido']}", {}),
+        ("DELETE", "/api/caixa/{id_caixa}", f"/api/caixa/{cx}", {}),
+    ]
+
+def table_aliases(statement: str) -> dict:
+    """Name shown by EXPLAIN (table or alias) -> watched table"""
+    aliases = {table: table for table in WATCHED_TABLES}
+    for table, alias in re.findall(r'"?(\w+)"?\s+AS\s+"?(\w+)"?', statement):
+        if table in WATCHED_TABLES:
+            aliases[alias] = table
+    return aliases
+
+def full_scans(plan, statement: str, strict: bool):
+    """Watched tables read in full by the plan: [(table, plan line)]"""
+    aliases = table_aliases(statement)
+    scans = []
+    for detail in plan:
+        match = re.match(r"SCAN (\w+)( USING (COVERING )?INDEX)?", detail)
+        if match and match.group(1) in aliases and (strict or not match.group(2)):
+            scans.append((aliases[match.group(1)], detail))
+    return scans
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="Database to generate or reuse (default: a temporary one)")
+    parser.add_argument("--chamados", type=int, default=20000, help="Size of a generated database")
+    parser.add_argument("--strict", action="store_true", help="Also fail on full index scans")
+    parser.add_argument("--verbose", action="store_true", help="Print every statement and its plan")
+    args = parser.parse_args()
+
+    db_path = os.path.abspath(args.db or os.path.join(tempfile.mkdtemp(prefix="plans-"), "plans.db"))
+    database_url = f"sqlite:///{db_path}"
+    # Must be set before anything imports app.database, which binds the engine on import.
+    # Caches off, so every request reaches the database.
+    os.environ.update(DATABASE_URL=database_url, API_KEY=API_KEY, SLOW_QUERY_MS="0", METRICS_ENABLED="0")
+    for var in ("STATISTICS_CACHE_TTL", "AGENDA_CACHE_TTL", "COUNT_CACHE_TTL", "RELATORIO_CACHE_TTL"):
+        os.environ[var] = "0"
+
+    if not os.path.exists(db_path):
+        generate(database_url, args.chamados)
+
+    from datetime import date
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.database import engine
+    from app.main import app
+
+    captured = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip()[:6].upper() in ("SELECT", "WITH", "UPDATE", "DELETE"):
+            captured.append((statement, parameters))
+
+    requests = requests_for(sample_ids(db_path), date.today())
+    failures = []
+
+    routes = {(method, route.path) for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+    covered = {(method, route) for method, route, _, _ in requests}
+    for method, path in sorted(routes - covered - set(SKIPPED_ROUTES)):
+        failures.append(f"{method} {path}: no sample request in REQUESTS")
+
+    plans = sqlite3.connect(db_path)
+    client = TestClient(app)
+    scans_by_route = defaultdict(set)
+    for method, route, url, kwargs in requests:
+        captured.clear()
+        response = client.request(method, url, headers=kwargs.get("headers", ADMIN), json=kwargs.get("json"))
+        if response.status_code >= 400:
+            failures.append(f"{method} {url}: status {response.status_code} ({response.text[:120]}), queries not checked")
+            continue
+        seen = set()
+        for statement, parameters in captured:
+            if statement in seen:
+                continue
+            seen.add(statement)
+            plan = [row[3] for row in plans.execute("EXPLAIN QUERY PLAN " + statement, parameters)]
+            scans = full_scans(plan, statement, args.strict)
+            if args.verbose:
+                print(f"\n{method} {url}\n  " + " ".join(statement.split()) + "\n" + "\n".join(f"    {d}" for d in plan))
+            for table, detail in scans:
+                text = " ".join(statement.split())
+                if any(re.search(pattern, text) for pattern, _ in ALLOWED_SCANS.get((method, route, table), [])):
+                    continue
+                if table in scans_by_route[(method, url)]:
+                    continue
+                scans_by_route[(method, url)].add(table)
+                failures.append(f"{method} {url}: {detail}\n    {text[:300]}")
+        if not args.verbose:
+            print(f"{method} {url}: {len(seen)} statements")
+
+    if failures:
+        print(f"\n{len(failures)} failure(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"\nAll {len(requests)} requests use indexes on {', '.join(sorted(WATCHED_TABLES))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Deterministic high-volume data generator.
+
+Fills an empty database with users, clients, chamados across all statuses
+and three years of dates, items, status history and intervals, client
+summaries and caixa entries, using bulk inserts in large transactions. The
+same --seed and --end-date always produce the same rows.
+
+Distributions:
+- Volume grows over time (more chamados in recent months); no work on Sundays
+- Recurring clients: a small share of the clients opens most chamados
+- Old chamados are almost all concluded or cancelled; recent ones are still open
+- Concluded chamados have items and a caixa entry on the conclusion date;
+  every month also has rent, power, fuel and parts expenses, closed for past months
+- History has the status changes and technician reassignments, and status
+  intervals match it
+
+Registro_Alteracoes (the sync change log) is left empty: sync clients start
+with a full load.
+
+Usage:
+    python scripts/generate_data.py --chamados 1000000 [--seed 42] [--end-date 2026-01-31]
+        [--years 3] [--tecnicos 20] [--clientes N] [--database-url URL] [--reset]
+
+The database defaults to DATABASE_URL (or ./chamados.db). Without --reset it
+must not contain chamados yet. On SQLite, 1M chamados take a few minutes.
+"""
+
+import sys
+import os
+import argparse
+import hashlib
+import json
+import logging
+import random
+import time
+from datetime import datetime, date, timedelta
+from itertools import groupby
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, case, func, select
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEED = 42
+BATCH = 50000
+
+ADMIN_ID = 1
+GERENTE_ID = 2
+
+FIRST_NAMES = ["João", "Maria", "José", "Ana", "Antônio", "Francisca", "Carlos", "Paulo", "Adriana", "Lucas",
+               "Juliana", "Marcos", "Fernanda", "Pedro", "Patrícia", "Rafael", "Aline", "Luiz", "Camila", "Bruno"]
+SURNAMES = ["Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+            "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa"]
+STREETS = ["Rua das Flores", "Av. Paulista", "Rua Augusta", "Rua da Consolação", "Av. Brasil", "Rua XV de Novembro",
+           "Rua São Bento", "Av. Rebouças", "Rua Vergueiro", "Rua Teodoro Sampaio"]
+DISTRICTS = ["Centro", "Pinheiros", "Moema", "Tatuapé", "Santana", "Lapa", "Mooca", "Butantã", "Ipiranga", "Vila Mariana"]
+
+# (appliance, weight, defects)
+APPLIANCES = [
+    ("Geladeira", 30, ["Não está gelando", "Fazendo barulho alto", "Vazando água", "Não liga"]),
+    ("Ar Condicionado Split", 20, ["Não gela", "Vazamento na evaporadora", "Cheiro ruim", "Desliga sozinho"]),
+    ("Máquina de Lavar", 18, ["Não centrifuga", "Não puxa água", "Vazando", "Não liga"]),
+    ("Freezer", 10, ["Não congela", "Formando gelo em excesso", "Porta não veda"]),
+    ("Micro-ondas", 8, ["Não esquenta", "Prato não gira", "Faíscas dentro"]),
+    ("Lava-louças", 6, ["Não drena", "Louça sai suja", "Não liga"]),
+    ("Bebedouro", 5, ["Não gela", "Vazando água"]),
+    ("Expositor Refrigerado", 3, ["Temperatura instável", "Compressor não arma"]),
+]
+BRANDS = ["Brastemp", "Consul", "Electrolux", "Samsung", "LG", "Midea", "Panasonic", "Philco"]
+
+# (description, min price, max price, weight)
+PARTS = [
+    ("Mão de obra", 80, 250, 40),
+    ("Carga de gás", 120, 350, 15),
+    ("Troca de compressor", 450, 1200, 5),
+    ("Termostato", 60, 180, 10),
+    ("Placa eletrônica", 250, 700, 6),
+    ("Borracha de vedação", 70, 200, 8),
+    ("Correia", 40, 110, 5),
+    ("Bomba de drenagem", 90, 220, 5),
+    ("Capacitor", 30, 90, 6),
+]
+
+# Status weights (Aberto, Em Andamento, Concluído, Cancelado) by age in days, oldest bracket first
+STATUS_BY_AGE = [
+    (30, (1, 2, 90, 7)),
+    (7, (10, 15, 70, 5)),
+    (0, (37, 30, 30, 3)),
+]
+STATUSES = ("Aberto", "Em Andamento", "Concluído", "Cancelado")
+
+MONTHLY_EXPENSES = [("Aluguel da oficina", 3500, 3500), ("Energia elétrica", 600, 1100), ("Internet e telefone", 250, 250)]
+
+def hash_password(password: str) -> str:
+    """Hash password using SHA-256"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+def default_clientes(chamados: int) -> int:
+    """Number of clients generated by default for a number of chamados"""
+    return max(chamados // 4, 10)
+
+def _later(rnd: random.Random, start: datetime, min_hours: float, max_hours: float, limit: datetime) -> datetime:
+    """A moment some hours after `start`, never past `limit` nor before `start`"""
+    moment = start + timedelta(hours=rnd.uniform(min_hours, max_hours))
+    return max(start, min(moment, limit))
+
+class Generator:
+    """Builds the rows of one database, batch by batch, from a single seeded random stream"""
+
+    def __init__(self, chamados: int, seed: int, end: datetime, years: float, tecnicos: int, clientes: int):
+        self.rnd = random.Random(seed)
+        self.chamados = chamados
+        self.end = end
+        self.start = end - timedelta(days=365 * years)
+        self.tecnicos = list(range(GERENTE_ID + 1, GERENTE_ID + 1 + tecnicos))
+        # Some technicians take more calls than others
+        self.tecnico_weights = [1 + i % 4 for i in range(tecnicos)]
+        self.clientes = clientes
+        self.appliance_weights = [w for _, w, _ in APPLIANCES]
+        self.part_weights = [w for *_, w in PARTS]
+        # Volume grows linearly over the period: the time between calls shrinks
+        self.mean_gap = (end - self.start).total_seconds() / chamados
+        self.clock = self.start
+        self.next_id = 1
+        self.per_month = {}
+
+    def users(self):
+        senha = hash_password("tecnico123")
+        rows = [
+            {"id_usuario": ADMIN_ID, "nome": "Administrador", "username": "admin",
+             "senha": hash_password("admin123"), "role": "administrador", "data_criacao": self.start, "ativo": True},
+            {"id_usuario": GERENTE_ID, "nome": "Gerente", "username": "gerente",
+             "senha": hash_password("gerente123"), "role": "gerente", "data_criacao": self.start, "ativo": True},
+        ]
+        for n, id_usuario in enumerate(self.tecnicos, start=1):
+            rows.append({
+                "id_usuario": id_usuario, "nome": f"Técnico {n}", "username": f"tecnico{n}", "senha": senha,
+                "role": "funcionario", "data_criacao": self.start, "ativo": True,
+            })
+        return rows
+
+    def clients(self, first: int, last: int):
+        rnd = self.rnd
+        return [
+            {
+                "id_cliente": i,
+                "telefone": f"119{i:08d}",
+                "nome": f"{rnd.choice(FIRST_NAMES)} {rnd.choice(SURNAMES)} {rnd.choice(SURNAMES)}",
+                "endereco": f"{rnd.choice(STREETS)}, {rnd.randint(1, 3000)} - {rnd.choice(DISTRICTS)} - São Paulo",
+            }
+            for i in range(first, last + 1)
+        ]
+
+    def _next_opening(self) -> datetime:
+        rnd = self.rnd
+        progress = (self.clock - self.start) / (self.end - self.start)
+        # Twice as many calls per day at the end of the period as at the start (the 1.5 keeps the
+        # average), and 6/7 of the mean gap because Sundays are skipped
+        # Uniform gaps around the mean, so the last chamado lands close to the end date
+        self.clock += timedelta(seconds=self.mean_gap * rnd.uniform(0.5, 1.5) * 1.5 / (1 + progress) * 6 / 7)
+        if self.clock.weekday() == 6:
+            self.clock += timedelta(days=1)
+        return min(self.clock, self.end - timedelta(minutes=1))
+
+    def _status(self, opened: datetime) -> str:
+        age = (self.end - opened).days
+        for min_age, weights in STATUS_BY_AGE:
+            if age >= min_age:
+                return self.rnd.choices(STATUSES, weights)[0]
+
+    def chamado_batch(self, size: int):
+        """Rows for the next `size` chamados: (chamados, items, history, intervals, caixa)"""
+        rnd = self.rnd
+        chamados, items, history, intervals, caixa = [], [], [], [], []
+        for _ in range(size):
+            id_chamado = self.next_id
+            self.next_id += 1
+            opened = self._next_opening()
+            status = self._status(opened)
+            appliance, _, defects = rnd.choices(APPLIANCES, self.appliance_weights)[0]
+            tecnico = rnd.choices(self.tecnicos, self.tecnico_weights)[0]
+            if status == "Aberto" and rnd.random() < 0.3:
+                tecnico = None  # not assigned yet
+
+            # Status changes in time order: (moment, new status, technician after the change)
+            changes = []
+            moment = opened
+            if rnd.random() < 0.08 and tecnico is not None:
+                moment = _later(rnd, moment, 1, 24, self.end)
+                other = rnd.choice([t for t in self.tecnicos if t != tecnico] or [tecnico])
+                history.append(self._history(id_chamado, "id_usuario", other, tecnico, moment, GERENTE_ID))
+                assigned_at_open = other
+            else:
+                assigned_at_open = tecnico
+            if status in ("Em Andamento", "Concluído"):
+                moment = _later(rnd, moment, 1, 72, self.end)
+                changes.append((moment, "Em Andamento"))
+            if status == "Concluído":
+                moment = _later(rnd, moment, 1, 240, self.end)
+                changes.append((moment, "Concluído"))
+            if status == "Cancelado":
+                moment = _later(rnd, moment, 1, 120, self.end)
+                changes.append((moment, "Cancelado"))
+
+            previous, entered, owner = "Aberto", opened, assigned_at_open
+            for when, new_status in changes:
+                history.append(self._history(id_chamado, "status", previous, new_status, when, tecnico or GERENTE_ID))
+                intervals.append({"id_chamado": id_chamado, "status": previous, "id_usuario": owner,
+                                  "entrou_em": entered, "saiu_em": when})
+                previous, entered, owner = new_status, when, tecnico
+            intervals.append({"id_chamado": id_chamado, "status": previous, "id_usuario": owner,
+                              "entrou_em": entered, "saiu_em": None})
+
+            n_items = {"Aberto": (0, 1), "Em Andamento": (0, 3), "Concluído": (1, 4), "Cancelado": (0, 0)}[status]
+            valor = 0
+            for _ in range(rnd.randint(*n_items)):
+                descricao, low, high, _ = rnd.choices(PARTS, self.part_weights)[0]
+                quantidade = 1 if rnd.random() < 0.85 else rnd.randint(2, 3)
+                valor_unitario = rnd.randrange(low, high + 1, 5)
+                valor += quantidade * valor_unitario
+                items.append({"id_chamado": id_chamado, "descricao": descricao,
+                              "quantidade": quantidade, "valor_unitario": valor_unitario})
+
+            concluded = changes[-1][0] if status == "Concluído" else None
+            chamados.append({
+                "id_chamado": id_chamado,
+                # Recurring clients: low ids are drawn far more often
+                "id_cliente": int(self.clientes * rnd.random() ** 1.5) + 1,
+                "id_usuario": tecnico,
+                "descricao": rnd.choice(defects),
+                "aparelho": f"{appliance} {rnd.choice(BRANDS)}",
+                "status": status,
+                "valor": valor,
+                "observacao": None,
+                "data_abertura": opened,
+                "data_prevista": (opened + timedelta(days=rnd.randint(1, 7))).date(),
+                "data_conclusao": concluded,
+            })
+            month = (opened.year, opened.month)
+            self.per_month[month] = self.per_month.get(month, 0) + 1
+            if concluded is not None and valor > 0:
+                caixa.append(self._caixa(f"Recebimento chamado #{id_chamado}", valor, "entrada",
+                                         concluded, tecnico))
+        return chamados, items, history, intervals, caixa
+
+    def _history(self, id_chamado, campo, antigo, novo, when, id_funcionario):
+        return {"id_chamado": id_chamado, "campo_alterado": campo, "valor_antigo": str(antigo),
+                "valor_novo": str(novo), "data_alteracao": when, "id_funcionario": id_funcionario}
+
+    def _caixa(self, descricao, valor, tipo, when: datetime, id_usuario):
+        current_month = (self.end.year, self.end.month)
+        return {
+            "descricao": descricao, "valor": valor, "tipo": tipo, "data_lancamento": when.date(),
+            "mes": when.month, "ano": when.year, "fechado": (when.year, when.month) < current_month,
+            "id_usuario": id_usuario, "data_criacao": when,
+        }
+
+    def expenses(self):
+        """Monthly expenses for every month with chamados, scaled by that month's volume"""
+        rnd = self.rnd
+        rows = []
+        for (year, month), count in sorted(self.per_month.items()):
+            first = datetime(year, month, 1, 9)
+            days = ((first.replace(day=28) + timedelta(days=4)).replace(day=1) - first).days
+            for descricao, low, high in MONTHLY_EXPENSES:
+                rows.append(self._caixa(descricao, rnd.randint(low, high), "saida",
+                                        first + timedelta(days=min(9, days - 1)), GERENTE_ID))
+            for week in range(0, days, 7):
+                rows.append(self._caixa("Combustível", rnd.randint(150, 400), "saida",
+                                        first + timedelta(days=week), GERENTE_ID))
+            for _ in range(max(count // 40, 2)):
+                rows.append(self._caixa("Compra de peças", rnd.randrange(100, 2500, 10), "saida",
+                                        first + timedelta(days=rnd.randrange(days)), GERENTE_ID))
+        return [row for row in rows if row["data_criacao"] <= self.end]
+
+def build_summaries(conn, end: datetime) -> int:
+    """Fill Resumo_Cliente from the generated chamados, as atualizar_resumo_cliente would"""
+    from app.models import Chamado, ResumoCliente, StatusChamadoEnum, filtro_status_ativos
+    from app.client_summary import APARELHOS_FREQUENTES
+
+    concluido = Chamado.status == StatusChamadoEnum.CONCLUIDO.value
+    aggregates = conn.execute(select(
+        Chamado.id_cliente,
+        func.count(case((Chamado.status != StatusChamadoEnum.CANCELADO.value, 1))),
+        func.count(case((filtro_status_ativos(Chamado.status), 1))),
+        func.count(case((concluido, 1))),
+        func.sum(case((concluido, Chamado.valor), else_=0)),
+        func.max(case((concluido, func.coalesce(Chamado.data_conclusao, Chamado.data_abertura)))),
+    ).group_by(Chamado.id_cliente).order_by(Chamado.id_cliente)).all()
+    appliances = conn.execute(select(
+        Chamado.id_cliente, Chamado.aparelho, func.count(Chamado.id_chamado)
+    ).where(
+        Chamado.status != StatusChamadoEnum.CANCELADO.value
+    ).group_by(Chamado.id_cliente, Chamado.aparelho).order_by(Chamado.id_cliente)).all()
+
+    top = {}
+    for id_cliente, rows in groupby(appliances, key=lambda row: row[0]):
+        ordered = sorted(rows, key=lambda row: (-row[2], row[1]))[:APARELHOS_FREQUENTES]
+        top[id_cliente] = json.dumps([{"aparelho": a, "quantidade": q} for _, a, q in ordered], ensure_ascii=False)
+
+    rows = []
+    for id_cliente, total, abertos, concluidos, valor_total, ultima_visita in aggregates:
+        rows.append({
+            "id_cliente": id_cliente, "total_chamados": total, "chamados_abertos": abertos,
+            "chamados_concluidos": concluidos, "valor_total": valor_total or 0,
+            # max() over an expression returns text on SQLite
+            "ultima_visita": datetime.fromisoformat(ultima_visita) if isinstance(ultima_visita, str) else ultima_visita,
+            "aparelhos_frequentes": top.get(id_cliente, "[]"), "atualizado_em": end,
+        })
+    for start in range(0, len(rows), BATCH):
+        conn.execute(ResumoCliente.__table__.insert(), rows[start:start + BATCH])
+    return len(rows)
+
+def generate(database_url: str, chamados: int, seed: int = SEED, end_date: date = None, years: float = 3,
+             tecnicos: int = 20, clientes: int = None, reset: bool = False) -> dict:
+    """Generate the whole database and return the number of rows per table"""
+    from app.database import Base
+    from app.models import (Usuario, Cliente, Chamado, ItemChamado, HistoricoAlteracaoChamado,
+                            IntervaloStatusChamado, Caixa)
+
+    end = datetime.combine(end_date or date.today(), datetime.min.time())
+    clientes = clientes or default_clientes(chamados)
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _fast_load(dbapi_connection, connection_record):
+            # A fresh generated database needs no crash safety while it is being written
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA synchronous = OFF")
+            cursor.execute("PRAGMA journal_mode = MEMORY")
+            cursor.execute("PRAGMA cache_size = -65536")
+            cursor.close()
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(Chamado)).scalar():
+            raise SystemExit("The database already has chamados; use --reset to replace them")
+
+    # Secondary indexes are built once at the end, which is much faster than updating them per row
+    bulk_tables = [Chamado, ItemChamado, HistoricoAlteracaoChamado, IntervaloStatusChamado, Caixa]
+    indexes = sorted((index for model in bulk_tables for index in model.__table__.indexes), key=lambda ix: ix.name)
+    with engine.begin() as conn:
+        for index in indexes:
+            index.drop(bind=conn, checkfirst=True)
+
+    generator = Generator(chamados, seed, end, years, tecnicos, clientes)
+    counts = {"Usuario": 0, "Cliente": clientes, "Chamados": 0, "Itens_Chamado": 0,
+              "Historico_Alteracao_Chamados": 0, "Intervalos_Status_Chamados": 0, "Caixa": 0}
+    started = time.perf_counter()
+    with engine.begin() as conn:
+        users = generator.users()
+        conn.execute(Usuario.__table__.insert(), users)
+        counts["Usuario"] = len(users)
+        for first in range(1, clientes + 1, BATCH):
+            conn.execute(Cliente.__table__.insert(), generator.clients(first, min(first + BATCH - 1, clientes)))
+
+    tables = [Chamado, ItemChamado, HistoricoAlteracaoChamado, IntervaloStatusChamado, Caixa]
+    for first in range(0, chamados, BATCH):
+        batch = generator.chamado_batch(min(BATCH, chamados - first))
+        with engine.begin() as conn:
+            for model, rows in zip(tables, batch):
+                if rows:
+                    conn.execute(model.__table__.insert(), rows)
+                    counts[model.__tablename__] += len(rows)
+        logger.info(f"{first + len(batch[0])}/{chamados} chamados ({time.perf_counter() - started:.0f}s)")
+
+    with engine.begin() as conn:
+        expenses = generator.expenses()
+        conn.execute(Caixa.__table__.insert(), expenses)
+        counts["Caixa"] += len(expenses)
+        logger.info("Building secondary indexes...")
+        for index in indexes:
+            index.create(bind=conn)
+        counts["Resumo_Cliente"] = build_summaries(conn, end)
+        if engine.dialect.name == "sqlite":
+            # Planner statistics, so the benchmarks see the plans production would get
+            conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+    logger.info(f"Done in {time.perf_counter() - started:.0f}s: {counts}")
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chamados", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--end-date", type=date.fromisoformat, help="Last day of the generated period (default today)")
+    parser.add_argument("--years", type=float, default=3, help="Length of the generated period")
+    parser.add_argument("--tecnicos", type=int, default=20, help="Number of technicians")
+    parser.add_argument("--clientes", type=int, help="Number of clients (default chamados / 4)")
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./chamados.db"))
+    parser.add_argument("--reset", action="store_true", help="Drop all tables first")
+    args = parser.parse_args()
+
+    generate(args.database_url, args.chamados, args.seed, args.end_date, args.years,
+             args.tecnicos, args.clientes, args.reset)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Concurrent load generator built from the test_multi_user.py scenarios.
+
+N virtual users run in parallel for --duration seconds, started evenly over
+--ramp seconds. Each one is assigned a role scenario by the --mix weights and
+repeats it with a think time between requests:
+
+- funcionario: agenda, own open chamados, detail, add an item, start or conclude a chamado
+- gerente: statistics, chamado list, month calendar, productivity and aging reports, client search
+- caixa: month close (list and sum of the month, new expense, mark it closed)
+
+At the end it prints, per endpoint, requests, throughput, latency percentiles,
+4xx responses and errors (5xx and connection failures); --output also writes
+them as JSON.
+
+Without --base-url the app is imported and called in-process (httpx
+ASGITransport), against DATABASE_URL or --database-url. The scenarios write
+(items, status changes, caixa entries): point them at a copy of the data, for
+example a database made with generate_data.py.
+
+Usage:
+    python scripts/load_test.py [--base-url http://localhost:8000] [--database-url sqlite:///./big.db]
+        [--users 20] [--ramp 10] [--duration 60] [--mix funcionario=6,gerente=3,caixa=1]
+        [--think-time 0.5] [--tecnicos 3-22] [--seed 42] [--output load.json]
+
+Technician ids default to the ones created by generate_data.py (3 to 22).
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import date
+
+import httpx
+from dotenv import load_dotenv
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load environment variables from .env file
+load_dotenv()
+
+from generate_data import GERENTE_ID, SURNAMES
+
+def percentile(values, p: float) -> float:
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+class Stats:
+    """Latencies and outcomes per endpoint label"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.rejected = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    def report(self, elapsed: float) -> dict:
+        endpoints = {}
+        for label in sorted(set(self.latencies) | set(self.errors)):
+            latencies = self.latencies[label]
+            count = len(latencies) + self.errors[label]
+            endpoints[label] = {
+                "requests": count,
+                "rps": round(count / elapsed, 2),
+                "p50_ms": round(percentile(latencies, 50), 1) if latencies else None,
+                "p95_ms": round(percentile(latencies, 95), 1) if latencies else None,
+                "p99_ms": round(percentile(latencies, 99), 1) if latencies else None,
+                "rejected": self.rejected[label],
+                "errors": self.errors[label],
+                "error_rate": round(self.errors[label] / count, 4) if count else 0,
+            }
+        total = sum(e["requests"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        everything = [ms for values in self.latencies.values() for ms in values]
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "requests": total,
+            "rps": round(total / elapsed, 2),
+            "p50_ms": round(percentile(everything, 50), 1) if everything else None,
+            "p95_ms": round(percentile(everything, 95), 1) if everything else None,
+            "p99_ms": round(percentile(everything, 99), 1) if everything else None,
+            "errors": errors,
+            "error_rate": round(errors / total, 4) if total else 0,
+            "endpoints": endpoints,
+        }
+
+class VirtualUser:
+    """One simulated user: a role, its headers and a seeded random stream"""
+
+    def __init__(self, client: httpx.AsyncClient, stats: Stats, api_key: str, role: str, user_id: int,
+                 rnd: random.Random, think_time: float):
+        self.client = client
+        self.stats = stats
+        self.rnd = rnd
+        self.think_time = think_time
+        self.user_id = user_id
+        self.headers = {"X-API-Key": api_key, "X-User-Role": role, "current-user-id": str(user_id)}
+
+    async def request(self, label: str, method: str, url: str, **kwargs):
+        """Timed request; returns the parsed JSON body on success, None otherwise"""
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.errors[label] += 1
+            await self.think()  # a failing server must not turn the user into a busy loop
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        await self.think()
+        if response.status_code >= 500:
+            self.stats.errors[label] += 1
+            return None
+        self.stats.latencies[label].append(elapsed)
+        if response.status_code >= 400:
+            self.stats.rejected[label] += 1
+            return None
+        return response.json() if response.headers.get("content-type", "").startswith("application/json") else None
+
+    async def think(self):
+        if self.think_time > 0:
+            await asyncio.sleep(self.think_time * self.rnd.uniform(0.5, 1.5))
+
+    async def funcionario(self):
+        """Technician day: agenda, open calls, work on one of them"""
+        await self.request("agenda", "GET", "/api/chamados/agenda")
+        page = await self.request(
+            "tecnico_chamados", "GET", f"/api/chamados/tecnico/{self.user_id}",
+            params={"status": self.rnd.choice(["Aberto", "Em Andamento"]), "per_page": 10}
+        )
+        if not page or not page.get("items"):
+            return
+        chamado = self.rnd.choice(page["items"])
+        id_chamado = chamado["id_chamado"]
+        await self.request("chamado_detail", "GET", f"/api/chamados/{id_chamado}")
+        if self.rnd.random() < 0.5:
+            await self.request("add_item", "POST", f"/api/chamados/{id_chamado}/itens", json={
+                "descricao": "Mão de obra", "quantidade": 1, "valor_unitario": self.rnd.randrange(80, 250, 5),
+            })
+        novo_status = "Em Andamento" if chamado["status"] == "Aberto" else "Concluído"
+        if self.rnd.random() < 0.3:
+            await self.request("update_status", "PUT", f"/api/chamados/{id_chamado}", json={"status": novo_status})
+
+    async def gerente(self):
+        """Manager dashboard"""
+        today = date.today()
+        await self.request("statistics", "GET", "/api/chamados/statistics")
+        await self.request("chamado_list", "GET", "/api/chamados/", params={"page": 1, "per_page": 20})
+        await self.request("calendar_month", "GET", "/api/chamados/calendar/month",
+                           params={"ano": today.year, "mes": today.month})
+        await self.request("produtividade", "GET", "/api/relatorios/produtividade")
+        await self.request("aging", "GET", "/api/relatorios/aging")
+        await self.request("search_clientes", "GET", "/api/clientes/",
+                           params={"nome": self.rnd.choice(SURNAMES), "page": 1, "per_page": 20})
+
+    async def caixa(self):
+        """Month close: review the month, book an expense and close it"""
+        today = date.today()
+        month = {"mes": today.month, "ano": today.year}
+        await self.request("caixa_list", "GET", "/api/caixa/", params={**month, "per_page": 0})
+        await self.request("caixa_sum", "GET", "/api/caixa/sum", params=month)
+        lancamento = await self.request("caixa_create", "POST", "/api/caixa/", json={
+            "descricao": "Compra de peças", "valor": self.rnd.randrange(100, 2500, 10), "tipo": "saida",
+            "data_lancamento": today.isoformat(), "fechado": False, **month,
+        })
+        if lancamento:
+            await self.request("caixa_close", "PUT", f"/api/caixa/{lancamento['id_caixa']}", json={"fechado": True})
+
+async def run_user(user: VirtualUser, scenario: str, delay: float, deadline: float):
+    await asyncio.sleep(delay)
+    flow = getattr(user, scenario)
+    while time.perf_counter() < deadline:
+        await flow()
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ("funcionario", "gerente", "caixa"):
+            raise SystemExit(f"Unknown scenario in --mix: {name}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def parse_ids(text: str) -> list:
+    first, _, last = text.partition("-")
+    return list(range(int(first), int(last or first) + 1))
+
+async def run(args) -> dict:
+    if args.base_url:
+        api_key = args.api_key or os.getenv("API_KEY")
+        if not api_key:
+            raise SystemExit("Error: API_KEY not found in .env file (or pass --api-key)")
+        transport = None
+        base_url = args.base_url
+    else:
+        # Must be set before the app is imported: it binds the engine and reads API_KEY at import
+        if args.database_url:
+            os.environ["DATABASE_URL"] = args.database_url
+        api_key = args.api_key or os.getenv("API_KEY") or "load-test"
+        os.environ["API_KEY"] = api_key
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://app"
+
+    mix = parse_mix(args.mix)
+    tecnicos = parse_ids(args.tecnicos)
+    rnd = random.Random(args.seed)
+    stats = Stats()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=args.timeout) as client:
+        start = time.perf_counter()
+        deadline = start + args.duration
+        tasks = []
+        for i in range(args.users):
+            scenario = rnd.choices(list(mix), list(mix.values()))[0]
+            if scenario == "funcionario":
+                role, user_id = "funcionario", tecnicos[i % len(tecnicos)]
+            else:
+                role, user_id = "gerente", GERENTE_ID
+            user = VirtualUser(client, stats, api_key, role, user_id, random.Random(args.seed + i), args.think_time)
+            tasks.append(run_user(user, scenario, args.ramp * i / args.users, deadline))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    report = stats.report(elapsed)
+    report["config"] = {
+        "target": args.base_url or "in-process", "users": args.users, "ramp_s": args.ramp,
+        "duration_s": args.duration, "mix": mix, "think_time_s": args.think_time, "seed": args.seed,
+    }
+    return report
+
+def print_report(report: dict):
+    print(f"{'endpoint':<20} {'reqs':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'4xx':>5} {'errors':>6}")
+    for label, e in report["endpoints"].items():
+        print(f"{label:<20} {e['requests']:>7} {e['rps']:>8} {e['p50_ms'] or '-':>8} {e['p95_ms'] or '-':>8} "
+              f"{e['p99_ms'] or '-':>8} {e['rejected']:>5} {e['errors']:>6}")
+    print(f"{'total':<20} {report['requests']:>7} {report['rps']:>8} {report['p50_ms'] or '-':>8} "
+          f"{report['p95_ms'] or '-':>8} {report['p99_ms'] or '-':>8} {'':>5} {report['errors']:>6}")
+    print(f"Error rate: {report['error_rate']:.2%} in {report['elapsed_s']}s")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", help="Server to load (default: the app in-process)")
+    parser.add_argument("--database-url", help="Database for the in-process app (default DATABASE_URL)")
+    parser.add_argument("--api-key", help="Default: API_KEY from the environment or .env")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--ramp", type=float, default=10, help="Seconds to start all users")
+    parser.add_argument("--duration", type=float, default=60, help="Total seconds, ramp included")
+    parser.add_argument("--mix", default="funcionario=6,gerente=3,caixa=1", help="Scenario weights")
+    parser.add_argument("--think-time", type=float, default=0.5, help="Mean seconds between a user's requests")
+    parser.add_argument("--tecnicos", default="3-22", help="Technician ids for funcionario users (e.g. 3-22)")
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
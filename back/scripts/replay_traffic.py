@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Replay captured production traffic (app/traffic_capture.py) against a copy of the data.
+
+Reads the capture files (plain or rotated .gz; with several workers, the
+files of all of them), merges them by time and sends each request at its
+original moment divided by --speed. Use --speed 1 for real time, 10 for ten
+times faster, and 0 to send requests as fast as --concurrency allows. Writes
+are replayed only when their body was captured (TRAFFIC_CAPTURE_BODIES=1);
+--read-only skips all of them.
+
+The report gives, per route, the captured and replayed latency percentiles
+and the replayed responses whose status differs from the captured one.
+Save it with --output and pass it as --compare on the next run (for example,
+after upgrading), and the p95 of both runs are shown side by side.
+
+Without --base-url the app is imported and called in-process against
+--database-url. Always point it at a copy of the production database:
+replayed writes change data.
+
+Usage:
+    python scripts/replay_traffic.py logs/traffic*.jsonl*
+        (--database-url sqlite:///./copia.db | --base-url http://localhost:8000)
+        [--speed 1] [--concurrency 50] [--read-only] [--limit N] [--output replay.json] [--compare old.json]
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import gzip
+import json
+import time
+from collections import defaultdict
+
+import httpx
+from dotenv import load_dotenv
+
+# Add the parent directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Load environment variables from .env file
+load_dotenv()
+
+from load_test import percentile
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+READ_ONLY_PATHS = ("/api/batch",)
+
+def read_traces(paths, limit=None):
+    """Captured records in time order (the files of several workers interleave), at most `limit`"""
+    records = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f if line.strip())
+    records.sort(key=lambda record: record["t"])
+    return records[:limit] if limit else records
+
+def is_write(record) -> bool:
+    return record["m"] in WRITE_METHODS and record["p"].rstrip("/") not in READ_ONLY_PATHS
+
+def summarize(values):
+    if not values:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None}
+    return {
+        "p50_ms": round(percentile(values, 50), 1),
+        "p95_ms": round(percentile(values, 95), 1),
+        "p99_ms": round(percentile(values, 99), 1),
+    }
+
+async def replay(records, client: httpx.AsyncClient, api_key: str, speed: float, concurrency: int, read_only: bool):
+    captured = defaultdict(list)
+    replayed = defaultdict(list)
+    mismatches = defaultdict(int)
+    errors = defaultdict(int)
+    skipped = defaultdict(int)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(record, route):
+        headers = {**record.get("h", {}), "X-API-Key": api_key}
+        url = record["p"] + ("?" + record["q"] if record.get("q") else "")
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.request(record["m"], url, headers=headers, json=record.get("b"))
+            except httpx.HTTPError:
+                errors[route] += 1
+                return
+            replayed[route].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 500:
+            errors[route] += 1
+        if response.status_code != record["s"]:
+            mismatches[route] += 1
+
+    first = records[0]["t"] if records else 0
+    start = time.perf_counter()
+    tasks = []
+    for record in records:
+        route = f"{record['m']} {record.get('r') or record['p']}"
+        if is_write(record) and (read_only or "b" not in record):
+            skipped[route] += 1
+            continue
+        captured[route].append(record["d"])
+        if speed > 0:
+            delay = (record["t"] - first) / speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(record, route)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    routes = {}
+    for route in sorted(set(captured) | set(skipped)):
+        routes[route] = {
+            "requests": len(captured[route]),
+            "skipped": skipped[route],
+            "captured": summarize(captured[route]),
+            "replayed": summarize(replayed[route]),
+            "status_mismatches": mismatches[route],
+            "errors": errors[route],
+        }
+    everything = [ms for values in replayed.values() for ms in values]
+    return {
+        "elapsed_s": round(elapsed, 1),
+        "requests": sum(len(v) for v in captured.values()),
+        "skipped": sum(skipped.values()),
+        "replayed": summarize(everything),
+        "errors": sum(errors.values()),
+        "routes": routes,
+    }
+
+def print_report(report: dict, baseline: dict = None):
+    previous = (baseline or {}).get("routes", {})
+    columns = f"{'route':<48} {'reqs':>6} {'skip':>5} {'cap p50':>8} {'p50':>8} {'cap p95':>8} {'p95':>8} {'diff st':>7} {'err':>4}"
+    if baseline:
+        columns += f" {'base p95':>9} {'change':>7}"
+    print(columns)
+    for route, r in report["routes"].items():
+        line = (f"{route[:48]:<48} {r['requests']:>6} {r['skipped']:>5} {r['captured']['p50_ms'] or '-':>8} "
+                f"{r['replayed']['p50_ms'] or '-':>8} {r['captured']['p95_ms'] or '-':>8} "
+                f"{r['replayed']['p95_ms'] or '-':>8} {r['status_mismatches']:>7} {r['errors']:>4}")
+        if baseline:
+            old = previous.get(route, {}).get("replayed", {}).get("p95_ms")
+            new = r["replayed"]["p95_ms"]
+            change = f"{(new - old) / old:+.0%}" if old and new else "-"
+            line += f" {old or '-':>9} {change:>7}"
+        print(line)
+    print(f"{report['requests']} requests replayed in {report['elapsed_s']}s, {report['skipped']} writes skipped, "
+          f"{report['errors']} errors; p95 {report['replayed']['p95_ms']} ms")
+
+async def run(args):
+    records = read_traces(args.traces, args.limit)
+    if not records:
+        raise SystemExit("No captured requests in the given files")
+
+    if args.base_url:
+        api_key = args.api_key or os.getenv("API_KEY")
+        if not api_key:
+            raise SystemExit("Error: API_KEY not found in .env file (or pass --api-key)")
+        transport, base_url = None, args.base_url
+    else:
+        if not args.database_url:
+            raise SystemExit("Pass --database-url (a copy of the data) or --base-url")
+        # Must be set before the app is imported: it binds the engine and reads API_KEY at import
+        os.environ["DATABASE_URL"] = args.database_url
+        os.environ["TRAFFIC_CAPTURE"] = "0"
+        api_key = os.environ.setdefault("API_KEY", args.api_key or "replay")
+        from app.main import app
+        transport, base_url = httpx.ASGITransport(app=app), "http://app"
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=args.timeout) as client:
+        report = await replay(records, client, api_key, args.speed, args.concurrency, args.read_only)
+    report["config"] = {"target": args.base_url or args.database_url, "speed": args.speed,
+                        "concurrency": args.concurrency, "read_only": args.read_only, "traces": args.traces}
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("traces", nargs="+", help="Capture files (.gz accepted)")
+    parser.add_argument("--base-url", help="Server to replay against (default: the app in-process)")
+    parser.add_argument("--database-url", help="Copy of the database for the in-process app")
+    parser.add_argument("--api-key", help="Default: API_KEY from the environment or .env")
+    parser.add_argument("--speed", type=float, default=1, help="Speed-up over the captured timing (0: no waits)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Maximum requests in flight")
+    parser.add_argument("--read-only", action="store_true", help="Skip every write")
+    parser.add_argument("--limit", type=int, help="Replay only the first N captured requests")
+    parser.add_argument("--timeout", type=float, default=30, help="Request timeout in seconds")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Previous JSON report to compare p95 against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+if __name__ == "__main__":
+    main()
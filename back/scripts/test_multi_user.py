@@ -64,8 +64,8 @@ def test_user_scenario(username, password, role, user_id):
     print(f"Status: {response.status_code}")
     if response.status_code == 200:
         data = response.json()
-        print(f"Total chamados for tecnico: {len(data)}")
-        for chamado in data[:3]:
+        print(f"Total chamados for tecnico: {data['total']}")
+        for chamado in data['items'][:3]:
             # Print available fields for debugging
             print(f"Available fields: {list(chamado.keys())}")
             print(f"- {chamado.get('descricao', 'N/A')} (ID: {chamado.get('id_chamado', 'N/A')})")
@@ -4,6 +4,7 @@ import { ThemeProvider } from '@mui/material/styles';
 import CssBaseline from '@mui/material/CssBaseline';
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
 import { UserProvider } from './contexts/UserContext';
+import { useChangeFeed } from './hooks/useChangeFeed';
 
 import Layout from './components/layout/Layout';
 import theme from './theme/theme';
@@ -36,10 +37,17 @@ const queryClient = new QueryClient({
   },
 });
 
+// Keeps React Query caches in sync with server-side changes while a user is logged in
+const ChangeFeed = () => {
+  useChangeFeed();
+  return null;
+};
+
 function App() {
   return (
     <UserProvider>
       <QueryClientProvider client={queryClient}>
+        <ChangeFeed />
         <ThemeProvider theme={theme}>
           <CssBaseline />
           <Router>
@@ -0,0 +1,23 @@
+import { api } from './api';
+
+export interface BatchSubRequest {
+  id?: string;
+  path: string;
+  params?: Record<string, string | number | boolean>;
+}
+
+export interface BatchSubResponse<T = any> {
+  id?: string;
+  status: number;
+  body: T;
+}
+
+export const batchApi = {
+  // Executa várias leituras (GET) em uma única chamada ao servidor
+  run: async (requests: BatchSubRequest[]): Promise<BatchSubResponse[]> => {
+    const response = await api.post<{ responses: BatchSubResponse[] }>('/api/batch', {
+      requests: requests.map((request) => ({ method: 'GET', ...request })),
+    });
+    return response.data.responses;
+  },
+};
@@ -79,6 +79,35 @@ export const chamadoApi = {
     return response.data;
   },
 
+  // Chamados agendados (data prevista) entre start e end, agrupados por dia (yyyy-MM-dd)
+  getChamadosByRange: async (start: string, end: string): Promise<Record<string, Chamado[]>> => {
+    const response = await api.get<Record<string, Chamado[]>>('/api/chamados/calendar/range', {
+      params: { start, end },
+    });
+    return response.data;
+  },
+
+  // Agenda do técnico: hoje, próximos 7 dias e atrasados (padrão: usuário atual)
+  getAgenda: async (tecnicoId?: number): Promise<{
+    id_usuario: number;
+    data: string;
+    hoje: Chamado[];
+    proximos_dias: Record<string, Chamado[]>;
+    atrasados: Chamado[];
+  }> => {
+    const response = await api.get('/api/chamados/agenda', {
+      params: tecnicoId ? { id_usuario: tecnicoId } : {},
+    });
+    return response.data;
+  },
+
+  getChamadosByMonth: async (ano: number, mes: number): Promise<Record<string, Chamado[]>> => {
+    const response = await api.get<Record<string, Chamado[]>>('/api/chamados/calendar/month', {
+      params: { ano, mes },
+    });
+    return response.data;
+  },
+
   getUsers: async (): Promise<User[]> => {
     const response = await api.get<{ users: User[] }>(`/users`);
     return response.data.users;
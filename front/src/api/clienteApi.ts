@@ -1,5 +1,5 @@
 import { api } from './api';
-import { Cliente, CreateClienteDto, PaginatedResponse } from '../types';
+import { Cliente, ClienteResumo, CreateClienteDto, PaginatedResponse } from '../types';
 
 export const clienteApi = {
   createCliente: async (cliente: CreateClienteDto): Promise<Cliente> => {
@@ -12,6 +12,11 @@ export const clienteApi = {
     return response.data;
   },
 
+  getClienteResumo: async (id: number): Promise<ClienteResumo> => {
+    const response = await api.get<ClienteResumo>(`/api/clientes/${id}/resumo`);
+    return response.data;
+  },
+
   getClienteByTelefone: async (telefone: string): Promise<Cliente> => {
     const response = await api.get<Cliente>(`/api/clientes/telefone/${telefone}`);
     return response.data;
@@ -27,7 +32,11 @@ export const clienteApi = {
     const params = new URLSearchParams();
     params.append('page', page.toString());
     params.append('per_page', per_page.toString());
-    if (search) params.append('search', search);
+    if (search) {
+      params.append('search', search);
+      // Paging through the same search reuses the server's cached total
+      params.append('contagem', 'cache');
+    }
     if (nome) params.append('nome', nome);
     if (telefone) params.append('telefone', telefone);
 
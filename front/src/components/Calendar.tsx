@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import { Box, Card, CardContent, Typography, Paper, IconButton, useMediaQuery, useTheme, FormControl, InputLabel, Select, MenuItem, SelectChangeEvent } from '@mui/material';
-import { format, addDays, isToday, isSunday } from 'date-fns';
+import { format, addDays, isToday, isSunday, startOfWeek, endOfWeek } from 'date-fns';
 import { ptBR } from 'date-fns/locale';
 import ArrowBackIosNewIcon from '@mui/icons-material/ArrowBackIosNew';
 import ArrowForwardIosIcon from '@mui/icons-material/ArrowForwardIos';
@@ -10,7 +10,7 @@ import { useNavigate } from 'react-router-dom';
 import { useChamados } from '../hooks/useChamados';
 
 export const Calendar: React.FC = () => {
-  const [chamados, setChamados] = useState<Chamado[]>([]);
+  const [chamadosByDay, setChamadosByDay] = useState<Record<string, Chamado[]>>({});
   const [currentDate, setCurrentDate] = useState<Date>(new Date());
   const [isLoading, setIsLoading] = useState<boolean>(false);
   const theme = useTheme();
@@ -56,23 +56,31 @@ export const Calendar: React.FC = () => {
     navigate(`/chamados/${id}`);
   };
 
+  // Load the whole week at once, so moving between days of the same week needs no request
+  const weekStart = format(startOfWeek(currentDate, { weekStartsOn: 1 }), 'yyyy-MM-dd');
+  const weekEnd = format(endOfWeek(currentDate, { weekStartsOn: 1 }), 'yyyy-MM-dd');
+
   useEffect(() => {
     const fetchChamados = async () => {
       setIsLoading(true);
       try {
-        const dateString = format(currentDate, 'yyyy-MM-dd');
-        const data = await chamadoApi.getChamadosByDay(dateString);
-        setChamados(data || []);
+        const data = await chamadoApi.getChamadosByRange(weekStart, weekEnd);
+        setChamadosByDay(data || {});
       } catch (error) {
         console.error('Erro ao buscar chamados:', error);
-        setChamados([]);
+        setChamadosByDay({});
       } finally {
         setIsLoading(false);
       }
     };
 
     fetchChamados();
-  }, [currentDate]);
+  }, [weekStart, weekEnd]);
+
+  const chamados = React.useMemo(
+    () => chamadosByDay[format(currentDate, 'yyyy-MM-dd')] || [],
+    [chamadosByDay, currentDate]
+  );
 
   const getStatusColor = (status: string) => {
     switch (status.toLowerCase()) {
@@ -27,8 +27,9 @@ interface ClienteDetailProps {
 }
 
 const ClienteDetail: React.FC<ClienteDetailProps> = ({ clienteId }) => {
-  const { useClienteDetails, useUpdateCliente } = useClientes();
+  const { useClienteDetails, useClienteResumo, useUpdateCliente } = useClientes();
   const { data: cliente, isLoading, error } = useClienteDetails(clienteId);
+  const { data: resumo } = useClienteResumo(clienteId);
   const updateCliente = useUpdateCliente(clienteId);
   
   const [editMode, setEditMode] = useState(false);
@@ -174,6 +175,46 @@ const ClienteDetail: React.FC<ClienteDetailProps> = ({ clienteId }) => {
         </CardContent>
       </Card>
       
+      {resumo && (
+        <Card sx={{ mb: 4 }}>
+          <CardContent>
+            <Typography variant="h6" component="h2" gutterBottom>
+              Histórico do Cliente
+            </Typography>
+            <Grid container spacing={2}>
+              <Grid item xs={6} md={3}>
+                <Typography variant="body2" color="text.secondary">Total de chamados</Typography>
+                <Typography variant="h5">{resumo.total_chamados}</Typography>
+              </Grid>
+              <Grid item xs={6} md={3}>
+                <Typography variant="body2" color="text.secondary">Em aberto</Typography>
+                <Typography variant="h5">{resumo.chamados_abertos}</Typography>
+              </Grid>
+              <Grid item xs={6} md={3}>
+                <Typography variant="body2" color="text.secondary">Total gasto</Typography>
+                <Typography variant="h5">R$ {resumo.valor_total.toLocaleString('pt-BR')}</Typography>
+              </Grid>
+              <Grid item xs={6} md={3}>
+                <Typography variant="body2" color="text.secondary">Última visita</Typography>
+                <Typography variant="h5">
+                  {resumo.ultima_visita ? new Date(resumo.ultima_visita).toLocaleDateString('pt-BR') : '-'}
+                </Typography>
+              </Grid>
+              {resumo.aparelhos_frequentes.length > 0 && (
+                <Grid item xs={12}>
+                  <Typography variant="body1">
+                    <strong>Aparelhos mais atendidos:</strong>{' '}
+                    {resumo.aparelhos_frequentes
+                      .map((a) => `${a.aparelho} (${a.quantidade})`)
+                      .join(', ')}
+                  </Typography>
+                </Grid>
+              )}
+            </Grid>
+          </CardContent>
+        </Card>
+      )}
+      
       <Divider sx={{ my: 4 }} />
       
       <Typography variant="h5" component="h2" gutterBottom>
@@ -58,6 +58,7 @@ export const useChamados = () => {
       mutationFn: (data: CreateChamadoDto) => chamadoApi.createChamado(data),
       onSuccess: () => {
         queryClient.invalidateQueries({ queryKey: ['chamados'] });
+        queryClient.invalidateQueries({ queryKey: ['clienteResumo'] });
       },
     });
   };
@@ -68,6 +69,7 @@ export const useChamados = () => {
       onSuccess: () => {
         queryClient.invalidateQueries({ queryKey: ['chamados'] });
         queryClient.invalidateQueries({ queryKey: ['chamado', id] });
+        queryClient.invalidateQueries({ queryKey: ['clienteResumo'] });
       },
     });
   };
@@ -77,6 +79,7 @@ export const useChamados = () => {
       mutationFn: (data: CreateItemChamadoDto) => chamadoApi.addItemToChamado(chamadoId, data),
       onSuccess: () => {
         queryClient.invalidateQueries({ queryKey: ['chamadoItems', chamadoId] });
+        queryClient.invalidateQueries({ queryKey: ['clienteResumo'] });
         queryClient.invalidateQueries({ queryKey: ['chamado', chamadoId] });
       },
     });
@@ -88,6 +91,7 @@ export const useChamados = () => {
         chamadoApi.updateChamadoItem(itemId, data),
       onSuccess: () => {
         queryClient.invalidateQueries({ queryKey: ['chamadoItems', chamadoId] });
+        queryClient.invalidateQueries({ queryKey: ['clienteResumo'] });
       },
     });
   };
@@ -97,6 +101,7 @@ export const useChamados = () => {
       mutationFn: (itemId: number) => chamadoApi.deleteChamadoItem(itemId),
       onSuccess: () => {
         queryClient.invalidateQueries({ queryKey: ['chamadoItems', chamadoId] });
+        queryClient.invalidateQueries({ queryKey: ['clienteResumo'] });
       },
     });
   };
@@ -0,0 +1,119 @@
+import { useEffect } from 'react';
+import { useQueryClient, QueryClient } from '@tanstack/react-query';
+import { QueryKeys } from '../api/queryKeys';
+import { useUser } from '../contexts/UserContext';
+
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
+const API_KEY = process.env.REACT_APP_API_KEY;
+const RECONNECT_DELAY_MS = 3000;
+
+interface ChangeEvent {
+  versao: number;
+  entidade: 'chamado' | 'caixa' | 'reset';
+  id?: number | null;
+  acao?: string;
+  campos?: string[];
+}
+
+// Dispatches a server change event to the React Query caches that depend on it
+const applyChange = (queryClient: QueryClient, event: ChangeEvent) => {
+  if (event.entidade === 'reset') {
+    queryClient.invalidateQueries();
+    return;
+  }
+  if (event.entidade === 'chamado') {
+    queryClient.invalidateQueries({ queryKey: ['chamados'] });
+    queryClient.invalidateQueries({ queryKey: ['clienteChamados'] });
+    queryClient.invalidateQueries({ queryKey: ['clienteResumo'] });
+    if (event.id != null) {
+      queryClient.invalidateQueries({ queryKey: ['chamado', event.id] });
+      queryClient.invalidateQueries({ queryKey: ['chamado', String(event.id)] });
+      if (event.campos?.includes('itens')) {
+        queryClient.invalidateQueries({ queryKey: ['chamadoItems', event.id] });
+        queryClient.invalidateQueries({ queryKey: ['chamadoItems', String(event.id)] });
+      }
+    } else if (event.campos?.includes('itens')) {
+      // Item removed in another server worker: its chamado is unknown, refetch every item list
+      queryClient.invalidateQueries({ queryKey: ['chamadoItems'] });
+    }
+  }
+  // Chamado changes affect the dashboard totals; caixa entries affect the cash summary
+  queryClient.invalidateQueries({ queryKey: QueryKeys.CHAMADO_STATS });
+};
+
+// Parses one SSE message block ("id:", "event:", "data:" lines)
+const parseMessage = (block: string): { id?: string; event?: ChangeEvent } => {
+  let id: string | undefined;
+  const data: string[] = [];
+  for (const line of block.split('\n')) {
+    if (line.startsWith('id:')) id = line.slice(3).trim();
+    else if (line.startsWith('data:')) data.push(line.slice(5).trim());
+  }
+  if (data.length === 0) return { id };
+  try {
+    return { id, event: JSON.parse(data.join('\n')) };
+  } catch (e) {
+    return { id };
+  }
+};
+
+/**
+ * Subscribes to the server change feed (/api/eventos) and refetches only the queries
+ * affected by each change. Uses fetch instead of EventSource because the API needs
+ * the X-API-Key and role headers. Reconnects with Last-Event-ID after a drop.
+ */
+export const useChangeFeed = () => {
+  const queryClient = useQueryClient();
+  const { user } = useUser();
+
+  useEffect(() => {
+    if (!user) return;
+    const controller = new AbortController();
+    let lastEventId: string | undefined;
+    let reconnectTimer: ReturnType<typeof setTimeout> | undefined;
+
+    const connect = async () => {
+      const headers: Record<string, string> = {
+        Accept: 'text/event-stream',
+        'X-API-Key': API_KEY || '',
+        'X-User-Role': user.role,
+        'current-user-id': String(user.id_usuario),
+      };
+      if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+      try {
+        const response = await fetch(`${API_URL}/api/eventos/`, { headers, signal: controller.signal });
+        if (!response.ok || !response.body) throw new Error(`Change feed failed with status ${response.status}`);
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        while (true) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          let boundary = buffer.indexOf('\n\n');
+          while (boundary !== -1) {
+            const { id, event } = parseMessage(buffer.slice(0, boundary));
+            buffer = buffer.slice(boundary + 2);
+            if (id) lastEventId = id;
+            if (event) applyChange(queryClient, event);
+            boundary = buffer.indexOf('\n\n');
+          }
+        }
+      } catch (error) {
+        if (controller.signal.aborted) return;
+        console.error('Change feed error:', error);
+      }
+      if (!controller.signal.aborted) {
+        reconnectTimer = setTimeout(connect, RECONNECT_DELAY_MS);
+      }
+    };
+
+    connect();
+    return () => {
+      controller.abort();
+      if (reconnectTimer) clearTimeout(reconnectTimer);
+    };
+  }, [queryClient, user]);
+};
+
+export default useChangeFeed;
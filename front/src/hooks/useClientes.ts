@@ -21,6 +21,14 @@ export const useClientes = () => {
     });
   };
 
+  const useClienteResumo = (id: number) => {
+    return useQuery({
+      queryKey: ['clienteResumo', id],
+      queryFn: () => clienteApi.getClienteResumo(id),
+      enabled: !!id,
+    });
+  };
+
   const useClienteByTelefone = (telefone: string) => {
     return useQuery({
       queryKey: ['clienteTelefone', telefone],
@@ -45,6 +53,7 @@ export const useClientes = () => {
       onSuccess: () => {
         queryClient.invalidateQueries({ queryKey: ['clientes'] });
         queryClient.invalidateQueries({ queryKey: ['cliente', id] });
+        queryClient.invalidateQueries({ queryKey: ['clienteResumo', id] });
       },
     });
   };
@@ -52,6 +61,7 @@ export const useClientes = () => {
   return {
     useListClientes,
     useClienteDetails,
+    useClienteResumo,
     useClienteByTelefone,
     useCreateCliente,
     useUpdateCliente,
@@ -1,8 +1,7 @@
 import { useQuery } from '@tanstack/react-query';
-import { api } from '../api/api';
+import { batchApi } from '../api/batchApi';
 import { ChamadoStats } from '../types';
 import { QueryKeys } from '../api/queryKeys';
-import { caixaApi } from '../api/chamadoApi';
 
 interface ChamadoStatisticsResponse {
   total_open: number;
@@ -19,25 +18,38 @@ interface ClienteStatisticsResponse {
   total_clientes: number;
 }
 
-// Fetch both chamado, cliente, and caixa statistics
+interface CaixaSumResponse {
+  total_entrada: number;
+  total_saida: number;
+  saldo: number;
+}
+
+// Fetch chamado, cliente, and caixa statistics in a single batch request
 const fetchChamadoStats = async (): Promise<ChamadoStats> => {
   try {
-    const [chamadoResponse, clienteResponse, caixaSum] = await Promise.all([
-      api.get<ChamadoStatisticsResponse>('/api/chamados/statistics'),
-      api.get<ClienteStatisticsResponse>('/api/clientes/statistics'),
-      caixaApi.getCaixaSum()
+    const responses = await batchApi.run([
+      { id: 'chamados', path: '/api/chamados/statistics' },
+      { id: 'clientes', path: '/api/clientes/statistics' },
+      { id: 'caixa', path: '/api/caixa/sum' },
     ]);
+    const failed = responses.find((response) => response.status !== 200);
+    if (failed) {
+      throw new Error(`Batch request ${failed.id} failed with status ${failed.status}`);
+    }
+    const chamadoStats: ChamadoStatisticsResponse = responses[0].body;
+    const clienteStats: ClienteStatisticsResponse = responses[1].body;
+    const caixaSum: CaixaSumResponse = responses[2].body;
     
     // Combine the responses
     return {
-      total_open: chamadoResponse.data.total_open,
-      total_in_progress: chamadoResponse.data.total_in_progress,
-      total_completed: chamadoResponse.data.total_completed,
-      total_canceled: chamadoResponse.data.total_canceled,
-      total_value_open: chamadoResponse.data.total_value_open,
-      valor_recebido_mes: chamadoResponse.data.valor_recebido_mes,
-      chamados_by_client: chamadoResponse.data.chamados_by_client,
-      total_clientes: clienteResponse.data.total_clientes,
+      total_open: chamadoStats.total_open,
+      total_in_progress: chamadoStats.total_in_progress,
+      total_completed: chamadoStats.total_completed,
+      total_canceled: chamadoStats.total_canceled,
+      total_value_open: chamadoStats.total_value_open,
+      valor_recebido_mes: chamadoStats.valor_recebido_mes,
+      chamados_by_client: chamadoStats.chamados_by_client,
+      total_clientes: clienteStats.total_clientes,
       total_entrada: caixaSum.total_entrada,
       total_saida: caixaSum.total_saida,
       saldo: caixaSum.saldo,
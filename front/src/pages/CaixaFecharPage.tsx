@@ -40,7 +40,8 @@ const CaixaFecharPage: React.FC = () => {
   }, [month, year]);
 
   const fetchData = async () => {
-    const res = await axios.get(`/api/caixa`, { params: { mes: month, ano: year } });
+    // per_page=0: the month close needs every entry of the month
+    const res = await axios.get(`/api/caixa`, { params: { mes: month, ano: year, per_page: 0 } });
     setEntries(res.data);
   };
 
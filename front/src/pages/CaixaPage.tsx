@@ -43,7 +43,7 @@ const CaixaPage: React.FC = () => {
   const fetchData = async () => {
     setLoading(true);
     try {
-      const res = await api.get(`/api/caixa`, { params: { mes: month, ano: year } });
+      const res = await api.get(`/api/caixa`, { params: { mes: month, ano: year, per_page: 0 } });
       setEntries(res.data);
     } finally {
       setLoading(false);
@@ -6,6 +6,20 @@ export interface Cliente {
   endereco: string;
 }
 
+export interface AparelhoFrequente {
+  aparelho: string;
+  quantidade: number;
+}
+
+export interface ClienteResumo extends Cliente {
+  total_chamados: number;
+  chamados_abertos: number;
+  chamados_concluidos: number;
+  valor_total: number;
+  ultima_visita?: string;
+  aparelhos_frequentes: AparelhoFrequente[];
+}
+
 export interface CreateClienteDto {
   telefone: string;
   nome: string;
@@ -74,6 +88,9 @@ export interface PaginatedResponse<T> {
   page: number;
   per_page: number;
   total_pages: number;
+  has_more?: boolean;
+  total_is_estimate?: boolean;
+  next_cursor?: string | null;
 }
 
 // Dashboard/Stats types